@@ -13,19 +13,103 @@
 # limitations under the License.
 
 
+import hashlib
+import logging
 import os
 import posixpath
+import tempfile
+import threading
+from contextlib import contextmanager
+from functools import partial
 from uuid import UUID
 
 from six.moves import urllib
 import faculty
+import faculty.clients.base
 from faculty import datasets
+from faculty.datasets import transfer
+from mlflow.entities import FileInfo
+from mlflow.exceptions import MlflowException
+from mlflow.protos.databricks_pb2 import (
+    INVALID_PARAMETER_VALUE,
+    RESOURCE_DOES_NOT_EXIST,
+)
 from mlflow.store.artifact.artifact_repo import ArtifactRepository
+from mlflow_faculty.cache import (
+    DiskCache,
+    get_shared_cache,
+    invalidate_shared_caches,
+)
+from mlflow_faculty.compression import (
+    compress_file,
+    compression_suffix,
+    decompress_file,
+)
 from mlflow_faculty.converters import faculty_object_to_mlflow_file_info
+from mlflow_faculty.options import parse_env_options
+from mlflow_faculty.transfer import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_MULTIPART_THRESHOLD,
+    DEFAULT_PART_SIZE,
+    MIN_PART_SIZE,
+    TransferManifest,
+    download_file,
+    etag_matches,
+    multipart_upload_file,
+    pooled_session,
+    transfer_files,
+    walk_local_files,
+)
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_MAX_BYTES = 10 * 1024 ** 3
+# The number of recursive listings kept in the process
+LISTING_CACHE_SIZE = 16
+
+# MLflow creates a repository for every call, so listings are shared by all
+# repositories in the process with the same listing_ttl
+_LISTING_CACHES = {}
+
+# Likewise, the object store client and the HTTP sessions used to transfer
+# files are shared by all repositories in the process, the sessions keyed by
+# their number of pooled connections
+_OBJECT_CLIENTS = {}
+_TRANSFER_SESSIONS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+# Options are read from environment variables with this prefix, e.g.
+# MLFLOW_FACULTY_ARTIFACT_UPLOAD_WORKERS, rather than the artifact URI, as
+# MLflow appends paths to artifact URIs
+ENV_OPTIONS_PREFIX = "MLFLOW_FACULTY_ARTIFACT_"
+
+DEFAULT_OPTIONS = {
+    "upload_workers": DEFAULT_MAX_WORKERS,
+    "multipart_threshold": DEFAULT_MULTIPART_THRESHOLD,
+    "multipart_part_size": DEFAULT_PART_SIZE,
+    "multipart_workers": DEFAULT_MAX_WORKERS,
+    "download_workers": DEFAULT_MAX_WORKERS,
+    "cache_dir": None,
+    "cache_max_bytes": DEFAULT_CACHE_MAX_BYTES,
+    "cache_hardlink": False,
+    "listing_ttl": 10.0,
+    "resumable": False,
+    "manifest_dir": None,
+    "sync": False,
+    "sync_delete": False,
+    "compression": "",
+}
 
 
 class FacultyDatasetsArtifactRepository(ArtifactRepository):
-    def __init__(self, artifact_uri):
+    """Store artifacts in Faculty datasets.
+
+    Options, such as ``upload_workers`` or ``sync``, are read from
+    environment variables named ``MLFLOW_FACULTY_ARTIFACT_`` followed by the
+    option name in upper case, and can be overridden with keyword arguments.
+    """
+
+    def __init__(self, artifact_uri, **overrides):
 
         super(FacultyDatasetsArtifactRepository, self).__init__(artifact_uri)
 
@@ -57,6 +141,71 @@ class FacultyDatasetsArtifactRepository(ArtifactRepository):
 
         self.datasets_artifact_root = "/" + remainder
 
+        unknown = sorted(set(overrides) - set(DEFAULT_OPTIONS))
+        if unknown:
+            raise TypeError(
+                "Unknown options: {}. Supported options are: {}".format(
+                    ", ".join(unknown), ", ".join(sorted(DEFAULT_OPTIONS))
+                )
+            )
+        options = parse_env_options(ENV_OPTIONS_PREFIX, DEFAULT_OPTIONS)
+        options.update(overrides)
+        self.upload_workers = options["upload_workers"]
+        self.multipart_threshold = options["multipart_threshold"]
+        self.multipart_part_size = options["multipart_part_size"]
+        self.multipart_workers = options["multipart_workers"]
+        self.download_workers = options["download_workers"]
+        self.resumable = options["resumable"]
+        self.manifest_dir = os.path.expanduser(
+            options["manifest_dir"] or _default_manifest_dir()
+        )
+        self.sync = options["sync"]
+        self.sync_delete = options["sync_delete"]
+        if self.sync_delete and not self.sync:
+            raise ValueError("The sync_delete option requires sync to be set")
+
+        self.compression = options["compression"] or None
+        if self.compression is None:
+            self._compression_suffix = ""
+        else:
+            self._compression_suffix = compression_suffix(self.compression)
+
+        self._listing_cache = get_shared_cache(
+            _LISTING_CACHES, options["listing_ttl"], LISTING_CACHE_SIZE
+        )
+
+        if options["cache_dir"]:
+            self._download_cache = DiskCache(
+                os.path.expanduser(options["cache_dir"]),
+                options["cache_max_bytes"],
+                hardlink=options["cache_hardlink"],
+            )
+        else:
+            self._download_cache = None
+
+    @property
+    def _object_client(self):
+        """The object store client, shared by all repositories and threads.
+
+        Reusing it avoids resolving credentials and service URLs, and
+        opening new connections to the object store service, on each call.
+        """
+        return _get_shared_client(
+            _OBJECT_CLIENTS, "object", partial(faculty.client, "object")
+        )
+
+    @property
+    def _transfer_session(self):
+        """The HTTP session used to transfer files to and from storage."""
+        max_connections = max(
+            self.upload_workers, self.multipart_workers, self.download_workers
+        )
+        return _get_shared_client(
+            _TRANSFER_SESSIONS,
+            max_connections,
+            partial(pooled_session, max_connections),
+        )
+
     def _datasets_path(self, artifact_path):
         return posixpath.normpath(
             posixpath.join(
@@ -64,51 +213,580 @@ class FacultyDatasetsArtifactRepository(ArtifactRepository):
             )
         )
 
+    def _stored_path(self, datasets_path):
+        """The path a file is stored at, marked if compressed."""
+        return datasets_path + self._compression_suffix
+
+    @contextmanager
+    def _upload_source(self, local_path):
+        """Provide the file to upload for a local file.
+
+        If ``compression`` is set in the repository options, this is a
+        temporary compressed copy.
+        """
+        if self.compression is None:
+            yield local_path
+            return
+
+        fd, compressed_path = tempfile.mkstemp(suffix=self._compression_suffix)
+        os.close(fd)
+        try:
+            compress_file(local_path, compressed_path, self.compression)
+            yield compressed_path
+        finally:
+            os.remove(compressed_path)
+
     def log_artifact(self, local_file, artifact_path=None):
         if artifact_path is None:
             artifact_path = "./"
         dest_path = posixpath.join(artifact_path, os.path.basename(local_file))
 
-        datasets_path = self._datasets_path(dest_path)
-        datasets.put(local_file, datasets_path, self.project_id)
+        if self.compression is not None and os.path.isdir(local_file):
+            # Compress each file in the directory, not the directory itself
+            self.log_artifacts(local_file, dest_path)
+            return
+
+        datasets_path = self._stored_path(self._datasets_path(dest_path))
+        self._invalidate_listings()
+        with self._upload_source(local_file) as source:
+            if self._use_multipart(source):
+                self._object_client.create_directory(
+                    self.project_id,
+                    posixpath.dirname(datasets_path),
+                    parents=True,
+                )
+                self._upload_file(source, datasets_path)
+            else:
+                datasets.put(
+                    source,
+                    datasets_path,
+                    self.project_id,
+                    object_client=self._object_client,
+                )
 
     def log_artifacts(self, local_dir, artifact_path=None):
+        """Upload the contents of a local directory.
+
+        Files are uploaded concurrently by up to ``upload_workers`` threads,
+        as set in the repository options. If any fail, the rest are still
+        uploaded and a :class:`mlflow_faculty.transfer.TransferError` is
+        raised listing the failures.
+
+        If ``resumable`` is set in the repository options, completed files
+        and parts are recorded in a manifest in ``manifest_dir``, and when
+        retried after an interruption, files whose size and checksum match
+        the manifest are skipped and multipart uploads are continued. The
+        manifest is deleted once all files are uploaded.
+
+        If ``sync`` is set in the repository options, the destination is
+        listed first, and files already there with the same size and
+        content hash are not uploaded again. With ``sync_delete`` also set,
+        files in the destination that do not exist in ``local_dir`` are
+        then deleted.
+
+        If ``compression`` is set in the repository options, files are
+        compressed before uploading, and stored with a suffix marking the
+        compression, e.g. ``.mlflow-gzip`` for ``gzip``.
+        """
         if artifact_path is None:
             artifact_path = "./"
-        datasets_path = self._datasets_path(artifact_path)
-        datasets.put(local_dir, datasets_path, self.project_id)
+
+        manifest = None
+        if self.resumable:
+            manifest = self._open_manifest(local_dir, "upload", artifact_path)
+
+        files, leaf_directories = walk_local_files(local_dir)
+        self._invalidate_listings()
+
+        remote_objects = {}
+        if self.sync:
+            remote_objects = dict(
+                (obj.path, obj)
+                for info, obj in self._iter_objects(artifact_path)
+                if not info.is_dir
+            )
+
+        for directory in leaf_directories:
+            self._object_client.create_directory(
+                self.project_id,
+                self._datasets_path(posixpath.join(artifact_path, directory)),
+                parents=True,
+            )
+
+        def upload(local_path, datasets_path):
+            if manifest is not None and manifest.is_complete(
+                datasets_path, local_path
+            ):
+                _logger.debug("Skipping already uploaded %s", local_path)
+                return
+
+            with self._upload_source(local_path) as source:
+                if self.sync and self._is_uploaded(
+                    source, remote_objects.get(datasets_path)
+                ):
+                    _logger.debug("Skipping unchanged %s", local_path)
+                else:
+                    self._upload_file(source, datasets_path, manifest)
+
+            if manifest is not None:
+                manifest.mark_complete(datasets_path, local_path)
+
+        paths = [
+            (
+                local_path,
+                self._stored_path(
+                    self._datasets_path(posixpath.join(artifact_path, p))
+                ),
+            )
+            for local_path, p in files
+        ]
+        try:
+            try:
+                transfer_files(
+                    upload,
+                    paths,
+                    self.upload_workers,
+                    progress=_log_upload_progress,
+                )
+            finally:
+                if manifest is not None:
+                    manifest.close()
+            if manifest is not None:
+                manifest.remove()
+
+            if self.sync and self.sync_delete:
+                uploaded_paths = set(path for _, path in paths)
+                for datasets_path in sorted(
+                    set(remote_objects) - uploaded_paths
+                ):
+                    _logger.debug(
+                        "Deleting %s, not in %s", datasets_path, local_dir
+                    )
+                    self._object_client.delete(self.project_id, datasets_path)
+        finally:
+            # Listings may have been taken while files were uploading
+            self._invalidate_listings()
+
+    def _is_uploaded(self, local_path, obj):
+        """Check if an object has the same content as a local file."""
+        if obj is None or obj.etag is None:
+            return False
+        if obj.size != os.path.getsize(local_path):
+            return False
+        # Objects may have been uploaded in parts of the configured size, or
+        # of the minimum size as by faculty.datasets
+        return etag_matches(
+            local_path, obj.etag, [self.multipart_part_size, MIN_PART_SIZE]
+        )
+
+    def _open_manifest(self, local_path, direction, artifact_path):
+        target = self._manifest_target(artifact_path)
+        try:
+            os.makedirs(self.manifest_dir)
+        except OSError:
+            # Created by another transfer
+            if not os.path.isdir(self.manifest_dir):
+                raise
+        return TransferManifest(
+            os.path.join(
+                self.manifest_dir,
+                _manifest_name(local_path, direction, target),
+            ),
+            target,
+        )
+
+    def _manifest_target(self, artifact_path):
+        return "{}:{}".format(
+            self.project_id, self._datasets_path(artifact_path)
+        )
+
+    def _use_multipart(self, local_file):
+        return (
+            os.path.isfile(local_file)
+            and os.path.getsize(local_file) >= self.multipart_threshold
+        )
+
+    def _upload_file(self, local_file, datasets_path, manifest=None):
+        """Upload a file, in concurrent parts if larger than the threshold.
+
+        Files of at least ``multipart_threshold`` bytes are split into parts
+        of ``multipart_part_size`` bytes, which are uploaded by up to
+        ``multipart_workers`` threads, as set in the repository options.
+        If a manifest is given, the progress of multipart uploads is saved
+        in it, and an upload it records as interrupted is resumed.
+        """
+        if self._use_multipart(local_file):
+            state, save_state = None, None
+            if manifest is not None:
+                state = manifest.upload_state(datasets_path)
+                save_state = partial(manifest.save_upload_state, datasets_path)
+            multipart_upload_file(
+                self._object_client,
+                self.project_id,
+                datasets_path,
+                local_file,
+                part_size=self.multipart_part_size,
+                max_workers=self.multipart_workers,
+                session=self._transfer_session,
+                state=state,
+                save_state=save_state,
+            )
+        else:
+            transfer.upload_file(
+                self._object_client, self.project_id, datasets_path, local_file
+            )
 
     def list_artifacts(self, path=None):
+        return [info for info, _ in self._list_objects(path)]
+
+    def list_artifacts_recursive(self, path=None):
+        """List every file and directory under a path, keeping a snapshot.
+
+        This returns the same as :meth:`list_artifacts`, which lists the
+        whole tree in one paginated pass, but also keeps the listing for
+        ``listing_ttl`` seconds, as set in the repository options. Calls to
+        :meth:`list_artifacts` and :meth:`download_artifacts` for paths
+        within the tree are served from it meanwhile, by any repository in
+        the process for the same project, as MLflow creates one per call.
+        Logging artifacts to the project from this process discards it.
+
+        :param path: Relative source path that contains desired artifacts.
+
+        :return: List of artifacts as FileInfo at any depth under path.
+        """
+        prefix = self._listing_prefix(path)
+        objects = list(self._iter_prefix_objects(prefix))
+        self._listing_cache.set((self.project_id, prefix), objects)
+        return [info for info, _ in self._with_file_infos(objects)]
+
+    def _invalidate_listings(self):
+        invalidate_shared_caches(
+            _LISTING_CACHES, lambda key: key[0] == self.project_id
+        )
+
+    def _listing_prefix(self, path):
         if path is None:
             path = "./"
         datasets_path = self._datasets_path(path)
-
         # Make sure path interpreted as a directory
-        prefix = datasets_path.rstrip("/") + "/"
+        return datasets_path.rstrip("/") + "/"
+
+    def _list_objects(self, path=None):
+        """List the objects under a path with their MLflow file infos."""
+        return list(self._iter_objects(path))
+
+    def iter_artifacts(self, path=None):
+        """Iterate over every file and directory under a path.
+
+        Unlike :meth:`list_artifacts`, each page of the listing is converted
+        and yielded before the next is requested, so memory use does not
+        grow with the number of artifacts.
+
+        :param path: Relative source path that contains desired artifacts.
+
+        :return: Iterator of artifacts as FileInfo at any depth under path.
+        """
+        for info, _ in self._iter_objects(path):
+            yield info
+
+    def _iter_objects(self, path=None):
+        """Iterate over the objects under a path with their file infos."""
+        prefix = self._listing_prefix(path)
+
+        # Serve from the snapshot of an enclosing tree, if there is one
+        ancestor = prefix
+        while ancestor:
+            try:
+                objects = self._listing_cache.get((self.project_id, ancestor))
+            except KeyError:
+                ancestor = ancestor[: ancestor.rstrip("/").rfind("/") + 1]
+            else:
+                return self._with_file_infos(
+                    obj for obj in objects if obj.path.startswith(prefix)
+                )
+
+        return self._with_file_infos(self._iter_prefix_objects(prefix))
+
+    def _with_file_infos(self, objects):
+        for obj in objects:
+            info = self._logical_file_info(
+                faculty_object_to_mlflow_file_info(
+                    obj, self.datasets_artifact_root
+                )
+            )
+            # Remove root
+            if info.path != "/":
+                yield info, obj
 
+    def _iter_prefix_objects(self, prefix):
         # Go directly to the object store so we can get file sizes in the
         # response
-        client = faculty.client("object")
+        client = self._object_client
 
-        list_response = client.list(self.project_id, prefix)
-        objects = list_response.objects
+        page_token = None
+        while True:
+            if page_token is None:
+                list_response = client.list(self.project_id, prefix)
+            else:
+                list_response = client.list(
+                    self.project_id, prefix, page_token
+                )
 
-        while list_response.next_page_token is not None:
-            list_response = client.list(
-                self.project_id, prefix, list_response.next_page_token
-            )
-            objects += list_response.objects
+            for obj in list_response.objects:
+                yield obj
+
+            page_token = list_response.next_page_token
+            if page_token is None:
+                break
+
+    def _logical_file_info(self, info):
+        """Remove the suffix marking a file as compressed from its path.
+
+        The size remains that of the compressed file.
+        """
+        suffix = self._compression_suffix
+        if suffix and not info.is_dir and info.path.endswith(suffix):
+            return FileInfo(info.path[: -len(suffix)], False, info.file_size)
+        return info
+
+    def download_artifacts(self, artifact_path, dst_path=None):
+        """Download an artifact file or directory to a local directory.
+
+        The tree under ``artifact_path`` is listed once, and its files are
+        then downloaded concurrently by up to ``download_workers`` threads,
+        as set in the repository options. If any downloads fail, the rest
+        still complete and a :class:`mlflow_faculty.transfer.TransferError`
+        is raised listing the failures in the order they were listed.
+
+        If ``cache_dir`` is set in the repository options, files are kept
+        in a local cache keyed by their size and ETag in the listing, and
+        unchanged files are copied from it rather than downloaded again.
 
-        infos = [
-            faculty_object_to_mlflow_file_info(
-                obj, self.datasets_artifact_root
+        If ``resumable`` is set in the repository options, completed files
+        are recorded in a manifest in ``manifest_dir``, and when retried
+        after an interruption, files whose size and checksum match the
+        manifest, and which are unchanged in the object store, are skipped.
+        The manifest is deleted once all files are downloaded. No manifest
+        is kept without ``dst_path``, as a retry would download to a new
+        directory.
+
+        If ``compression`` is set in the repository options, files stored
+        compressed are decompressed, and saved without the suffix marking
+        their compression.
+
+        :param artifact_path: Relative source path to the desired artifacts.
+        :param dst_path: Absolute path of the local filesystem destination
+            directory to which to download the specified artifacts. This
+            directory must already exist. If unspecified, the artifacts will
+            be downloaded to a new uniquely-named directory.
+
+        :return: Absolute path of the local filesystem location containing the
+            desired artifacts.
+        """
+        # A retry without a destination downloads to a new directory, so
+        # could not resume from a manifest
+        resumable = self.resumable and dst_path is not None
+        if dst_path is None:
+            dst_path = tempfile.mkdtemp()
+        dst_path = os.path.abspath(dst_path)
+        if not os.path.exists(dst_path):
+            raise MlflowException(
+                "The destination path for downloaded artifacts does not "
+                "exist! Destination path: {}".format(dst_path),
+                error_code=RESOURCE_DOES_NOT_EXIST,
+            )
+        elif not os.path.isdir(dst_path):
+            raise MlflowException(
+                "The destination path for downloaded artifacts must be a "
+                "directory! Destination path: {}".format(dst_path),
+                error_code=INVALID_PARAMETER_VALUE,
             )
-            for obj in objects
+
+        # Listing a prefix in the object store is recursive, so this finds
+        # every file in the tree, or nothing if artifact_path is a file
+        listing = self._list_objects(artifact_path)
+        objects = dict((info.path, obj) for info, obj in listing)
+        if listing:
+            remote_files = [i.path for i, _ in listing if not i.is_dir]
+            local_dirs = [i.path for i, _ in listing if i.is_dir]
+            local_dirs.append(artifact_path)
+        else:
+            remote_files = [artifact_path]
+            local_dirs = []
+
+        paths = [
+            (remote_path, _local_path(dst_path, remote_path))
+            for remote_path in remote_files
         ]
+        for local_dir in [_local_path(dst_path, p) for p in local_dirs] + [
+            os.path.dirname(local_path) for _, local_path in paths
+        ]:
+            if not os.path.exists(local_dir):
+                os.makedirs(local_dir)
+
+        manifest = None
+        if resumable:
+            manifest = self._open_manifest(
+                _local_path(dst_path, artifact_path), "download", artifact_path
+            )
 
-        # Remove root
-        return [i for i in infos if i.path != "/"]
+        def download(remote_path, local_path):
+            obj = objects.get(remote_path)
+            if manifest is None:
+                self._fetch_file(remote_path, local_path, obj)
+                return
+
+            if obj is None:
+                obj = self._get_object(remote_path)
+            fingerprint = {"size": obj.size, "etag": obj.etag}
+            if manifest.is_complete(remote_path, local_path, **fingerprint):
+                _logger.debug("Skipping already downloaded %s", remote_path)
+            else:
+                self._fetch_file(remote_path, local_path, obj)
+                manifest.mark_complete(remote_path, local_path, **fingerprint)
+
+        try:
+            transfer_files(
+                download,
+                paths,
+                self.download_workers,
+                progress=_log_download_progress,
+            )
+        finally:
+            if manifest is not None:
+                manifest.close()
+        if manifest is not None:
+            manifest.remove()
+
+        return _local_path(dst_path, artifact_path)
 
     def _download_file(self, remote_file_path, local_path):
-        datasets_path = self._datasets_path(remote_file_path)
-        datasets.get(datasets_path, local_path, self.project_id)
+        if self._download_cache is None and self.compression is None:
+            datasets_path = self._datasets_path(remote_file_path)
+            datasets.get(
+                datasets_path,
+                local_path,
+                self.project_id,
+                object_client=self._object_client,
+            )
+        else:
+            self._fetch_file(remote_file_path, local_path)
+
+    def _fetch_file(self, remote_path, local_path, obj=None):
+        """Download a file, through the local cache if enabled.
+
+        :param obj: The object for the file from a listing, if available.
+            Otherwise it is looked up to get the metadata for the cache key,
+            and to find if the file is stored compressed.
+        """
+        if obj is None and (
+            self._download_cache is not None or self.compression is not None
+        ):
+            obj = self._get_object(remote_path)
+        if obj is None:
+            datasets_path = self._datasets_path(remote_path)
+        else:
+            datasets_path = obj.path
+
+        compressed = self._compression_suffix and datasets_path.endswith(
+            self._compression_suffix
+        )
+
+        def download(path):
+            if compressed:
+                download_path = path + self._compression_suffix
+            else:
+                download_path = path
+            try:
+                download_file(
+                    self._object_client,
+                    self.project_id,
+                    datasets_path,
+                    download_path,
+                    session=self._transfer_session,
+                )
+                if compressed:
+                    decompress_file(download_path, path, self.compression)
+            finally:
+                if compressed and os.path.exists(download_path):
+                    os.remove(download_path)
+
+        if self._download_cache is None or obj.etag is None:
+            # Without an ETag a changed file cannot be told apart
+            download(local_path)
+            return
+
+        key = DiskCache.key(
+            self.project_id,
+            datasets_path,
+            obj.size,
+            obj.etag,
+            obj.last_modified_at,
+        )
+        if self._download_cache.fetch(key, local_path, download):
+            _logger.debug("Copied %s from the local cache", remote_path)
+
+    def _get_object(self, remote_path):
+        """Look up the object storing a file, preferring a compressed one."""
+        datasets_path = self._datasets_path(remote_path)
+        if self.compression is not None:
+            try:
+                return self._object_client.get(
+                    self.project_id, self._stored_path(datasets_path)
+                )
+            except faculty.clients.base.NotFound:
+                # Stored uncompressed
+                pass
+        return self._object_client.get(self.project_id, datasets_path)
+
+
+def _get_shared_client(registry, key, create):
+    with _CLIENTS_LOCK:
+        try:
+            return registry[key]
+        except KeyError:
+            client = create()
+            registry[key] = client
+            return client
+
+
+def _local_path(dst_path, artifact_path):
+    return os.path.normpath(
+        os.path.join(dst_path, *artifact_path.lstrip("/").split("/"))
+    )
+
+
+def _default_manifest_dir():
+    cache_home = os.environ.get("XDG_CACHE_HOME") or "~/.cache"
+    return os.path.join(cache_home, "mlflow-faculty", "manifests")
+
+
+def _manifest_name(local_path, direction, target):
+    """The file name of the manifest of transfers to or from a local path.
+
+    Manifests are kept outside the transferred directories, which may be
+    read-only, and named for the local path and the target so that
+    concurrent transfers do not share one.
+    """
+    key = "\n".join([direction, target, os.path.abspath(local_path)])
+    return "{}.{}-manifest".format(
+        hashlib.sha256(key.encode("utf-8")).hexdigest(), direction
+    )
+
+
+def _log_upload_progress(local_path, datasets_path, error):
+    if error is None:
+        _logger.debug("Uploaded %s to %s", local_path, datasets_path)
+    else:
+        _logger.warning(
+            "Failed to upload %s to %s: %s", local_path, datasets_path, error
+        )
+
+
+def _log_download_progress(remote_path, local_path, error):
+    if error is None:
+        _logger.debug("Downloaded %s to %s", remote_path, local_path)
+    else:
+        _logger.warning(
+            "Failed to download %s to %s: %s", remote_path, local_path, error
+        )
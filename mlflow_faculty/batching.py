@@ -0,0 +1,297 @@
+# Copyright 2019-2020 Faculty Science Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import threading
+import time
+from collections import OrderedDict
+
+from mlflow.exceptions import MlflowException
+from six.moves import queue
+
+DEFAULT_MAX_QUEUE_SIZE = 10000
+DEFAULT_MAX_BATCH_SIZE = 1000
+DEFAULT_MAX_BATCH_BYTES = 1024 * 1024
+DEFAULT_MAX_BATCH_AGE = 10.0
+
+# Approximate bytes taken by a metric's value, timestamp and step in a request
+METRIC_OVERHEAD_BYTES = 24
+
+
+class _PendingRunData(object):
+    def __init__(self, created_at):
+        self.created_at = created_at
+        self.metrics = []
+        self.params = OrderedDict()
+        self.tags = OrderedDict()
+        self.size = 0
+        self.nbytes = 0
+
+
+class RunDataBuffer(object):
+    """Accumulate run data in memory and send it in large batches.
+
+    Metrics, params and tags are buffered per run. A run's data is sent once
+    the number of entries buffered for it, their approximate size in bytes
+    or the age of the oldest of them reaches the configured limit, or when
+    :meth:`flush` is called. It is sent in as few calls to ``send`` as
+    possible, each with at most ``max_size`` entries and ``max_bytes`` bytes,
+    unless a single entry is larger than that.
+
+    Params are de-duplicated, and logging a param already buffered with a
+    different value raises an ``MlflowException``. Tags are merged with the
+    last value set for a key winning.
+
+    Parameters
+    ----------
+    send : callable
+        Called as ``send(run_id, metrics, params, tags)``.
+    max_size : int, optional
+        The maximum number of entries to buffer for a run, and to send in
+        one call.
+    max_bytes : int, optional
+        The maximum approximate size in bytes to buffer for a run, and to
+        send in one call.
+    max_age : float, optional
+        The maximum time in seconds to hold data before sending it. The age
+        is checked whenever data is added. ``None`` disables the limit.
+    """
+
+    def __init__(
+        self,
+        send,
+        max_size=DEFAULT_MAX_BATCH_SIZE,
+        max_bytes=DEFAULT_MAX_BATCH_BYTES,
+        max_age=DEFAULT_MAX_BATCH_AGE,
+    ):
+        self._send = send
+        self._max_size = max_size
+        self._max_bytes = max_bytes
+        self._max_age = max_age
+        self._pending = OrderedDict()
+        self._lock = threading.RLock()
+
+    def add(self, run_id, metrics, params, tags):
+        """Buffer run data, sending any batches that have reached a limit."""
+        with self._lock:
+            pending = self._pending.get(run_id)
+            if pending is None:
+                pending = _PendingRunData(time.time())
+
+            _check_param_conflicts(pending, params)
+
+            self._pending[run_id] = pending
+            for metric in metrics:
+                pending.metrics.append(metric)
+                pending.size += 1
+                pending.nbytes += _metric_bytes(metric)
+            for param in params:
+                if param.key not in pending.params:
+                    pending.params[param.key] = param
+                    pending.size += 1
+                    pending.nbytes += _entry_bytes(param)
+            for tag in tags:
+                previous = pending.tags.get(tag.key)
+                if previous is None:
+                    pending.size += 1
+                else:
+                    pending.nbytes -= _entry_bytes(previous)
+                pending.tags[tag.key] = tag
+                pending.nbytes += _entry_bytes(tag)
+
+            self._send_full()
+
+    def flush(self, run_id=None):
+        """Send all buffered data, or only that for ``run_id`` if given.
+
+        If sending fails for any run, the remaining runs are still sent and
+        the first error is then raised.
+        """
+        with self._lock:
+            if run_id is None:
+                run_ids = list(self._pending)
+            else:
+                run_ids = [run_id] if run_id in self._pending else []
+            self._send_runs(run_ids)
+
+    def _send_full(self):
+        now = time.time()
+        full = [
+            run_id
+            for run_id, pending in self._pending.items()
+            if pending.size >= self._max_size
+            or pending.nbytes >= self._max_bytes
+            or (
+                self._max_age is not None
+                and now - pending.created_at >= self._max_age
+            )
+        ]
+        self._send_runs(full)
+
+    def _send_runs(self, run_ids):
+        error = None
+        for run_id in run_ids:
+            pending = self._pending.pop(run_id)
+            for metrics, params, tags in self._chunks(pending):
+                try:
+                    self._send(run_id, metrics, params, tags)
+                except Exception as e:
+                    if error is None:
+                        error = e
+        if error is not None:
+            raise error
+
+    def _chunks(self, pending):
+        """Split a run's pending data into chunks within the limits."""
+        chunk = ([], [], [])
+        size = nbytes = 0
+        for index, entries, entry_bytes in [
+            (0, pending.metrics, _metric_bytes),
+            (1, pending.params.values(), _entry_bytes),
+            (2, pending.tags.values(), _entry_bytes),
+        ]:
+            for entry in entries:
+                nbytes_added = entry_bytes(entry)
+                if size > 0 and (
+                    size + 1 > self._max_size
+                    or nbytes + nbytes_added > self._max_bytes
+                ):
+                    yield chunk
+                    chunk = ([], [], [])
+                    size = nbytes = 0
+                chunk[index].append(entry)
+                size += 1
+                nbytes += nbytes_added
+        # A run with no data buffered is still sent, as it was logged
+        if size > 0 or pending.size == 0:
+            yield chunk
+
+
+def _check_param_conflicts(pending, params):
+    conflicting = []
+    seen = {}
+    for param in params:
+        previous = pending.params.get(param.key, seen.get(param.key))
+        if previous is not None and previous.value != param.value:
+            conflicting.append(param.key)
+        seen[param.key] = param
+    if conflicting:
+        raise MlflowException("Conflicting param keys: {}".format(conflicting))
+
+
+def _metric_bytes(metric):
+    return len(metric.key) + METRIC_OVERHEAD_BYTES
+
+
+def _entry_bytes(param_or_tag):
+    return len(param_or_tag.key) + len(param_or_tag.value)
+
+
+class AsyncRunDataLogger(object):
+    """Send run data to the backend from a background thread.
+
+    Batches passed to :meth:`log` are put on a bounded queue, blocking the
+    caller only when the queue is full. A daemon worker drains the queue and
+    coalesces everything waiting for the same run with a
+    :class:`RunDataBuffer`, sending it in as few calls to ``send`` as the
+    buffer's size limits allow.
+
+    Errors raised by ``send`` are not lost: the first one is held and
+    re-raised from the next call to :meth:`log`, after queueing its data,
+    or :meth:`flush`.
+
+    Parameters
+    ----------
+    send : callable
+        Called by the worker as ``send(run_id, metrics, params, tags)``.
+    max_queue_size : int, optional
+        The maximum number of batches waiting to be sent.
+    max_batch_size : int, optional
+        The maximum number of entries to send for a run in one call.
+    max_batch_bytes : int, optional
+        The maximum approximate size in bytes to send for a run in one call.
+    """
+
+    def __init__(
+        self,
+        send,
+        max_queue_size=DEFAULT_MAX_QUEUE_SIZE,
+        max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+        max_batch_bytes=DEFAULT_MAX_BATCH_BYTES,
+    ):
+        self._buffer = RunDataBuffer(
+            send, max_batch_size, max_batch_bytes, max_age=None
+        )
+        self._queue = queue.Queue(max_queue_size)
+        self._error = None
+        self._error_lock = threading.Lock()
+
+        self._worker = threading.Thread(
+            target=self._run, name="mlflow-faculty-async-logger"
+        )
+        self._worker.daemon = True
+        self._worker.start()
+
+    def log(self, run_id, metrics, params, tags):
+        """Queue run data to be sent in the background.
+
+        The data is queued even if an error from sending earlier data is
+        then raised.
+        """
+        self._queue.put((run_id, list(metrics), list(params), list(tags)))
+        self._raise_pending_error()
+
+    def flush(self):
+        """Block until all queued run data has been sent."""
+        self._queue.join()
+        self._raise_pending_error()
+
+    def _raise_pending_error(self):
+        with self._error_lock:
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _run(self):
+        while True:
+            batches = [self._queue.get()]
+
+            # Take everything else already waiting so it can be coalesced
+            while True:
+                try:
+                    batches.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self._send_coalesced(batches)
+            finally:
+                for _ in batches:
+                    self._queue.task_done()
+
+    def _send_coalesced(self, batches):
+        for run_id, metrics, params, tags in batches:
+            try:
+                self._buffer.add(run_id, metrics, params, tags)
+            except Exception as e:
+                self._hold_error(e)
+        try:
+            self._buffer.flush()
+        except Exception as e:
+            self._hold_error(e)
+
+    def _hold_error(self, error):
+        with self._error_lock:
+            if self._error is None:
+                self._error = error
@@ -0,0 +1,271 @@
+# Copyright 2019-2020 Faculty Science Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+# Prefix of files being written into a DiskCache
+_TEMP_PREFIX = ".tmp-"
+# Seconds since last written after which a temporary file in a DiskCache is
+# taken to be left by a killed process, rather than still being downloaded
+TEMP_FILE_GRACE_PERIOD = 60 * 60
+
+
+class TTLCache(object):
+    """A thread safe mapping whose entries expire and are evicted LRU.
+
+    Parameters
+    ----------
+    ttl : float
+        The time in seconds after which an entry expires.
+    max_size : int
+        The maximum number of entries. When full, the least recently used
+        entry is evicted to make room for a new one.
+    """
+
+    def __init__(self, ttl, max_size):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Get the value cached for a key.
+
+        Raises
+        ------
+        KeyError
+            If there is no entry for the key, or it has expired.
+        """
+        with self._lock:
+            expires_at, value = self._entries.pop(key)
+            if time.time() >= expires_at:
+                raise KeyError(key)
+            # Re-insert to mark as most recently used
+            self._entries[key] = expires_at, value
+            return value
+
+    def set(self, key, value):
+        """Cache a value for a key, evicting old entries if full."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = time.time() + self.ttl, value
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, predicate):
+        """Remove all entries whose key satisfies ``predicate``."""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Guards registries of caches shared by all stores and repositories in the
+# process, which MLflow creates anew for every client and call
+_SHARED_CACHES_LOCK = threading.Lock()
+
+
+def get_shared_cache(registry, ttl, max_size):
+    """Get the cache in a registry with the given settings, creating it.
+
+    Parameters
+    ----------
+    registry : dict
+        The caches of one kind, keyed by their settings.
+    ttl : float
+    max_size : int
+
+    Returns
+    -------
+    TTLCache
+    """
+    with _SHARED_CACHES_LOCK:
+        try:
+            return registry[ttl, max_size]
+        except KeyError:
+            cache = TTLCache(ttl, max_size)
+            registry[ttl, max_size] = cache
+            return cache
+
+
+def invalidate_shared_caches(registry, predicate):
+    """Remove entries satisfying ``predicate`` from all caches in a registry.
+    """
+    with _SHARED_CACHES_LOCK:
+        caches = list(registry.values())
+    for cache in caches:
+        cache.invalidate(predicate)
+
+
+class DiskCache(object):
+    """A directory of downloaded files, shared between processes.
+
+    Each file is stored under a hash of the metadata identifying its
+    content, so a changed remote file gets a new entry rather than being
+    served stale. Entries are written to a temporary file and renamed into
+    place, so concurrent processes never see partial files, and the least
+    recently used entries are deleted once the total size exceeds
+    ``max_bytes``. Temporary files count towards the total, and are deleted
+    once not written to for ``TEMP_FILE_GRACE_PERIOD`` seconds, as left by
+    a process killed mid-download.
+
+    Parameters
+    ----------
+    directory : str
+        The directory to store files in. It is created if needed.
+    max_bytes : int
+        The maximum total size in bytes of the cached files.
+    hardlink : bool, optional
+        If True, files are hardlinked out of the cache where possible,
+        rather than copied. Modifying a hardlinked file in place would
+        modify the cached copy, so only use this for files treated as read
+        only.
+    """
+
+    def __init__(self, directory, max_bytes, hardlink=False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hardlink = hardlink
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # Another process may have created it concurrently
+                if not os.path.isdir(directory):
+                    raise
+
+    @staticmethod
+    def key(*parts):
+        """Build a cache key from the metadata identifying a file."""
+        joined = "\0".join(str(part) for part in parts)
+        return hashlib.sha256(joined.encode("utf-8")).hexdigest()
+
+    def fetch(self, key, local_path, download):
+        """Put the file for a key at a local path, downloading on a miss.
+
+        Parameters
+        ----------
+        key : str
+            The key of the file, as returned by :meth:`key`.
+        local_path : str
+            The path to write the file to.
+        download : callable
+            Called as ``download(path)`` to write the file to ``path`` if
+            it is not cached.
+
+        Returns
+        -------
+        bool
+            True if the file was served from the cache.
+        """
+        if self._restore(key, local_path):
+            return True
+
+        fd, temp_path = tempfile.mkstemp(
+            dir=self.directory, prefix=_TEMP_PREFIX
+        )
+        os.close(fd)
+        try:
+            download(temp_path)
+            self._place(temp_path, local_path)
+            _replace(temp_path, self._entry_path(key))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        self.evict()
+        return False
+
+    def evict(self):
+        """Delete least recently used entries until within ``max_bytes``.
+
+        Abandoned temporary files are also deleted.
+        """
+        stale_before = time.time() - TEMP_FILE_GRACE_PERIOD
+        entries = []
+        temp_bytes = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # Evicted, or finished downloading, in another process
+                continue
+            if not name.startswith(_TEMP_PREFIX):
+                entries.append((stat.st_mtime, stat.st_size, name))
+            elif stat.st_mtime < stale_before:
+                try:
+                    os.remove(path)
+                except OSError:
+                    temp_bytes += stat.st_size
+            else:
+                # Still being downloaded
+                temp_bytes += stat.st_size
+
+        total_bytes = temp_bytes + sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total_bytes -= size
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, key)
+
+    def _restore(self, key, local_path):
+        entry_path = self._entry_path(key)
+        try:
+            # Mark as most recently used
+            os.utime(entry_path, None)
+            self._place(entry_path, local_path)
+        except (IOError, OSError):
+            # Not cached, or evicted by another process meanwhile
+            return False
+        return True
+
+    def _place(self, source, destination):
+        if self.hardlink:
+            if os.path.lexists(destination):
+                os.remove(destination)
+            try:
+                os.link(source, destination)
+                return
+            except OSError:
+                # Not supported, or on a different filesystem
+                pass
+        shutil.copyfile(source, destination)
+
+
+def _replace(source, destination):
+    # os.rename does not overwrite on Windows, and os.replace is Python 3
+    # only
+    replace = getattr(os, "replace", os.rename)
+    replace(source, destination)
@@ -0,0 +1,73 @@
+# Copyright 2019-2020 Faculty Science Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import gzip
+import shutil
+
+# The suffix marking files stored with each supported compression. These are
+# not the usual extensions, e.g. .gz, so that artifacts which are themselves
+# compressed files are not mistaken for ones compressed for storage
+COMPRESSION_SUFFIXES = {"gzip": ".mlflow-gzip"}
+
+
+def compression_suffix(compression):
+    """Get the suffix marking files stored with a compression.
+
+    Parameters
+    ----------
+    compression : str
+        The name of the compression, e.g. ``"gzip"``.
+
+    Returns
+    -------
+    str
+
+    Raises
+    ------
+    ValueError
+        If the compression is not supported.
+    """
+    try:
+        return COMPRESSION_SUFFIXES[compression]
+    except KeyError:
+        raise ValueError(
+            "Unsupported compression {!r}. Supported compressions are: "
+            "{}".format(compression, ", ".join(sorted(COMPRESSION_SUFFIXES)))
+        )
+
+
+def compress_file(local_path, compressed_path, compression="gzip"):
+    """Write a compressed copy of a file.
+
+    The output depends only on the content of the file, not its name or
+    modification time, so unchanged files compress identically.
+    """
+    compression_suffix(compression)
+    with open(local_path, "rb") as source, open(
+        compressed_path, "wb"
+    ) as destination:
+        with gzip.GzipFile(
+            filename="", mode="wb", fileobj=destination, mtime=0
+        ) as compressed:
+            shutil.copyfileobj(source, compressed)
+
+
+def decompress_file(compressed_path, local_path, compression="gzip"):
+    """Write a decompressed copy of a compressed file."""
+    compression_suffix(compression)
+    with gzip.GzipFile(compressed_path, mode="rb") as compressed, open(
+        local_path, "wb"
+    ) as destination:
+        shutil.copyfileobj(compressed, destination)
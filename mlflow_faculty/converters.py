@@ -13,15 +13,22 @@
 # limitations under the License.
 
 
+import base64
+import binascii
+import json
 import posixpath
+from collections import OrderedDict
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
 from pytz import UTC
 
 from faculty.clients.experiment import (
     ExperimentRunStatus as FacultyExperimentRunStatus,
     LifecycleStage as FacultyLifecycleStage,
     Metric as FacultyMetric,
+    Page as FacultyPage,
     Param as FacultyParam,
     Tag as FacultyTag,
 )
@@ -38,6 +45,7 @@ from mlflow.entities import (
     RunTag,
     ViewType,
 )
+from mlflow_faculty.history import MetricHistory
 from mlflow_faculty.py23 import to_timestamp
 from mlflow.exceptions import MlflowException
 from mlflow.utils.mlflow_tags import MLFLOW_RUN_NAME, MLFLOW_PARENT_RUN_ID
@@ -111,22 +119,9 @@ def faculty_run_to_mlflow_run(faculty_run):
         else None
     )
 
-    tag_dict = {tag.key: tag.value for tag in faculty_run.tags}
-
-    extra_mlflow_tags = []
-
-    # Set run name tag if set as attribute but not already a tag
-    if MLFLOW_RUN_NAME not in tag_dict and faculty_run.name:
-        extra_mlflow_tags.append(RunTag(MLFLOW_RUN_NAME, faculty_run.name))
-
-    # Set parent run ID tag if set as attribute but not already a tag
-    if (
-        MLFLOW_PARENT_RUN_ID not in tag_dict
-        and faculty_run.parent_run_id is not None
-    ):
-        extra_mlflow_tags.append(
-            RunTag(MLFLOW_PARENT_RUN_ID, faculty_run.parent_run_id.hex)
-        )
+    extra_mlflow_tags = [
+        RunTag(key, value) for key, value in _extra_tag_items(faculty_run)
+    ]
 
     run_info = RunInfo(
         run_uuid=faculty_run.id.hex,
@@ -155,6 +150,107 @@ def faculty_run_to_mlflow_run(faculty_run):
     return run
 
 
+def _extra_tag_items(faculty_run):
+    """Get tags to add for run attributes not already stored as tags."""
+    tag_keys = {tag.key for tag in faculty_run.tags}
+
+    extra_tag_items = []
+
+    # Set run name tag if set as attribute but not already a tag
+    if MLFLOW_RUN_NAME not in tag_keys and faculty_run.name:
+        extra_tag_items.append((MLFLOW_RUN_NAME, faculty_run.name))
+
+    # Set parent run ID tag if set as attribute but not already a tag
+    if (
+        MLFLOW_PARENT_RUN_ID not in tag_keys
+        and faculty_run.parent_run_id is not None
+    ):
+        extra_tag_items.append(
+            (MLFLOW_PARENT_RUN_ID, faculty_run.parent_run_id.hex)
+        )
+
+    return extra_tag_items
+
+
+def faculty_runs_to_frame(faculty_runs):
+    """Build a DataFrame of runs in the format of ``mlflow.search_runs``.
+
+    Columns are built directly from the Faculty runs, without creating
+    intermediate MLflow entities. Metric columns have dtype float64, with
+    NaN for runs missing the metric, and param and tag columns hold
+    ``None`` for runs missing the key.
+
+    Parameters
+    ----------
+    faculty_runs : Iterable[faculty.clients.experiment.ExperimentRun]
+        The runs to include, one per row. May be a generator, which is
+        consumed once.
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    info = OrderedDict(
+        (name, [])
+        for name in ["run_id", "experiment_id", "status", "artifact_uri"]
+    )
+    start_times = []
+    end_times = []
+    metrics = OrderedDict()
+    params = OrderedDict()
+    tags = OrderedDict()
+
+    num_runs = 0
+    for row, faculty_run in enumerate(faculty_runs):
+        info["run_id"].append(faculty_run.id.hex)
+        info["experiment_id"].append(str(faculty_run.experiment_id))
+        info["status"].append(
+            _FACULTY_TO_MLFLOW_RUN_STATUS_MAP[faculty_run.status]
+        )
+        info["artifact_uri"].append(faculty_run.artifact_location)
+        start_times.append(
+            _datetime_to_mlflow_timestamp(faculty_run.started_at)
+        )
+        end_times.append(
+            None
+            if faculty_run.ended_at is None
+            else _datetime_to_mlflow_timestamp(faculty_run.ended_at)
+        )
+
+        for metric in faculty_run.metrics:
+            _set_cell(metrics, metric.key, row, metric.value)
+        for param in faculty_run.params:
+            _set_cell(params, param.key, row, param.value)
+        for tag in faculty_run.tags:
+            _set_cell(tags, tag.key, row, tag.value)
+        for key, value in _extra_tag_items(faculty_run):
+            _set_cell(tags, key, row, value)
+
+        num_runs = row + 1
+
+    data = OrderedDict(
+        (name, np.array(values, dtype=object)) for name, values in info.items()
+    )
+    data["start_time"] = pd.to_datetime(start_times, unit="ms", utc=True)
+    data["end_time"] = pd.to_datetime(end_times, unit="ms", utc=True)
+    for prefix, cells, dtype, null in [
+        ("metrics.", metrics, np.float64, np.nan),
+        ("params.", params, object, None),
+        ("tags.", tags, object, None),
+    ]:
+        for key, column_cells in cells.items():
+            column = np.full(num_runs, null, dtype=dtype)
+            column[list(column_cells.keys())] = list(column_cells.values())
+            data[prefix + key] = column
+
+    return pd.DataFrame(data, columns=list(data))
+
+
+def _set_cell(cells, key, row, value):
+    # Later entries for the same key win, as when building RunData
+    cells.setdefault(key, OrderedDict())[row] = value
+
+
 def faculty_metric_to_mlflow_metric(faculty_metric):
     return Metric(
         key=faculty_metric.key,
@@ -164,6 +260,52 @@ def faculty_metric_to_mlflow_metric(faculty_metric):
     )
 
 
+def faculty_metric_history_to_array(faculty_metrics):
+    """Convert the history of a metric to a NumPy structured array.
+
+    Parameters
+    ----------
+    faculty_metrics : List[faculty.clients.experiment.Metric]
+
+    Returns
+    -------
+    numpy.ndarray
+        An array of ``mlflow_faculty.history.METRIC_HISTORY_DTYPE``, with
+        one element for each metric, in the same order.
+    """
+    return faculty_metric_history_to_metric_history(
+        None, faculty_metrics
+    ).to_array()
+
+
+def faculty_metric_history_to_metric_history(metric_key, faculty_metrics):
+    """Convert the history of a metric to a compact ``MetricHistory``.
+
+    Timestamps are converted for all points at once, rather than creating
+    an MLflow ``Metric`` for each point.
+
+    Parameters
+    ----------
+    metric_key : str
+    faculty_metrics : List[faculty.clients.experiment.Metric]
+
+    Returns
+    -------
+    mlflow_faculty.history.MetricHistory
+    """
+    steps = np.array([metric.step for metric in faculty_metrics], np.int64)
+    values = np.array([metric.value for metric in faculty_metrics], np.float64)
+    timestamps = _datetimes_to_mlflow_timestamps(
+        [metric.timestamp for metric in faculty_metrics]
+    )
+    return MetricHistory(metric_key, steps, timestamps, values)
+
+
+def _datetimes_to_mlflow_timestamps(datetimes):
+    nanoseconds = pd.to_datetime(datetimes, utc=True).values.view(np.int64)
+    return nanoseconds // 1000000
+
+
 def mlflow_metric_to_faculty_metric(mlflow_metric):
     return FacultyMetric(
         key=mlflow_metric.key,
@@ -219,3 +361,31 @@ def faculty_object_to_mlflow_file_info(faculty_object, artifact_root):
         is_dir=is_dir,
         file_size=None if is_dir else faculty_object.size,
     )
+
+
+def faculty_page_to_mlflow_page_token(faculty_page):
+    payload = json.dumps(
+        {"start": faculty_page.start, "limit": faculty_page.limit}
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def mlflow_page_token_to_faculty_page(mlflow_page_token):
+    try:
+        payload = json.loads(
+            base64.urlsafe_b64decode(mlflow_page_token.encode("ascii")).decode(
+                "utf-8"
+            )
+        )
+        return FacultyPage(
+            start=int(payload["start"]), limit=int(payload["limit"])
+        )
+    except (
+        AttributeError,
+        binascii.Error,
+        KeyError,
+        TypeError,
+        UnicodeError,
+        ValueError,
+    ):
+        raise ValueError("Invalid page token {!r}".format(mlflow_page_token))
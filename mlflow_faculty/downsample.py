@@ -0,0 +1,139 @@
+# Copyright 2019-2020 Faculty Science Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import numpy as np
+
+# LTTB always keeps the first and last points, plus one from each bucket
+MIN_POINTS = 3
+
+
+def lttb_indices(x, y, max_points):
+    """Select points of a series to plot with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. The points in between are
+    split into ``max_points - 2`` buckets of equal count, and from each
+    bucket the point forming the largest triangle with the previously
+    selected point and the mean of the next bucket is kept. The selection
+    depends only on the inputs, with ties going to the earliest point.
+
+    Points with NaN values, as logged by diverging losses, are left out of
+    the means and only selected from buckets holding nothing else, and the
+    triangles of the next bucket are then formed with the last selected
+    point with a value.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        The x coordinate of each point, in non-decreasing order.
+    y : numpy.ndarray
+        The y coordinate of each point.
+    max_points : int
+        The maximum number of points to select.
+
+    Returns
+    -------
+    numpy.ndarray
+        The indices of the selected points, in increasing order.
+
+    Raises
+    ------
+    ValueError
+        If ``max_points`` is less than 3, or ``x`` and ``y`` differ in
+        length.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if len(x) != len(y):
+        raise ValueError("x and y differ in length")
+    if max_points < MIN_POINTS:
+        raise ValueError(
+            "max_points must be at least {}, got {}".format(
+                MIN_POINTS, max_points
+            )
+        )
+
+    num_points = len(x)
+    if num_points <= max_points:
+        return np.arange(num_points)
+
+    num_buckets = max_points - 2
+    # Bucket i holds points bounds[i] to bounds[i + 1]; the last bound is the
+    # final point, which forms a bucket of its own
+    bounds = [
+        1 + (i * (num_points - 2)) // num_buckets
+        for i in range(num_buckets + 1)
+    ] + [num_points]
+
+    selected = np.empty(max_points, dtype=np.intp)
+    # The triangles are formed with the last selected point with a value,
+    # as any area from a NaN is NaN
+    selected[0] = previous = 0
+    for bucket in range(num_buckets):
+        start, end = bounds[bucket], bounds[bucket + 1]
+        next_start, next_end = bounds[bucket + 1], bounds[bucket + 2]
+        next_x = x[next_start:next_end]
+        next_y = y[next_start:next_end]
+        valid = ~np.isnan(next_y)
+        if valid.any():
+            mean_x = next_x[valid].mean()
+            mean_y = next_y[valid].mean()
+        else:
+            mean_x = next_x.mean()
+            mean_y = y[previous]
+
+        # Twice the area of each triangle, which has the same maximum
+        areas = np.abs(
+            (x[previous] - mean_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (mean_y - y[previous])
+        )
+        areas[np.isnan(areas)] = -np.inf
+        chosen = start + int(np.argmax(areas))
+        selected[bucket + 1] = chosen
+        if not np.isnan(y[chosen]) or np.isnan(y[previous]):
+            previous = chosen
+    selected[-1] = num_points - 1
+
+    return selected
+
+
+def downsample_metric_history(metrics, max_points):
+    """Select points of a metric history to plot, keeping its order.
+
+    Only the steps and values of the metrics are read, so the selected
+    points can be converted without converting the whole history. Points
+    are placed at their steps, or at their positions in the history if the
+    steps are not in order.
+
+    Parameters
+    ----------
+    metrics : List[faculty.clients.experiment.Metric]
+        The history of a metric.
+    max_points : int
+        The maximum number of points to keep, at least 3.
+
+    Returns
+    -------
+    List[faculty.clients.experiment.Metric]
+    """
+    num_points = len(metrics)
+    if num_points <= max_points:
+        return list(metrics)
+
+    steps = np.fromiter((m.step for m in metrics), np.float64, num_points)
+    values = np.fromiter((m.value for m in metrics), np.float64, num_points)
+    if np.any(np.diff(steps) < 0):
+        steps = np.arange(num_points)
+
+    return [metrics[i] for i in lttb_indices(steps, values, max_points)]
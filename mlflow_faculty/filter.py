@@ -35,10 +35,15 @@ from faculty.clients.experiment import (
     ExperimentRunStatus,
     LogicalOperator,
     MetricFilter,
+    MetricSort,
     ParamFilter,
+    ParamSort,
     RunIdFilter,
     RunStatusFilter,
+    SortOrder,
+    StartedAtSort,
     TagFilter,
+    TagSort,
 )
 from mlflow.entities import ViewType
 
@@ -47,6 +52,11 @@ INVALID_IDENTIFIER_TPL = (
     "'attribute.run_id', 'attribute.status', 'metric.<key>', 'tag.<key>', "
     "or 'params.<key>'."
 )
+INVALID_ORDER_BY_TPL = (
+    "Invalid order_by clause {!r}. Expected clause of format "
+    "'<identifier> [ASC|DESC]' with identifier 'attribute.start_time', "
+    "'metric.<key>', 'tag.<key>', or 'params.<key>'."
+)
 INVALID_OPERATOR_TPL = "{!r} is not a valid operator."
 INVALID_VALUE_TPL = "Expected {} but found {!r}"
 
@@ -54,13 +64,19 @@ INVALID_VALUE_TPL = "Expected {} but found {!r}"
 class _KeyType(Enum):
     RUN_ID = "run ID"
     STATUS = "status"
+    START_TIME = "start time"
     PARAM = "parameter"
     METRIC = "metric"
     TAG = "tag"
 
 
 ATTRIBUTE_IDENTIFIERS = {"attribute", "attributes", "attr", "run"}
-RUN_ID_IDENTIFIERS = {"id", "run_id"}
+FILTER_ATTRIBUTE_KEY_TYPES = {
+    "id": _KeyType.RUN_ID,
+    "run_id": _KeyType.RUN_ID,
+    "status": _KeyType.STATUS,
+}
+SORT_ATTRIBUTE_KEY_TYPES = {"start_time": _KeyType.START_TIME}
 PARAM_IDENTIFIERS = {"param", "params", "parameter", "parameters"}
 METRIC_IDENTIFIERS = {"metric", "metrics"}
 TAG_IDENTIFIERS = {"tag", "tags"}
@@ -110,6 +126,37 @@ def build_search_runs_filter(experiment_ids, filter_string, view_type):
         return CompoundFilter(LogicalOperator.AND, filter_parts)
 
 
+def build_run_ids_filter(run_ids):
+    """Build a filter that a run has one of a sequence of run IDs.
+
+    Parameters
+    ----------
+    run_ids : Sequence[uuid.UUID]
+
+    Returns
+    -------
+    A Faculty library filter object.
+    """
+
+    if len(run_ids) == 0:
+        # Cannot build a filter for this
+        raise MatchesNothing()
+
+    parts = [
+        RunIdFilter(ComparisonOperator.EQUAL_TO, run_id) for run_id in run_ids
+    ]
+
+    if len(parts) == 1:
+        return parts[0]
+    else:
+        return CompoundFilter(LogicalOperator.OR, parts)
+
+
+def build_search_runs_sort(order_by):
+    """Build a list of sorts from the order_by input to search_runs."""
+    return [_parse_order_by_clause(clause) for clause in order_by]
+
+
 def _filter_by_experiment_id(experiment_ids):
     """Build a filter that a run is in one of a sequence of experiment IDs."""
 
@@ -260,7 +307,56 @@ def _single_filter_from_tokens(identifier_token, operator_token, value_token):
         raise Exception("Unexpected key_type")
 
 
-def _parse_identifier(token):
+def _parse_order_by_clause(clause):
+    """Parse an MLflow order_by clause into a Faculty sort object."""
+    try:
+        [statement] = sqlparse.parse(clause)
+    except Exception:
+        raise ValueError(INVALID_ORDER_BY_TPL.format(clause))
+
+    tokens = [t for t in statement.tokens if not t.is_whitespace]
+    if len(tokens) != 1 or not isinstance(tokens[0], SqlIdentifier):
+        raise ValueError(INVALID_ORDER_BY_TPL.format(clause))
+    [token] = tokens
+
+    # An ordering keyword is grouped into the identifier by sqlparse
+    parts = [t for t in token.tokens if not t.is_whitespace]
+    if parts[-1].ttype == SqlTokenType.Keyword.Order:
+        if len(parts) != 2:
+            raise ValueError(INVALID_ORDER_BY_TPL.format(clause))
+        identifier_token = parts[0]
+        if parts[-1].normalized == "DESC":
+            order = SortOrder.DESC
+        else:
+            order = SortOrder.ASC
+    else:
+        identifier_token = token
+        order = SortOrder.ASC
+
+    # Anything else trailing the key is also grouped into the identifier
+    if any(t.is_whitespace or t.is_group for t in identifier_token.tokens):
+        raise ValueError(INVALID_ORDER_BY_TPL.format(clause))
+
+    try:
+        key_type, key = _parse_identifier(
+            identifier_token, SORT_ATTRIBUTE_KEY_TYPES
+        )
+    except ValueError:
+        raise ValueError(INVALID_ORDER_BY_TPL.format(clause))
+
+    if key_type == _KeyType.START_TIME:
+        return StartedAtSort(order)
+    elif key_type == _KeyType.PARAM:
+        return ParamSort(key, order)
+    elif key_type == _KeyType.METRIC:
+        return MetricSort(key, order)
+    elif key_type == _KeyType.TAG:
+        return TagSort(key, order)
+    else:
+        raise Exception("Unexpected key_type")
+
+
+def _parse_identifier(token, attribute_key_types=FILTER_ATTRIBUTE_KEY_TYPES):
     if not isinstance(token, SqlIdentifier):
         raise ValueError(INVALID_IDENTIFIER_TPL.format(token.value))
 
@@ -272,11 +368,9 @@ def _parse_identifier(token):
     key = _strip_quotes(key, ['"', "`"])
 
     if key_type_string in ATTRIBUTE_IDENTIFIERS:
-        if key in RUN_ID_IDENTIFIERS:
-            return _KeyType.RUN_ID, None
-        elif key == "status":
-            return _KeyType.STATUS, None
-        else:
+        try:
+            return attribute_key_types[key], None
+        except KeyError:
             raise ValueError(INVALID_IDENTIFIER_TPL.format(token.value))
     elif key_type_string in PARAM_IDENTIFIERS:
         return _KeyType.PARAM, key
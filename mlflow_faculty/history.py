@@ -0,0 +1,97 @@
+# Copyright 2019-2020 Faculty Science Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import numpy as np
+from mlflow.entities import Metric
+
+# The fields of arrays of metric histories, with timestamps in milliseconds
+# since the epoch, as in MLflow
+METRIC_HISTORY_DTYPE = np.dtype(
+    [("step", np.int64), ("timestamp", np.int64), ("value", np.float64)]
+)
+
+
+class MetricHistory(object):
+    """The history of a metric, stored compactly in arrays.
+
+    It can be used in place of a list of :class:`mlflow.entities.Metric`:
+    indexing or iterating over it creates ``Metric`` objects one at a time,
+    as they are needed.
+
+    Parameters
+    ----------
+    key : str
+        The name of the metric.
+    steps : numpy.ndarray
+        The step of each point, as int64.
+    timestamps : numpy.ndarray
+        The time of each point in milliseconds since the epoch, as int64.
+    values : numpy.ndarray
+        The value of each point, as float64.
+    """
+
+    __slots__ = ("key", "steps", "timestamps", "values")
+
+    def __init__(self, key, steps, timestamps, values):
+        self.key = key
+        self.steps = np.asarray(steps, dtype=np.int64)
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.values = np.asarray(values, dtype=np.float64)
+        if not len(self.steps) == len(self.timestamps) == len(self.values):
+            raise ValueError("steps, timestamps and values differ in length")
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return MetricHistory(
+                self.key,
+                self.steps[index],
+                self.timestamps[index],
+                self.values[index],
+            )
+        return Metric(
+            self.key,
+            float(self.values[index]),
+            int(self.timestamps[index]),
+            int(self.steps[index]),
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __add__(self, other):
+        if not isinstance(other, MetricHistory):
+            return NotImplemented
+        return MetricHistory(
+            self.key,
+            np.concatenate([self.steps, other.steps]),
+            np.concatenate([self.timestamps, other.timestamps]),
+            np.concatenate([self.values, other.values]),
+        )
+
+    def __repr__(self):
+        return "<MetricHistory key={!r} length={}>".format(self.key, len(self))
+
+    def to_array(self):
+        """Get the history as a structured array of ``METRIC_HISTORY_DTYPE``.
+        """
+        array = np.empty(len(self), dtype=METRIC_HISTORY_DTYPE)
+        array["step"] = self.steps
+        array["timestamp"] = self.timestamps
+        array["value"] = self.values
+        return array
@@ -0,0 +1,115 @@
+# Copyright 2019-2020 Faculty Science Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+
+from six.moves import urllib
+
+TRUE_STRINGS = {"true", "1", "yes", "on"}
+FALSE_STRINGS = {"false", "0", "no", "off"}
+
+
+def parse_uri_options(uri, defaults):
+    """Parse options from the query string of a plugin URI.
+
+    Parameters
+    ----------
+    uri : str
+        The URI to parse, e.g. ``faculty:<project-id>?async=true``.
+    defaults : dict
+        Mapping of every supported option name to its default value. Values
+        given in the URI are converted to the type of the default.
+
+    Returns
+    -------
+    dict
+        The default options, updated with any values set in the URI.
+    """
+    query = urllib.parse.urlparse(uri).query
+    options = dict(defaults)
+
+    for name, value in urllib.parse.parse_qsl(query, keep_blank_values=True):
+        if name not in defaults:
+            raise ValueError(
+                "Unknown option {!r} in URI {}. Supported options are: "
+                "{}".format(name, uri, ", ".join(sorted(defaults)))
+            )
+        try:
+            options[name] = _convert(value, defaults[name])
+        except ValueError:
+            raise ValueError(
+                "Invalid value {!r} for option {!r} in URI {}".format(
+                    value, name, uri
+                )
+            )
+
+    return options
+
+
+def parse_env_options(prefix, defaults, environ=None):
+    """Parse options from environment variables.
+
+    Each option is read from the variable named by ``prefix`` followed by
+    the option name in upper case, e.g. ``MLFLOW_FACULTY_ARTIFACT_SYNC`` for
+    ``sync`` with the prefix ``MLFLOW_FACULTY_ARTIFACT_``.
+
+    Parameters
+    ----------
+    prefix : str
+        The prefix of the names of the environment variables.
+    defaults : dict
+        Mapping of every supported option name to its default value. Values
+        set in the environment are converted to the type of the default.
+    environ : dict, optional
+        The environment to read. Defaults to ``os.environ``.
+
+    Returns
+    -------
+    dict
+        The default options, updated with any values set in the environment.
+    """
+    environ = os.environ if environ is None else environ
+    options = dict(defaults)
+
+    for name, default in defaults.items():
+        variable = prefix + name.upper()
+        try:
+            value = environ[variable]
+        except KeyError:
+            continue
+        try:
+            options[name] = _convert(value, default)
+        except ValueError:
+            raise ValueError(
+                "Invalid value {!r} for environment variable {}".format(
+                    value, variable
+                )
+            )
+
+    return options
+
+
+def _convert(value, default):
+    if isinstance(default, bool):
+        if value.lower() in TRUE_STRINGS:
+            return True
+        elif value.lower() in FALSE_STRINGS:
+            return False
+        else:
+            raise ValueError(value)
+    elif default is None:
+        return value
+    else:
+        return type(default)(value)
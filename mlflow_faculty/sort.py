@@ -0,0 +1,131 @@
+# Copyright 2019-2020 Faculty Science Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import heapq
+import math
+from functools import total_ordering
+
+from faculty.clients.experiment import (
+    MetricSort,
+    ParamSort,
+    SortOrder,
+    StartedAtSort,
+    TagSort,
+)
+from mlflow.utils.mlflow_tags import MLFLOW_RUN_NAME
+
+
+def sort_faculty_runs(faculty_runs, sorts, limit=None):
+    """Sort Faculty runs client side.
+
+    Parameters
+    ----------
+    faculty_runs : Iterable[faculty.clients.experiment.ExperimentRun]
+        The runs to sort. May be a generator, which is consumed once.
+    sorts : List[Sort]
+        Faculty sort objects, as built by
+        :func:`mlflow_faculty.filter.build_search_runs_sort`.
+    limit : int, optional
+        Only return the first ``limit`` runs. These are selected with a
+        bounded heap, so only ``limit`` runs are held in memory at once.
+
+    Returns
+    -------
+    List[faculty.clients.experiment.ExperimentRun]
+    """
+    key = faculty_run_sort_key(sorts)
+    if limit is None:
+        return sorted(faculty_runs, key=key)
+    else:
+        return heapq.nsmallest(limit, faculty_runs, key=key)
+
+
+def faculty_run_sort_key(sorts):
+    """Build a function computing the sort key of a Faculty run.
+
+    Runs with no value for a key are placed after all others, whatever the
+    sort order. Remaining ties are broken by most recent start time and then
+    run ID, as in MLflow's own tracking stores.
+    """
+
+    def key(faculty_run):
+        parts = []
+        for sort in sorts:
+            value = _sort_value(faculty_run, sort)
+            if value is None:
+                parts.append((1, None))
+            elif sort.order == SortOrder.DESC:
+                parts.append((0, _Descending(value)))
+            else:
+                parts.append((0, value))
+        parts.append(_Descending(faculty_run.started_at))
+        parts.append(faculty_run.id)
+        return tuple(parts)
+
+    return key
+
+
+def _sort_value(faculty_run, sort):
+    if isinstance(sort, StartedAtSort):
+        return faculty_run.started_at
+    elif isinstance(sort, MetricSort):
+        return _latest_metric_value(faculty_run, sort.key)
+    elif isinstance(sort, ParamSort):
+        return _value_by_key(faculty_run.params, sort.key)
+    elif isinstance(sort, TagSort):
+        value = _value_by_key(faculty_run.tags, sort.key)
+        if value is None and sort.key == MLFLOW_RUN_NAME:
+            # Match the run name tag added in faculty_run_to_mlflow_run
+            value = faculty_run.name or None
+        return value
+    else:
+        raise ValueError("Unsupported sort: {}".format(sort))
+
+
+def _latest_metric_value(faculty_run, key):
+    latest = None
+    for metric in faculty_run.metrics:
+        if metric.key == key and (
+            latest is None
+            or (metric.step, metric.timestamp)
+            > (latest.step, latest.timestamp)
+        ):
+            latest = metric
+    if latest is None or math.isnan(latest.value):
+        return None
+    return latest.value
+
+
+def _value_by_key(entries, key):
+    for entry in entries:
+        if entry.key == key:
+            return entry.value
+    return None
+
+
+@total_ordering
+class _Descending(object):
+    """Wrap a value to reverse its ordering."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return other.value < self.value
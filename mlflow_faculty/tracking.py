@@ -13,34 +13,144 @@
 # limitations under the License.
 
 
+import atexit
+import threading
+from collections import OrderedDict, deque
+from enum import Enum
 from uuid import UUID
-from itertools import islice
+
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 
 from six.moves import urllib
 
 import faculty
 import faculty.clients.base
 import faculty.clients.experiment
-from faculty.clients.experiment import ExperimentDeleted, ParamConflict
+from faculty.clients.experiment import (
+    ExperimentDeleted,
+    ExperimentRunStatus as FacultyExperimentRunStatus,
+    Page,
+    ParamConflict,
+)
 from mlflow.entities import ViewType
 from mlflow.exceptions import MlflowException
+from mlflow.protos.databricks_pb2 import RESOURCE_DOES_NOT_EXIST
 from mlflow.store.tracking.abstract_store import AbstractStore
 from mlflow.utils.mlflow_tags import MLFLOW_RUN_NAME, MLFLOW_PARENT_RUN_ID
 
 import mlflow_faculty.filter
-from mlflow_faculty.filter import build_search_runs_filter
+from mlflow_faculty.batching import (
+    AsyncRunDataLogger,
+    RunDataBuffer,
+    DEFAULT_MAX_BATCH_AGE,
+    DEFAULT_MAX_BATCH_BYTES,
+    DEFAULT_MAX_BATCH_SIZE,
+    DEFAULT_MAX_QUEUE_SIZE,
+)
+from mlflow_faculty.cache import get_shared_cache, invalidate_shared_caches
+from mlflow_faculty.filter import (
+    build_run_ids_filter,
+    build_search_runs_filter,
+    build_search_runs_sort,
+)
 from mlflow_faculty.converters import (
     faculty_experiment_to_mlflow_experiment,
     faculty_http_error_to_mlflow_exception,
+    faculty_metric_history_to_array,
+    faculty_metric_history_to_metric_history,
     faculty_metric_to_mlflow_metric,
+    faculty_page_to_mlflow_page_token,
     faculty_run_to_mlflow_run,
+    faculty_runs_to_frame,
     mlflow_timestamp_to_datetime,
     mlflow_metric_to_faculty_metric,
+    mlflow_page_token_to_faculty_page,
     mlflow_param_to_faculty_param,
     mlflow_tag_to_faculty_tag,
     mlflow_viewtype_to_faculty_lifecycle_stage,
     mlflow_to_faculty_run_status,
 )
+from mlflow_faculty.downsample import MIN_POINTS, downsample_metric_history
+from mlflow_faculty.options import parse_uri_options
+from mlflow_faculty.sort import sort_faculty_runs
+
+# The default number of runs in search_runs_frame, as in mlflow.search_runs.
+# This is not imported from mlflow.tracking.fluent, as MLflow registers
+# plugins while mlflow.tracking is being imported
+SEARCH_RUNS_FRAME_MAX_RESULTS = 100000
+
+DEFAULT_OPTIONS = {
+    "async": False,
+    "async_queue_size": DEFAULT_MAX_QUEUE_SIZE,
+    "buffer": False,
+    "buffer_max_size": DEFAULT_MAX_BATCH_SIZE,
+    "buffer_max_bytes": DEFAULT_MAX_BATCH_BYTES,
+    "buffer_max_age": DEFAULT_MAX_BATCH_AGE,
+    "search_prefetch": 0,
+    "experiment_cache_ttl": 0.0,
+    "experiment_cache_size": 1000,
+    "run_batch_size": 500,
+    "run_batch_workers": 1,
+    "metric_history_workers": 8,
+    "metric_history_compact": False,
+    "metric_history_cache_ttl": 0.0,
+    "metric_history_cache_size": 1000,
+}
+
+# No more metrics are logged to runs with these statuses
+_TERMINAL_RUN_STATUSES = {
+    FacultyExperimentRunStatus.FINISHED,
+    FacultyExperimentRunStatus.FAILED,
+    FacultyExperimentRunStatus.KILLED,
+}
+
+
+class RunOutcome(Enum):
+    """The outcome for a single run of a bulk delete or restore."""
+
+    DELETED = "deleted"
+    RESTORED = "restored"
+    CONFLICTED = "conflicted"
+    MISSING = "missing"
+
+
+# Stores are created for every MLflow client, so experiment and metric history
+# caches are shared by all stores in the process with the same cache settings
+_EXPERIMENT_CACHES = {}
+_METRIC_HISTORY_CACHES = {}
+
+
+# Run data loggers are likewise shared by all stores in the process with the
+# same project and logging settings, so that data logged through one store is
+# coalesced with, and flushed by, any other
+_RUN_DATA_LOGGERS = {}
+_RUN_DATA_LOGGERS_LOCK = threading.Lock()
+
+
+def _get_shared_run_data_logger(key, create):
+    with _RUN_DATA_LOGGERS_LOCK:
+        try:
+            return _RUN_DATA_LOGGERS[key]
+        except KeyError:
+            run_data_logger = create()
+            _RUN_DATA_LOGGERS[key] = run_data_logger
+            return run_data_logger
+
+
+@atexit.register
+def _flush_run_data_loggers():
+    with _RUN_DATA_LOGGERS_LOCK:
+        run_data_loggers = list(_RUN_DATA_LOGGERS.values())
+    error = None
+    for run_data_logger in run_data_loggers:
+        try:
+            run_data_logger.flush()
+        except Exception as e:
+            if error is None:
+                error = e
+    if error is not None:
+        raise error
 
 
 class FacultyRestStore(AbstractStore):
@@ -65,8 +175,71 @@ class FacultyRestStore(AbstractStore):
                 )
             )
 
+        options = parse_uri_options(store_uri, DEFAULT_OPTIONS)
+
         self._client = faculty.client("experiment")
 
+        self._async_logger = None
+        self._buffer = None
+        if options["async"]:
+            self._async_logger = _get_shared_run_data_logger(
+                (
+                    "async",
+                    self._project_id,
+                    options["async_queue_size"],
+                    options["buffer_max_size"],
+                    options["buffer_max_bytes"],
+                ),
+                lambda: AsyncRunDataLogger(
+                    self._log_run_data,
+                    options["async_queue_size"],
+                    options["buffer_max_size"],
+                    options["buffer_max_bytes"],
+                ),
+            )
+        elif options["buffer"]:
+            self._buffer = _get_shared_run_data_logger(
+                (
+                    "buffer",
+                    self._project_id,
+                    options["buffer_max_size"],
+                    options["buffer_max_bytes"],
+                    options["buffer_max_age"],
+                ),
+                lambda: RunDataBuffer(
+                    self._log_run_data,
+                    options["buffer_max_size"],
+                    options["buffer_max_bytes"],
+                    options["buffer_max_age"],
+                ),
+            )
+
+        self._search_prefetch = options["search_prefetch"]
+        self._run_batch_size = options["run_batch_size"]
+        self._run_batch_workers = options["run_batch_workers"]
+        self._metric_history_workers = options["metric_history_workers"]
+        self._metric_history_compact = options["metric_history_compact"]
+        self._connection_pool_size = DEFAULT_POOLSIZE
+        self._connection_pool_lock = threading.Lock()
+
+        if options["experiment_cache_ttl"] > 0:
+            self._experiment_cache = get_shared_cache(
+                _EXPERIMENT_CACHES,
+                options["experiment_cache_ttl"],
+                options["experiment_cache_size"],
+            )
+        else:
+            self._experiment_cache = None
+
+        if options["metric_history_cache_ttl"] > 0:
+            self._metric_history_cache = get_shared_cache(
+                _METRIC_HISTORY_CACHES,
+                options["metric_history_cache_ttl"],
+                options["metric_history_cache_size"],
+            )
+        else:
+            self._metric_history_cache = None
+
     def list_experiments(self, view_type=ViewType.ACTIVE_ONLY):
         """
         :param view_type: Qualify requested type of experiments.
@@ -76,16 +249,33 @@ class FacultyRestStore(AbstractStore):
         """
         lifecycle_stage = mlflow_viewtype_to_faculty_lifecycle_stage(view_type)
         try:
-            faculty_experiments = self._client.list(
-                self._project_id, lifecycle_stage
+            faculty_experiments = self._get_cached(
+                (self._project_id, "list", lifecycle_stage)
+            )
+        except KeyError:
+            faculty_experiments = self._fetch_experiments(lifecycle_stage)
+        return [
+            faculty_experiment_to_mlflow_experiment(faculty_experiment)
+            for faculty_experiment in faculty_experiments
+        ]
+
+    def _fetch_experiments(self, lifecycle_stage):
+        try:
+            faculty_experiments = tuple(
+                self._client.list(self._project_id, lifecycle_stage)
             )
         except faculty.clients.base.HttpError as e:
             raise faculty_http_error_to_mlflow_exception(e)
-        else:
-            return [
-                faculty_experiment_to_mlflow_experiment(faculty_experiment)
-                for faculty_experiment in faculty_experiments
-            ]
+
+        self._set_cached(
+            (self._project_id, "list", lifecycle_stage), faculty_experiments
+        )
+        for faculty_experiment in faculty_experiments:
+            self._set_cached(
+                (self._project_id, "id", faculty_experiment.id),
+                faculty_experiment,
+            )
+        return faculty_experiments
 
     def create_experiment(self, name, artifact_location):
         """
@@ -110,6 +300,7 @@ class FacultyRestStore(AbstractStore):
         except faculty.clients.base.HttpError as e:
             raise faculty_http_error_to_mlflow_exception(e)
         else:
+            self._invalidate_experiments()
             return str(faculty_experiment.id)
 
     def get_experiment(self, experiment_id):
@@ -121,27 +312,55 @@ class FacultyRestStore(AbstractStore):
         :return: A single :py:class:`mlflow.entities.Experiment` object if it
             exists, otherwise raises an exception.
         """
+        cache_key = (self._project_id, "id", int(experiment_id))
         try:
-            faculty_experiment = self._client.get(
-                self._project_id, int(experiment_id)
-            )
-        except faculty.clients.base.HttpError as e:
-            raise faculty_http_error_to_mlflow_exception(e)
-        else:
-            return faculty_experiment_to_mlflow_experiment(faculty_experiment)
+            faculty_experiment = self._get_cached(cache_key)
+        except KeyError:
+            try:
+                faculty_experiment = self._client.get(
+                    self._project_id, int(experiment_id)
+                )
+            except faculty.clients.base.HttpError as e:
+                raise faculty_http_error_to_mlflow_exception(e)
+            self._set_cached(cache_key, faculty_experiment)
+        return faculty_experiment_to_mlflow_experiment(faculty_experiment)
 
     def get_experiment_by_name(self, experiment_name):
         """
         Fetches the experiment by name from the backend store.
 
+        Experiments are looked up in an index by name, built from a single
+        listing of all experiments in the project. With the
+        ``experiment_cache_ttl`` store option, the index is cached and
+        rebuilt once when a name is not found in it.
+
         :param experiment_name: Name of experiment
 
         :return: A single :py:class:`mlflow.entities.Experiment` object if it
             exists.
         """
-        return super(FacultyRestStore, self).get_experiment_by_name(
-            experiment_name
-        )
+        cache_key = (self._project_id, "name")
+        try:
+            index = self._get_cached(cache_key)
+        except KeyError:
+            index = None
+        else:
+            if experiment_name not in index:
+                # The experiment may have been created since the index was
+                # cached, possibly by another process
+                index = None
+
+        if index is None:
+            index = {}
+            for faculty_experiment in self._fetch_experiments(None):
+                index.setdefault(faculty_experiment.name, faculty_experiment)
+            self._set_cached(cache_key, index)
+
+        try:
+            faculty_experiment = index[experiment_name]
+        except KeyError:
+            return None
+        return faculty_experiment_to_mlflow_experiment(faculty_experiment)
 
     def delete_experiment(self, experiment_id):
         """
@@ -154,6 +373,8 @@ class FacultyRestStore(AbstractStore):
             self._client.delete(self._project_id, int(experiment_id))
         except faculty.clients.base.HttpError as e:
             raise faculty_http_error_to_mlflow_exception(e)
+        finally:
+            self._invalidate_experiments()
 
     def restore_experiment(self, experiment_id):
         """
@@ -165,6 +386,8 @@ class FacultyRestStore(AbstractStore):
             self._client.restore(self._project_id, int(experiment_id))
         except faculty.clients.base.HttpError as e:
             raise faculty_http_error_to_mlflow_exception(e)
+        finally:
+            self._invalidate_experiments()
 
     def rename_experiment(self, experiment_id, new_name):
         """
@@ -180,6 +403,23 @@ class FacultyRestStore(AbstractStore):
             raise MlflowException(str(e))
         except faculty.clients.base.HttpError as e:
             raise faculty_http_error_to_mlflow_exception(e)
+        finally:
+            self._invalidate_experiments()
+
+    def _get_cached(self, key):
+        if self._experiment_cache is None:
+            raise KeyError(key)
+        return self._experiment_cache.get(key)
+
+    def _set_cached(self, key, value):
+        if self._experiment_cache is not None:
+            self._experiment_cache.set(key, value)
+
+    def _invalidate_experiments(self):
+        # Experiments may be cached by other stores for the same project
+        invalidate_shared_caches(
+            _EXPERIMENT_CACHES, lambda key: key[0] == self._project_id
+        )
 
     def get_run(self, run_id):
         """
@@ -199,6 +439,54 @@ class FacultyRestStore(AbstractStore):
             mlflow_run = faculty_run_to_mlflow_run(faculty_run)
             return mlflow_run
 
+    def get_runs(self, run_ids):
+        """
+        Fetches many runs, in as few requests as possible.
+
+        Runs are queried by ID in batches of up to ``run_batch_size``, with
+        up to ``run_batch_workers`` batches queried concurrently, as set in
+        the store URI options.
+
+        :param run_ids: Iterable of run UUID strings
+
+        :return: A list of :py:class:`mlflow.entities.Run` objects, one for
+            each of ``run_ids`` in the same order. If any of the runs do not
+            exist, raises an exception listing all of them.
+        """
+        run_ids = list(run_ids)
+        run_uuids = {run_id: UUID(run_id) for run_id in run_ids}
+
+        def query_batch(batch):
+            return list(self._iter_faculty_runs(build_run_ids_filter(batch)))
+
+        faculty_runs = {}
+        for batch_runs in self._map_run_batches(
+            query_batch, run_uuids, run_ids
+        ):
+            for faculty_run in batch_runs:
+                faculty_runs[faculty_run.id] = faculty_run
+
+        missing = list(
+            OrderedDict.fromkeys(
+                run_uuids[run_id].hex
+                for run_id in run_ids
+                if run_uuids[run_id] not in faculty_runs
+            )
+        )
+        if missing:
+            raise MlflowException(
+                "Could not find {} run(s): {}".format(
+                    len(missing), ", ".join(missing)
+                ),
+                error_code=RESOURCE_DOES_NOT_EXIST,
+            )
+
+        mlflow_runs = {
+            run_uuid: faculty_run_to_mlflow_run(faculty_run)
+            for run_uuid, faculty_run in faculty_runs.items()
+        }
+        return [mlflow_runs[run_uuids[run_id]] for run_id in run_ids]
+
     def update_run_info(self, run_id, run_status, end_time):
         """
         Updates the metadata of the specified run.
@@ -210,11 +498,15 @@ class FacultyRestStore(AbstractStore):
         :return: :py:class:`mlflow.entities.RunInfo` describing the updated
             run.
         """
+        run_uuid = UUID(run_id)
+        self._flush_run(run_uuid)
+
+        faculty_run_status = mlflow_to_faculty_run_status(run_status)
         try:
             faculty_run = self._client.update_run_info(
                 self._project_id,
-                UUID(run_id),
-                mlflow_to_faculty_run_status(run_status),
+                run_uuid,
+                faculty_run_status,
                 mlflow_timestamp_to_datetime(end_time),
             )
         except faculty.clients.base.HttpError as e:
@@ -222,6 +514,13 @@ class FacultyRestStore(AbstractStore):
         else:
             mlflow_run = faculty_run_to_mlflow_run(faculty_run)
             return mlflow_run.info
+        finally:
+            if faculty_run_status in _TERMINAL_RUN_STATUSES:
+                # Cached histories of finished runs will not grow again
+                invalidate_shared_caches(
+                    _METRIC_HISTORY_CACHES,
+                    lambda key: key[:2] == (self._project_id, run_uuid),
+                )
 
     def create_run(self, experiment_id, user_id, start_time, tags):
         """
@@ -273,16 +572,12 @@ class FacultyRestStore(AbstractStore):
         :param run_id:
         """
 
+        outcome = self.delete_runs([run_id])[run_id]
         run_id = UUID(run_id)
 
-        try:
-            response = self._client.delete_runs(self._project_id, [run_id])
-        except faculty.clients.base.HttpError as e:
-            raise faculty_http_error_to_mlflow_exception(e)
-
-        if run_id in response.deleted_run_ids:
+        if outcome == RunOutcome.DELETED:
             return
-        elif run_id in response.conflicted_run_ids:
+        elif outcome == RunOutcome.CONFLICTED:
             raise MlflowException(
                 "Could not delete already-deleted run {}".format(run_id.hex)
             )
@@ -297,16 +592,12 @@ class FacultyRestStore(AbstractStore):
         :param run_id:
         """
 
+        outcome = self.restore_runs([run_id])[run_id]
         run_id = UUID(run_id)
 
-        try:
-            response = self._client.restore_runs(self._project_id, [run_id])
-        except faculty.clients.base.HttpError as e:
-            raise faculty_http_error_to_mlflow_exception(e)
-
-        if run_id in response.restored_run_ids:
+        if outcome == RunOutcome.RESTORED:
             return
-        elif run_id in response.conflicted_run_ids:
+        elif outcome == RunOutcome.CONFLICTED:
             raise MlflowException(
                 "Could not restore already-active run {}".format(run_id.hex)
             )
@@ -315,28 +606,244 @@ class FacultyRestStore(AbstractStore):
                 "Could not restore non-existent run {}".format(run_id.hex)
             )
 
-    def get_metric_history(self, run_id, metric_key):
+    def delete_runs(self, run_ids):
+        """
+        Deletes many runs, in as few requests as possible.
+
+        Run IDs are sent in batches of up to ``run_batch_size``, with up to
+        ``run_batch_workers`` batches sent concurrently, as set in the store
+        URI options.
+
+        :param run_ids: Iterable of run UUID strings
+
+        :return: An ``OrderedDict`` mapping each of ``run_ids`` to its
+            :py:class:`RunOutcome`: ``DELETED``, ``CONFLICTED`` if it was
+            already deleted or ``MISSING`` if it does not exist.
+        """
+        return self._update_runs(
+            self._client.delete_runs,
+            lambda response: response.deleted_run_ids,
+            RunOutcome.DELETED,
+            run_ids,
+        )
+
+    def restore_runs(self, run_ids):
+        """
+        Restores many runs, in as few requests as possible.
+
+        Run IDs are sent in batches of up to ``run_batch_size``, with up to
+        ``run_batch_workers`` batches sent concurrently, as set in the store
+        URI options.
+
+        :param run_ids: Iterable of run UUID strings
+
+        :return: An ``OrderedDict`` mapping each of ``run_ids`` to its
+            :py:class:`RunOutcome`: ``RESTORED``, ``CONFLICTED`` if it was
+            already active or ``MISSING`` if it does not exist.
+        """
+        return self._update_runs(
+            self._client.restore_runs,
+            lambda response: response.restored_run_ids,
+            RunOutcome.RESTORED,
+            run_ids,
+        )
+
+    def _update_runs(self, update, get_updated_ids, updated_outcome, run_ids):
+        run_ids = list(run_ids)
+        run_uuids = {run_id: UUID(run_id) for run_id in run_ids}
+
+        def update_batch(batch):
+            return update(self._project_id, batch)
+
+        responses = self._map_run_batches(update_batch, run_uuids, run_ids)
+
+        outcomes = {}
+        for response in responses:
+            for run_uuid in get_updated_ids(response):
+                outcomes[run_uuid] = updated_outcome
+            for run_uuid in response.conflicted_run_ids:
+                outcomes[run_uuid] = RunOutcome.CONFLICTED
+
+        return OrderedDict(
+            (run_id, outcomes.get(run_uuids[run_id], RunOutcome.MISSING))
+            for run_id in run_ids
+        )
+
+    def _map_run_batches(self, function, run_uuids, run_ids):
+        """
+        Call ``function`` with batches of the unique UUIDs of ``run_ids``,
+        concurrently if configured, and return the results in a list.
+        """
+        unique_uuids = list(
+            OrderedDict.fromkeys(run_uuids[r] for r in run_ids)
+        )
+
+        batches = [
+            unique_uuids[i : i + self._run_batch_size]
+            for i in range(0, len(unique_uuids), self._run_batch_size)
+        ]
+
+        try:
+            if self._run_batch_workers > 1 and len(batches) > 1:
+                with ThreadPoolExecutor(self._run_batch_workers) as executor:
+                    return list(executor.map(function, batches))
+            else:
+                return [function(batch) for batch in batches]
+        except faculty.clients.base.HttpError as e:
+            raise faculty_http_error_to_mlflow_exception(e)
+
+    def get_metric_history(self, run_id, metric_key, max_points=None):
         """
         Returns all logged value for a given metric.
 
         :param run_id: Unique identifier for run
         :param metric_key: Metric name within the run
+        :param max_points: If given, the history is downsampled for plotting
+            to at most this many points, at least 3, with
+            :func:`mlflow_faculty.downsample.lttb_indices`. Only the kept
+            points are converted.
+
+        If ``metric_history_cache_ttl`` is set in the store URI options,
+        full histories are cached, and each call converts only the points
+        logged since the last one. The whole history is still fetched, as
+        the server cannot return only new points. Compact histories returned
+        from the cache are shared, so their arrays are read-only.
 
         :return: A list of float values logged for the give metric if logged,
-            else empty list
+            else empty list. If ``metric_history_compact`` is set in the store
+            URI options, a :class:`mlflow_faculty.history.MetricHistory` is
+            returned instead, which holds the history in arrays and creates
+            ``Metric`` objects only as they are iterated over.
         """
+        if max_points is not None and max_points < MIN_POINTS:
+            raise MlflowException(
+                "max_points must be at least {}, got {}".format(
+                    MIN_POINTS, max_points
+                )
+            )
         try:
             metric_history = self._client.get_metric_history(
                 self._project_id, UUID(run_id), metric_key
             )
         except faculty.clients.base.HttpError as e:
             raise faculty_http_error_to_mlflow_exception(e)
+        if max_points is not None:
+            metric_history = downsample_metric_history(
+                metric_history, max_points
+            )
+        elif self._metric_history_cache is not None:
+            return self._extend_cached_history(
+                UUID(run_id), metric_key, metric_history
+            )
+        if self._metric_history_compact:
+            return faculty_metric_history_to_metric_history(
+                metric_key, metric_history
+            )
         else:
             return [
                 faculty_metric_to_mlflow_metric(faculty_metric)
                 for faculty_metric in metric_history
             ]
 
+    def _extend_cached_history(self, run_uuid, metric_key, faculty_metrics):
+        compact = self._metric_history_compact
+        key = (self._project_id, run_uuid, metric_key, compact)
+        try:
+            num_cached, last_metric, history = self._metric_history_cache.get(
+                key
+            )
+        except KeyError:
+            num_cached, last_metric, history = 0, None, None
+
+        # Only reuse the cached points if the history has grown from them
+        if num_cached > len(faculty_metrics) or (
+            num_cached > 0
+            and not _same_metric(faculty_metrics[num_cached - 1], last_metric)
+        ):
+            num_cached, history = 0, None
+
+        new_metrics = faculty_metrics[num_cached:]
+        if compact:
+            new_history = faculty_metric_history_to_metric_history(
+                metric_key, new_metrics
+            )
+        else:
+            new_history = [
+                faculty_metric_to_mlflow_metric(faculty_metric)
+                for faculty_metric in new_metrics
+            ]
+        history = new_history if history is None else history + new_history
+        if compact:
+            # The cached arrays are returned to callers, and must not change
+            for array in [history.steps, history.timestamps, history.values]:
+                array.setflags(write=False)
+
+        if faculty_metrics:
+            self._metric_history_cache.set(
+                key, (len(faculty_metrics), faculty_metrics[-1], history)
+            )
+        return history if compact else list(history)
+
+    def get_metric_histories(self, run_ids, metric_keys):
+        """
+        Returns the histories of many metrics of many runs.
+
+        The history of each metric of each run is requested separately, by
+        up to ``metric_history_workers`` threads at once, as set in the
+        store URI options, sharing a pool of connections.
+
+        :param run_ids: Iterable of run UUID strings
+        :param metric_keys: Iterable of metric names
+
+        :return: An ``OrderedDict`` mapping each ``(run_id, metric_key)``
+            pair to a NumPy structured array with fields ``step``,
+            ``timestamp`` (in milliseconds since the epoch) and ``value``,
+            in the order they were logged. The array is empty if the metric
+            was not logged for the run.
+        """
+        run_ids = list(run_ids)
+        metric_keys = list(metric_keys)
+        run_uuids = {run_id: UUID(run_id) for run_id in run_ids}
+        pairs = list(
+            OrderedDict.fromkeys(
+                (run_id, metric_key)
+                for run_id in run_ids
+                for metric_key in metric_keys
+            )
+        )
+
+        def fetch_history(pair):
+            run_id, metric_key = pair
+            return self._client.get_metric_history(
+                self._project_id, run_uuids[run_id], metric_key
+            )
+
+        workers = max(min(self._metric_history_workers, len(pairs)), 1)
+        self._ensure_connection_pool(workers)
+        try:
+            with ThreadPoolExecutor(workers) as executor:
+                histories = list(executor.map(fetch_history, pairs))
+        except faculty.clients.base.HttpError as e:
+            raise faculty_http_error_to_mlflow_exception(e)
+
+        return OrderedDict(
+            (pair, faculty_metric_history_to_array(history))
+            for pair, history in zip(pairs, histories)
+        )
+
+    def _ensure_connection_pool(self, size):
+        """
+        Make sure the client keeps at least ``size`` connections open, so
+        that concurrent requests do not open and discard extra connections.
+        """
+        with self._connection_pool_lock:
+            if size <= self._connection_pool_size:
+                return
+            adapter = HTTPAdapter(pool_connections=size, pool_maxsize=size)
+            self._client.http_session.mount("https://", adapter)
+            self._client.http_session.mount("http://", adapter)
+            self._connection_pool_size = size
+
     def _search_runs(
         self,
         experiment_ids,
@@ -354,17 +861,21 @@ class FacultyRestStore(AbstractStore):
 
         See ``search_runs`` for parameter descriptions.
 
+        Ordering by ``order_by`` is done by the server. If it rejects the
+        ordering, runs are sorted client side instead, fetching every
+        matching run but keeping only those up to the end of the requested
+        page in memory.
+
         :return: A tuple of ``runs`` and ``token`` where ``runs`` is a list of
             ``mlflow.entities.Run`` objects that satisfy the search
             expressions, and ``token`` is the pagination token for the next
             page of results.
         """
 
-        if order_by is not None and order_by != []:
-            raise ValueError("order_by not currently supported")
-
-        if page_token is not None:
-            raise ValueError("page_token not currently supported")
+        try:
+            sorts = build_search_runs_sort(order_by or [])
+        except ValueError as e:
+            raise MlflowException(str(e))
 
         try:
             filter = build_search_runs_filter(
@@ -375,35 +886,276 @@ class FacultyRestStore(AbstractStore):
         except ValueError as e:
             raise MlflowException(str(e))
 
-        def _get_runs():
-            response = self._client.query_runs(self._project_id, filter)
-            for run in response.runs:
-                yield run
-            next_page = response.pagination.next
+        if page_token is None:
+            page = None if max_results is None else Page(0, max_results)
+        else:
+            try:
+                page = mlflow_page_token_to_faculty_page(page_token)
+            except ValueError as e:
+                raise MlflowException(str(e))
+            if max_results is not None:
+                page = Page(page.start, max_results)
+
+        mlflow_runs = []
+        next_page = None
+        try:
+            for faculty_runs, next_page in self._iter_run_pages(
+                filter, page, max_results, sorts
+            ):
+                mlflow_runs.extend(
+                    faculty_run_to_mlflow_run(run) for run in faculty_runs
+                )
+        except faculty.clients.base.BadRequest as e:
+            if not sorts:
+                raise faculty_http_error_to_mlflow_exception(e)
+            # The server cannot sort by these keys
+            return self._search_sorted_runs(filter, sorts, page, max_results)
+        except faculty.clients.base.HttpError as e:
+            raise faculty_http_error_to_mlflow_exception(e)
 
-            while next_page is not None:
-                response = self._client.query_runs(
-                    self._project_id,
-                    filter,
-                    start=next_page.start,
-                    limit=next_page.limit,
+        if next_page is None:
+            return mlflow_runs, None
+        else:
+            return mlflow_runs, faculty_page_to_mlflow_page_token(next_page)
+
+    def iter_runs(
+        self,
+        experiment_ids,
+        filter_string=None,
+        view_type=ViewType.ACTIVE_ONLY,
+    ):
+        """
+        Iterate over all runs matching a search, without holding them all in
+        memory.
+
+        Runs are fetched a page at a time and converted as they are consumed,
+        so memory use does not grow with the number of matching runs.
+
+        :param experiment_ids: List of experiment ids to scope the search
+        :param filter_string: A search filter string.
+        :param view_type: ACTIVE_ONLY, DELETED_ONLY, or ALL runs
+
+        :return: A generator of :py:class:`mlflow.entities.Run` objects.
+        """
+        try:
+            filter = build_search_runs_filter(
+                experiment_ids, filter_string, view_type
+            )
+        except mlflow_faculty.filter.MatchesNothing:
+            return
+        except ValueError as e:
+            raise MlflowException(str(e))
+
+        faculty_runs = self._iter_faculty_runs(filter)
+        while True:
+            try:
+                faculty_run = next(faculty_runs)
+            except StopIteration:
+                return
+            except faculty.clients.base.HttpError as e:
+                raise faculty_http_error_to_mlflow_exception(e)
+            yield faculty_run_to_mlflow_run(faculty_run)
+
+    def search_runs_frame(
+        self,
+        experiment_ids,
+        filter_string=None,
+        run_view_type=ViewType.ACTIVE_ONLY,
+        max_results=SEARCH_RUNS_FRAME_MAX_RESULTS,
+        order_by=None,
+    ):
+        """
+        Search for runs and return them as a ``pandas.DataFrame``.
+
+        The frame has the same columns as that returned by
+        ``mlflow.search_runs``, but is built directly from the runs returned
+        by Faculty, without creating an ``mlflow.entities.Run`` for each.
+
+        :param experiment_ids: List of experiment ids to scope the search
+        :param filter_string: A search filter string.
+        :param run_view_type: ACTIVE_ONLY, DELETED_ONLY, or ALL runs
+        :param max_results: Maximum number of runs to include.
+        :param order_by: List of order_by clauses.
+
+        :return: A ``pandas.DataFrame`` with one row per run, and columns
+            ``metrics.<key>``, ``params.<key>`` and ``tags.<key>`` for each
+            metric, param and tag.
+        """
+        try:
+            sorts = build_search_runs_sort(order_by or [])
+        except ValueError as e:
+            raise MlflowException(str(e))
+
+        try:
+            filter = build_search_runs_filter(
+                experiment_ids, filter_string, run_view_type
+            )
+        except mlflow_faculty.filter.MatchesNothing:
+            return faculty_runs_to_frame([])
+        except ValueError as e:
+            raise MlflowException(str(e))
+
+        page = None if max_results is None else Page(0, max_results)
+        try:
+            try:
+                faculty_runs = [
+                    faculty_run
+                    for faculty_runs, _ in self._iter_run_pages(
+                        filter, page, max_results, sorts
+                    )
+                    for faculty_run in faculty_runs
+                ]
+            except faculty.clients.base.BadRequest:
+                if not sorts:
+                    raise
+                # The server cannot sort by these keys
+                faculty_runs = sort_faculty_runs(
+                    self._iter_faculty_runs(filter), sorts, limit=max_results
                 )
-                for run in response.runs:
-                    yield run
-                next_page = response.pagination.next
+        except faculty.clients.base.HttpError as e:
+            raise faculty_http_error_to_mlflow_exception(e)
+
+        return faculty_runs_to_frame(faculty_runs)
+
+    def _search_sorted_runs(self, filter, sorts, page, max_results):
+        # As with server side sorting, page tokens are offsets into the
+        # sorted runs
+        start = 0 if page is None else page.start
+        end = None if max_results is None else start + max_results
 
         try:
-            run_generator = _get_runs()
-            faculty_runs = list(islice(run_generator, max_results))
+            # Select one run beyond the page to tell if there are more
+            sorted_runs = sort_faculty_runs(
+                self._iter_faculty_runs(filter),
+                sorts,
+                limit=None if end is None else end + 1,
+            )
         except faculty.clients.base.HttpError as e:
             raise faculty_http_error_to_mlflow_exception(e)
 
-        mlflow_runs = [faculty_run_to_mlflow_run(run) for run in faculty_runs]
-        return mlflow_runs, None
+        mlflow_runs = [
+            faculty_run_to_mlflow_run(run) for run in sorted_runs[start:end]
+        ]
+        if end is None or len(sorted_runs) <= end:
+            return mlflow_runs, None
+        else:
+            next_page = Page(end, max_results)
+            return mlflow_runs, faculty_page_to_mlflow_page_token(next_page)
+
+    def _iter_faculty_runs(self, filter):
+        for faculty_runs, _ in self._iter_run_pages(filter, None, None):
+            for faculty_run in faculty_runs:
+                yield faculty_run
+
+    def _iter_run_pages(self, filter, page, max_results, sort=None):
+        """
+        Query pages of runs from ``page`` onwards, up to ``max_results`` in
+        total, ordered by the server by ``sort`` if given.
+
+        Pages are only requested beyond the first when the server returns
+        fewer runs than asked for. With the ``search_prefetch`` store option,
+        that many further pages are fetched concurrently while earlier ones
+        are being consumed, never reaching past ``max_results``.
+
+        :return: A generator of tuples of the Faculty runs in a page and the
+            ``Page`` to continue from, which is ``None`` if there are no more
+            matching runs.
+        """
+        end = None if max_results is None else page.start + max_results
+
+        response = self._fetch_run_page(filter, page, sort)
+        runs, next_page = _page_runs(response, page, end)
+        yield runs, next_page
+
+        if next_page is None or (end is not None and next_page.start >= end):
+            return
+
+        if self._search_prefetch > 0:
+            pages = self._prefetch_run_pages(filter, next_page, end, sort)
+        else:
+            pages = self._fetch_run_pages(filter, next_page, end, sort)
+        for runs, next_page in pages:
+            yield runs, next_page
+
+    def _fetch_run_page(self, filter, page, sort=None):
+        kwargs = {}
+        if sort:
+            kwargs["sort"] = sort
+        if page is not None:
+            kwargs["start"] = page.start
+            kwargs["limit"] = page.limit
+        return self._client.query_runs(self._project_id, filter, **kwargs)
+
+    def _fetch_run_pages(self, filter, next_page, end, sort=None):
+        while next_page is not None and (end is None or next_page.start < end):
+            if end is not None:
+                next_page = Page(next_page.start, end - next_page.start)
+            response = self._fetch_run_page(filter, next_page, sort)
+            runs, next_page = _page_runs(response, next_page, end)
+            yield runs, next_page
+
+    def _prefetch_run_pages(self, filter, next_page, end, sort=None):
+        page_size = next_page.limit
+        planned_start = next_page.start
+        planned = deque()
+
+        executor = ThreadPoolExecutor(max_workers=self._search_prefetch)
+        try:
+            while True:
+                while len(planned) < self._search_prefetch and (
+                    end is None or planned_start < end
+                ):
+                    limit = page_size
+                    if end is not None:
+                        limit = min(page_size, end - planned_start)
+                    page = Page(planned_start, limit)
+                    future = executor.submit(
+                        self._fetch_run_page, filter, page, sort
+                    )
+                    planned.append((page, future))
+                    planned_start += limit
+
+                page, future = planned.popleft()
+                runs, next_page = _page_runs(future.result(), page, end)
+                yield runs, next_page
+
+                if next_page is None or (
+                    end is not None and next_page.start >= end
+                ):
+                    return
+
+                expected_start = planned[0][0].start if planned else None
+                if next_page.start != expected_start:
+                    # The server paged differently to planned, so start again
+                    # from where it says to continue
+                    for _, future in planned:
+                        future.cancel()
+                    planned.clear()
+                    page_size = next_page.limit
+                    planned_start = next_page.start
+        finally:
+            for _, future in planned:
+                future.cancel()
+            executor.shutdown(wait=False)
 
     def log_batch(self, run_id, metrics=None, params=None, tags=None):
         """
-        Fetches the experiment by ID from the backend store.
+        Log multiple metrics, params, and tags for the specified run.
+
+        With the ``async`` store option, the data is queued and sent in the
+        background. Any error sending it is raised from a later call to
+        ``log_batch``, whose own data is still queued, or ``flush``. MLflow
+        creates a store for every client, so the queue is shared by all
+        stores in the process for the same project and options, and
+        ``update_run_info`` on any of them sends the data queued before the
+        run ends.
+
+        With the ``buffer`` store option, the data is held in memory and sent
+        with other data for the same run once the ``buffer_max_size``,
+        ``buffer_max_bytes`` or ``buffer_max_age`` limit is reached, or on
+        ``flush``. Like the async queue, the buffer is shared by all stores
+        in the process for the same project and options, and
+        ``update_run_info`` sends the data buffered for the run.
 
         :param run_id: string containing run UUID
             (32 hex characters = a uuid4 stripped off of dashes)
@@ -415,10 +1167,35 @@ class FacultyRestStore(AbstractStore):
         params = [] if params is None else params
         tags = [] if tags is None else tags
 
+        if self._async_logger is not None:
+            self._async_logger.log(UUID(run_id), metrics, params, tags)
+        elif self._buffer is not None:
+            self._buffer.add(UUID(run_id), metrics, params, tags)
+        else:
+            self._log_run_data(UUID(run_id), metrics, params, tags)
+
+    def flush(self):
+        """
+        Send any run data that is buffered or being logged asynchronously.
+
+        Raises the first error encountered sending it, if any.
+        """
+        if self._async_logger is not None:
+            self._async_logger.flush()
+        elif self._buffer is not None:
+            self._buffer.flush()
+
+    def _flush_run(self, run_id):
+        if self._async_logger is not None:
+            self._async_logger.flush()
+        elif self._buffer is not None:
+            self._buffer.flush(run_id)
+
+    def _log_run_data(self, run_id, metrics, params, tags):
         try:
             self._client.log_run_data(
                 self._project_id,
-                UUID(run_id),
+                run_id,
                 params=[
                     mlflow_param_to_faculty_param(param) for param in params
                 ],
@@ -463,3 +1240,29 @@ class FacultyRestStore(AbstractStore):
         :param mlflow_model: Model object to be recorded.
         """
         pass
+
+
+def _page_runs(response, page, end):
+    """Truncate a page of runs at ``end`` and find where to continue from."""
+    runs = response.runs
+    next_page = response.pagination.next
+    start = 0 if page is None else page.start
+    if end is not None and start + len(runs) > end:
+        runs = runs[: end - start]
+        next_page = Page(end, page.limit)
+    return runs, next_page
+
+
+def _same_metric(metric, other):
+    """Check if two Faculty metric points are equal, treating NaNs as equal.
+    """
+    # NaN is unequal to itself, so the points are not compared as tuples
+    return (
+        metric.key == other.key
+        and metric.step == other.step
+        and metric.timestamp == other.timestamp
+        and (
+            metric.value == other.value
+            or (metric.value != metric.value and other.value != other.value)
+        )
+    )
@@ -0,0 +1,665 @@
+# Copyright 2019-2020 Faculty Science Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import hashlib
+import json
+import logging
+import math
+import mmap
+import os
+import posixpath
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from functools import partial
+
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from faculty.clients.base import HttpError
+from faculty.clients.object import CloudStorageProvider, CompletedUploadPart
+from faculty.datasets import transfer as datasets_transfer
+from faculty.datasets.util import DatasetsError
+from requests.adapters import HTTPAdapter
+from mlflow.exceptions import MlflowException
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+
+MEGABYTE = 1024 * 1024
+DEFAULT_MULTIPART_THRESHOLD = 64 * MEGABYTE
+DEFAULT_PART_SIZE = 16 * MEGABYTE
+# Limits on the parts of an S3 multipart upload
+MIN_PART_SIZE = 5 * MEGABYTE
+MAX_PARTS = 10000
+
+DOWNLOAD_CHUNK_SIZE = MEGABYTE
+
+DEFAULT_MAX_ATTEMPTS = 5
+RETRY_BACKOFF = 0.5
+
+# The size of blocks read to checksum files
+CHECKSUM_BLOCK_SIZE = MEGABYTE
+
+# The number of failures to describe in the message of a TransferError
+MAX_REPORTED_FAILURES = 5
+
+
+class TransferError(MlflowException):
+    """Raised when some files could not be transferred.
+
+    Parameters
+    ----------
+    failures : OrderedDict
+        Mapping of the source path of each file that failed to the exception
+        raised transferring it.
+    """
+
+    def __init__(self, failures):
+        self.failures = failures
+        described = [
+            "{}: {}".format(path, error)
+            for path, error in list(failures.items())[:MAX_REPORTED_FAILURES]
+        ]
+        if len(failures) > MAX_REPORTED_FAILURES:
+            described.append(
+                "and {} more".format(len(failures) - MAX_REPORTED_FAILURES)
+            )
+        super(TransferError, self).__init__(
+            "Failed to transfer {} file(s): {}".format(
+                len(failures), "; ".join(described)
+            )
+        )
+
+
+def walk_local_files(local_dir):
+    """List the files and leaf directories under a local directory.
+
+    Parameters
+    ----------
+    local_dir : str
+        The directory to walk.
+
+    Returns
+    -------
+    files : List[Tuple[str, str]]
+        The local path of each file, and its path relative to ``local_dir``
+        with forward slashes.
+    leaf_directories : List[str]
+        The relative paths of directories with no subdirectories, including
+        ``"."`` if ``local_dir`` has none. Creating these creates every
+        directory in the tree.
+    """
+    files = []
+    leaf_directories = []
+    for dirpath, dirnames, filenames in os.walk(local_dir):
+        relative_dir = os.path.relpath(dirpath, local_dir)
+        relative_dir = posixpath.join(*relative_dir.split(os.sep))
+        if not dirnames:
+            leaf_directories.append(relative_dir)
+        for filename in sorted(filenames):
+            files.append(
+                (
+                    os.path.join(dirpath, filename),
+                    posixpath.normpath(posixpath.join(relative_dir, filename)),
+                )
+            )
+    return files, leaf_directories
+
+
+def transfer_files(transfer, paths, max_workers, progress=None):
+    """Transfer many files concurrently.
+
+    Parameters
+    ----------
+    transfer : callable
+        Called as ``transfer(source, destination)`` for each file, from a
+        pool of threads.
+    paths : List[Tuple[str, str]]
+        The source and destination of each file to transfer.
+    max_workers : int
+        The maximum number of files to transfer at once.
+    progress : callable, optional
+        Called as ``progress(source, destination, error)`` in the calling
+        thread as each transfer completes, with ``error`` the exception
+        raised by ``transfer`` or ``None`` on success.
+
+    Raises
+    ------
+    TransferError
+        If any file failed to transfer. All other files are still
+        transferred.
+    """
+    failures = OrderedDict()
+
+    with ThreadPoolExecutor(max(max_workers, 1)) as executor:
+        futures = OrderedDict(
+            (executor.submit(transfer, source, destination), source)
+            for source, destination in paths
+        )
+        destinations = dict(paths)
+        for future in as_completed(futures):
+            source = futures[future]
+            error = future.exception()
+            if error is not None:
+                failures[source] = error
+            if progress is not None:
+                progress(source, destinations[source], error)
+
+    if failures:
+        # Report failures in the order the files were given
+        ordered = OrderedDict(
+            (source, failures[source])
+            for source, _ in paths
+            if source in failures
+        )
+        raise TransferError(ordered)
+
+
+def pooled_session(max_connections):
+    """Create a HTTP session to reuse connections across transfers.
+
+    Parameters
+    ----------
+    max_connections : int
+        The number of connections to keep open to each host. This should be
+        at least the number of threads using the session at once.
+
+    Returns
+    -------
+    requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=max_connections, pool_maxsize=max_connections
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def download_file(
+    object_client, project_id, datasets_path, local_path, session=None
+):
+    """Download a file from the object store.
+
+    Parameters
+    ----------
+    object_client : faculty.clients.object.ObjectClient
+    project_id : uuid.UUID
+    datasets_path : str
+        The path to download from in the object store.
+    local_path : str
+        The path to write the file to.
+    session : requests.Session, optional
+        The session to download with, to reuse its open connections.
+
+    Raises
+    ------
+    faculty.datasets.util.DatasetsError
+        If there is no object at ``datasets_path``.
+    """
+    if session is None:
+        session = requests.Session()
+    url = object_client.presign_download(project_id, datasets_path)
+
+    with closing(session.get(url, stream=True)) as response:
+        if response.status_code == 404:
+            raise DatasetsError(
+                "No such object {} in project {}".format(
+                    datasets_path, project_id
+                )
+            )
+        response.raise_for_status()
+
+        with open(local_path, "wb") as fp:
+            for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                fp.write(chunk)
+
+
+def multipart_upload_file(
+    object_client,
+    project_id,
+    datasets_path,
+    local_path,
+    part_size=DEFAULT_PART_SIZE,
+    max_workers=DEFAULT_MAX_WORKERS,
+    max_attempts=DEFAULT_MAX_ATTEMPTS,
+    session=None,
+    state=None,
+    save_state=None,
+):
+    """Upload a large file in parts, concurrently.
+
+    The file is memory mapped and split into parts of ``part_size`` bytes,
+    enlarged if needed to fit within the limit on the number of parts. Parts
+    are uploaded by a pool of threads, and each part that fails is retried
+    alone, with exponential backoff, up to ``max_attempts`` times. Once all
+    parts are uploaded the object is completed. An interrupted upload can
+    be resumed by saving its state with ``save_state`` and passing it back
+    as ``state``.
+
+    Only S3 supports uploading parts concurrently. For other storage
+    providers, and for empty files, the file is uploaded as a single stream
+    instead.
+
+    Parameters
+    ----------
+    object_client : faculty.clients.object.ObjectClient
+    project_id : uuid.UUID
+    datasets_path : str
+        The path to upload to in the object store.
+    local_path : str
+        The path of the file to upload.
+    part_size : int, optional
+        The size in bytes of each part.
+    max_workers : int, optional
+        The maximum number of parts to upload at once.
+    max_attempts : int, optional
+        The maximum number of times to try uploading each part.
+    session : requests.Session, optional
+        The session to upload parts with, to reuse its open connections.
+    state : dict, optional
+        The state of an interrupted upload of the same file, as last passed
+        to ``save_state``. If the file is unchanged, the upload is resumed,
+        uploading only the parts not yet completed. If it fails, as the
+        upload may have been aborted or expired, a new upload is started.
+    save_state : callable, optional
+        Called with the state of the upload, a JSON serialisable dict, when
+        it starts and after each part is uploaded.
+    """
+    file_size = os.path.getsize(local_path)
+    if file_size == 0:
+        # An S3 multipart upload needs at least one part
+        datasets_transfer.upload_file(
+            object_client, project_id, datasets_path, local_path
+        )
+        return
+
+    part_size = _effective_part_size(file_size, part_size)
+    # Identifies the file and how it is split, to check a saved state
+    # matches it
+    layout = {
+        "file_size": file_size,
+        "mtime": os.path.getmtime(local_path),
+        "part_size": part_size,
+    }
+
+    if session is None:
+        session = pooled_session(max_workers)
+
+    upload_parts = partial(
+        _upload_parts,
+        object_client,
+        project_id,
+        datasets_path,
+        local_path,
+        layout,
+        max_workers,
+        max_attempts,
+        session,
+        save_state,
+    )
+
+    if state is not None and all(
+        state.get(name) == value for name, value in layout.items()
+    ):
+        completed = dict(
+            (int(number), etag) for number, etag in state["parts"].items()
+        )
+        try:
+            upload_parts(state["upload_id"], completed)
+            return
+        except (requests.RequestException, HttpError):
+            # The upload may have been aborted or expired meanwhile, so
+            # start again rather than fail on every retry
+            _logger.warning(
+                "Could not resume upload of %s, starting again", local_path
+            )
+
+    presign_response = object_client.presign_upload(project_id, datasets_path)
+    if presign_response.provider == CloudStorageProvider.GCS:
+        _upload_stream_to_url(
+            session, presign_response.url, local_path, file_size
+        )
+        return
+    elif presign_response.provider != CloudStorageProvider.S3:
+        raise ValueError(
+            "Unsupported cloud storage provider: {}".format(
+                presign_response.provider
+            )
+        )
+    upload_parts(presign_response.upload_id, {})
+
+
+def _upload_parts(
+    object_client,
+    project_id,
+    datasets_path,
+    local_path,
+    layout,
+    max_workers,
+    max_attempts,
+    session,
+    save_state,
+    upload_id,
+    completed,
+):
+    """Upload the parts of a file not yet completed, and complete it."""
+    file_size = layout["file_size"]
+    part_size = layout["part_size"]
+
+    state_lock = threading.Lock()
+    state = dict(layout, upload_id=upload_id)
+
+    def record_parts():
+        state["parts"] = dict(
+            (str(number), etag) for number, etag in completed.items()
+        )
+        if save_state is not None:
+            save_state(dict(state))
+
+    record_parts()
+
+    parts = [
+        (number, offset, min(part_size, file_size - offset))
+        for number, offset in enumerate(range(0, file_size, part_size), 1)
+        if number not in completed
+    ]
+
+    def upload_part(mapped, part):
+        part_number, offset, length = part
+        completed_part = _upload_part_with_retries(
+            session,
+            object_client,
+            project_id,
+            datasets_path,
+            upload_id,
+            part_number,
+            lambda: mapped[offset : offset + length],
+            max_attempts,
+        )
+        with state_lock:
+            completed[part_number] = completed_part.etag
+            record_parts()
+
+    with open(local_path, "rb") as fp:
+        mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            with ThreadPoolExecutor(max(max_workers, 1)) as executor:
+                # Consume the results to raise any errors
+                list(executor.map(partial(upload_part, mapped), parts))
+        finally:
+            mapped.close()
+
+    object_client.complete_multipart_upload(
+        project_id,
+        datasets_path,
+        upload_id,
+        [
+            CompletedUploadPart(part_number=number, etag=completed[number])
+            for number in sorted(completed)
+        ],
+    )
+
+
+def _upload_stream_to_url(session, url, local_path, file_size):
+    # A resumable upload URL accepts the whole file in a single request
+    with open(local_path, "rb") as fp:
+        response = session.put(
+            url,
+            data=fp,
+            headers={
+                "Content-Length": str(file_size),
+                "Content-Range": "bytes 0-{}/{}".format(
+                    file_size - 1, file_size
+                ),
+            },
+        )
+    response.raise_for_status()
+
+
+def _effective_part_size(file_size, part_size):
+    # Enlarge parts to within the limits of S3
+    return max(
+        part_size, MIN_PART_SIZE, int(math.ceil(file_size / float(MAX_PARTS)))
+    )
+
+
+def _upload_part_with_retries(
+    session,
+    object_client,
+    project_id,
+    datasets_path,
+    upload_id,
+    part_number,
+    read_part,
+    max_attempts,
+):
+    for attempt in range(max_attempts):
+        try:
+            # Presign for each attempt, in case the last URL has expired
+            url = object_client.presign_upload_part(
+                project_id, datasets_path, upload_id, part_number
+            )
+            response = session.put(url, data=read_part())
+            response.raise_for_status()
+        except requests.RequestException:
+            if attempt + 1 == max_attempts:
+                raise
+            time.sleep(RETRY_BACKOFF * 2 ** attempt)
+        else:
+            return CompletedUploadPart(
+                part_number=part_number, etag=response.headers["ETag"]
+            )
+
+
+def file_md5(local_path):
+    """Compute the hex MD5 checksum of a local file."""
+    md5 = hashlib.md5()
+    with open(local_path, "rb") as fp:
+        for block in iter(partial(fp.read, CHECKSUM_BLOCK_SIZE), b""):
+            md5.update(block)
+    return md5.hexdigest()
+
+
+def multipart_etag(local_path, part_size):
+    """Compute the ETag S3 gives a file uploaded in parts.
+
+    This is the MD5 checksum of the concatenated MD5 digests of the parts,
+    followed by the number of parts.
+
+    Parameters
+    ----------
+    local_path : str
+    part_size : int
+        The size in bytes of each part, except the last.
+    """
+    digests = []
+    with open(local_path, "rb") as fp:
+        while True:
+            md5 = hashlib.md5()
+            remaining = part_size
+            while remaining > 0:
+                block = fp.read(min(remaining, CHECKSUM_BLOCK_SIZE))
+                if not block:
+                    break
+                md5.update(block)
+                remaining -= len(block)
+            if remaining == part_size:
+                break
+            digests.append(md5.digest())
+    combined = hashlib.md5(b"".join(digests)).hexdigest()
+    return "{}-{}".format(combined, len(digests))
+
+
+def etag_matches(local_path, etag, part_sizes=(DEFAULT_PART_SIZE,)):
+    """Check if a local file has the content of an object with an ETag.
+
+    A plain ETag is compared to the MD5 checksum of the file. The ETag of
+    an object uploaded to S3 in parts depends on the size of the parts, so
+    it is compared to the ETag the file would have if uploaded in parts of
+    each of ``part_sizes``, enlarged to within the limits of S3 as for an
+    upload. Other ETags, such as those of GCS, never match.
+
+    Parameters
+    ----------
+    local_path : str
+    etag : str
+        The ETag of the object, optionally quoted.
+    part_sizes : Iterable[int], optional
+        The sizes in bytes of parts the object may have been uploaded in.
+
+    Returns
+    -------
+    bool
+    """
+    etag = etag.strip('"')
+    if "-" not in etag:
+        return file_md5(local_path) == etag
+
+    _, _, part_count = etag.rpartition("-")
+    file_size = os.path.getsize(local_path)
+    for part_size in sorted(
+        set(_effective_part_size(file_size, size) for size in part_sizes)
+    ):
+        if str(int(math.ceil(file_size / float(part_size)))) != part_count:
+            continue
+        if multipart_etag(local_path, part_size) == etag:
+            return True
+    return False
+
+
+class TransferManifest(object):
+    """A record of completed transfers, to resume them if interrupted.
+
+    Completed files and the state of multipart uploads are appended to a
+    file as JSON lines, so recording each is cheap and a record cut short
+    by an interruption is simply ignored when loading.
+
+    Parameters
+    ----------
+    path : str
+        The path of the manifest file. It is loaded if it exists.
+    target : str
+        Identifies the other end of the transfers. A manifest saved for a
+        different target is discarded.
+    """
+
+    def __init__(self, path, target):
+        self.path = path
+        self.target = target
+        self._files = {}
+        self._uploads = {}
+        self._lock = threading.Lock()
+        self._fp = None
+        self._loaded = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as fp:
+                lines = fp.read().splitlines()
+        except (IOError, OSError):
+            return False
+
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # Partly written when interrupted
+                continue
+
+        if not records or records[0].get("target") != self.target:
+            return False
+
+        for record in records[1:]:
+            if "file" in record:
+                self._files[record["file"]] = record
+            elif "upload" in record:
+                self._uploads[record["upload"]] = record["state"]
+        return True
+
+    def _append(self, record):
+        with self._lock:
+            if self._fp is None:
+                if self._loaded:
+                    self._fp = open(self.path, "a")
+                else:
+                    self._fp = open(self.path, "w")
+                    self._fp.write(json.dumps({"target": self.target}) + "\n")
+            self._fp.write(json.dumps(record) + "\n")
+            self._fp.flush()
+
+    def is_complete(self, key, local_path, **fingerprint):
+        """Check if a file was transferred and its local copy is unchanged.
+
+        Parameters
+        ----------
+        key : str
+            The key the file was recorded with.
+        local_path : str
+            The local copy of the file, which must have the size and MD5
+            checksum recorded.
+        **fingerprint
+            Further metadata which must match that recorded, such as the
+            ETag of a downloaded object.
+        """
+        record = self._files.get(key)
+        if record is None or record["fingerprint"] != fingerprint:
+            return False
+        try:
+            if os.path.getsize(local_path) != record["size"]:
+                return False
+            return file_md5(local_path) == record["md5"]
+        except (IOError, OSError):
+            return False
+
+    def mark_complete(self, key, local_path, **fingerprint):
+        """Record that a file was transferred.
+
+        The size and MD5 checksum of ``local_path`` are recorded, along with
+        any ``fingerprint`` metadata, to check with :meth:`is_complete`.
+        """
+        record = {
+            "file": key,
+            "size": os.path.getsize(local_path),
+            "md5": file_md5(local_path),
+            "fingerprint": fingerprint,
+        }
+        self._append(record)
+        self._files[key] = record
+
+    def upload_state(self, key):
+        """Get the last state saved for a multipart upload, if any."""
+        return self._uploads.get(key)
+
+    def save_upload_state(self, key, state):
+        """Save the state of a multipart upload."""
+        self._append({"upload": key, "state": state})
+        self._uploads[key] = state
+
+    def close(self):
+        with self._lock:
+            if self._fp is not None:
+                self._fp.close()
+                self._fp = None
+
+    def remove(self):
+        """Delete the manifest, once all transfers are complete."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
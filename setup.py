@@ -37,6 +37,9 @@ setup(
         "mlflow~=1.7.0",
         "faculty>=0.25.1",
         "enum34; python_version<'3.4'",
+        "futures; python_version<'3.2'",
+        "numpy",
+        "pandas",
         "six",
         "pytz",
         "sqlparse",
@@ -14,13 +14,24 @@
 
 
 from uuid import uuid4
+import gzip
+import hashlib
+import os
 import posixpath
 
 import pytest
 
 import faculty
 import faculty.datasets
+from faculty.clients.object import Object as FacultyObject
+from mlflow.exceptions import MlflowException
+import mlflow_faculty.artifacts
 from mlflow_faculty.artifacts import FacultyDatasetsArtifactRepository
+from mlflow_faculty.transfer import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_PART_SIZE,
+    TransferError,
+)
 
 
 PROJECT_ID = uuid4()
@@ -28,6 +39,37 @@ ARTIFACT_URI = "faculty-datasets:{}/path/in/datasets".format(PROJECT_ID)
 ARTIFACT_ROOT = "/path/in/datasets/"
 
 
+@pytest.fixture(autouse=True)
+def object_client(mocker):
+    client = mocker.Mock()
+    mocker.patch("faculty.client", return_value=client)
+    return client
+
+
+@pytest.fixture(autouse=True)
+def transfer_session(mocker):
+    session = mocker.Mock()
+    mocker.patch(
+        "mlflow_faculty.artifacts.pooled_session", return_value=session
+    )
+    return session
+
+
+@pytest.fixture(autouse=True)
+def listing_caches(mocker):
+    return mocker.patch.dict(
+        "mlflow_faculty.artifacts._LISTING_CACHES", clear=True
+    )
+
+
+@pytest.fixture(autouse=True)
+def shared_clients(mocker):
+    mocker.patch.dict("mlflow_faculty.artifacts._OBJECT_CLIENTS", clear=True)
+    mocker.patch.dict(
+        "mlflow_faculty.artifacts._TRANSFER_SESSIONS", clear=True
+    )
+
+
 @pytest.mark.parametrize("suffix", ["", "/"])
 def test_faculty_repo_init(suffix):
     repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI + suffix)
@@ -53,11 +95,51 @@ def test_faculty_repo_invalid_uri(uri, message):
         FacultyDatasetsArtifactRepository(uri)
 
 
+def test_faculty_repo_options_from_environment(mocker):
+    mocker.patch.dict(
+        "os.environ",
+        {
+            "MLFLOW_FACULTY_ARTIFACT_UPLOAD_WORKERS": "3",
+            "MLFLOW_FACULTY_ARTIFACT_SYNC": "true",
+        },
+    )
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI)
+    assert repo.upload_workers == 3
+    assert repo.sync is True
+
+
+def test_faculty_repo_options_override_environment(mocker):
+    mocker.patch.dict(
+        "os.environ", {"MLFLOW_FACULTY_ARTIFACT_UPLOAD_WORKERS": "3"}
+    )
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI, upload_workers=5)
+    assert repo.upload_workers == 5
+
+
+def test_faculty_repo_artifact_uri_with_appended_path(mocker):
+    mocker.patch.dict("os.environ", {"MLFLOW_FACULTY_ARTIFACT_SYNC": "true"})
+    repo = FacultyDatasetsArtifactRepository(
+        posixpath.join(ARTIFACT_URI, "model")
+    )
+    assert repo.sync is True
+    assert repo.datasets_artifact_root == ARTIFACT_ROOT + "model/"
+
+
+def test_faculty_repo_unknown_option():
+    with pytest.raises(TypeError, match="Unknown options: unknown"):
+        FacultyDatasetsArtifactRepository(ARTIFACT_URI, unknown=1)
+
+
+def test_faculty_repo_unsupported_compression():
+    with pytest.raises(ValueError, match="Unsupported compression"):
+        FacultyDatasetsArtifactRepository(ARTIFACT_URI, compression="zstd")
+
+
 @pytest.mark.parametrize("slash_prefix", ["", "/"])
 @pytest.mark.parametrize("remote_prefix", ["", "remote"])
 @pytest.mark.parametrize("slash_suffix", ["", "/"])
 def test_faculty_repo_log_artifact(
-    mocker, slash_prefix, remote_prefix, slash_suffix
+    mocker, object_client, slash_prefix, remote_prefix, slash_suffix
 ):
     mocker.patch("faculty.datasets.put")
 
@@ -69,44 +151,208 @@ def test_faculty_repo_log_artifact(
     remote_path = posixpath.join(remote_prefix, "file.txt")
 
     faculty.datasets.put.assert_called_once_with(
-        "/local/file.txt", ARTIFACT_ROOT + remote_path, PROJECT_ID
+        "/local/file.txt",
+        ARTIFACT_ROOT + remote_path,
+        PROJECT_ID,
+        object_client=object_client,
     )
 
 
-def test_faculty_repo_log_artifact_default_destination(mocker):
+def test_faculty_repo_log_artifact_default_destination(mocker, object_client):
     mocker.patch("faculty.datasets.put")
 
     repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI)
     repo.log_artifact("/local/file.txt")
 
     faculty.datasets.put.assert_called_once_with(
-        "/local/file.txt", ARTIFACT_ROOT + "file.txt", PROJECT_ID
+        "/local/file.txt",
+        ARTIFACT_ROOT + "file.txt",
+        PROJECT_ID,
+        object_client=object_client,
     )
 
 
-@pytest.mark.parametrize("prefix", ["", "/"])
-def test_faculty_repo_log_artifacts(mocker, prefix):
+@pytest.mark.parametrize(
+    "content, multipart", [(b"small", False), (b"large file", True)]
+)
+def test_faculty_repo_log_artifact_multipart(
+    mocker, transfer_session, tmpdir, content, multipart
+):
+    local_file = tmpdir.join("file.bin")
+    local_file.write_binary(content)
+    client = mocker.Mock()
+    mocker.patch("faculty.client", return_value=client)
     mocker.patch("faculty.datasets.put")
+    multipart_upload_file = mocker.patch(
+        "mlflow_faculty.artifacts.multipart_upload_file"
+    )
+
+    repo = FacultyDatasetsArtifactRepository(
+        ARTIFACT_URI,
+        multipart_threshold=10,
+        multipart_part_size=4,
+        multipart_workers=2,
+    )
+    repo.log_artifact(str(local_file), "remote")
+
+    if multipart:
+        client.create_directory.assert_called_once_with(
+            PROJECT_ID, ARTIFACT_ROOT + "remote", parents=True
+        )
+        multipart_upload_file.assert_called_once_with(
+            client,
+            PROJECT_ID,
+            ARTIFACT_ROOT + "remote/file.bin",
+            str(local_file),
+            part_size=4,
+            max_workers=2,
+            session=transfer_session,
+            state=None,
+            save_state=None,
+        )
+        faculty.datasets.put.assert_not_called()
+    else:
+        faculty.datasets.put.assert_called_once_with(
+            str(local_file),
+            ARTIFACT_ROOT + "remote/file.bin",
+            PROJECT_ID,
+            object_client=client,
+        )
+        multipart_upload_file.assert_not_called()
+
+
+def test_faculty_repo_log_artifacts_multipart(
+    mocker, transfer_session, tmpdir
+):
+    tmpdir.join("small.bin").write_binary(b"small")
+    tmpdir.join("large.bin").write_binary(b"large file")
+    client = mocker.Mock()
+    mocker.patch("faculty.client", return_value=client)
+    upload_file = mocker.patch("faculty.datasets.transfer.upload_file")
+    multipart_upload_file = mocker.patch(
+        "mlflow_faculty.artifacts.multipart_upload_file"
+    )
+
+    repo = FacultyDatasetsArtifactRepository(
+        ARTIFACT_URI, multipart_threshold=10
+    )
+    repo.log_artifacts(str(tmpdir))
+
+    upload_file.assert_called_once_with(
+        client,
+        PROJECT_ID,
+        ARTIFACT_ROOT + "small.bin",
+        str(tmpdir.join("small.bin")),
+    )
+    multipart_upload_file.assert_called_once_with(
+        client,
+        PROJECT_ID,
+        ARTIFACT_ROOT + "large.bin",
+        str(tmpdir.join("large.bin")),
+        part_size=DEFAULT_PART_SIZE,
+        max_workers=DEFAULT_MAX_WORKERS,
+        session=transfer_session,
+        state=None,
+        save_state=None,
+    )
+
+
+@pytest.fixture
+def local_dir(tmpdir):
+    tmpdir.join("file.txt").write("content")
+    tmpdir.mkdir("sub").join("nested.txt").write("nested content")
+    tmpdir.mkdir("empty")
+    return str(tmpdir)
+
+
+@pytest.mark.parametrize("prefix", ["", "/"])
+def test_faculty_repo_log_artifacts(mocker, local_dir, prefix):
+    client = mocker.Mock()
+    mocker.patch("faculty.client", return_value=client)
+    upload_file = mocker.patch("faculty.datasets.transfer.upload_file")
 
     repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI)
-    repo.log_artifacts("/local/dir", prefix + "remote/folder")
+    repo.log_artifacts(local_dir, prefix + "remote/folder")
 
-    faculty.datasets.put.assert_called_once_with(
-        "/local/dir", ARTIFACT_ROOT + "remote/folder", PROJECT_ID
+    faculty.client.assert_called_once_with("object")
+    remote_root = ARTIFACT_ROOT + "remote/folder"
+    assert sorted(client.create_directory.call_args_list) == sorted(
+        [
+            mocker.call(PROJECT_ID, remote_root + "/sub", parents=True),
+            mocker.call(PROJECT_ID, remote_root + "/empty", parents=True),
+        ]
+    )
+    assert sorted(upload_file.call_args_list) == sorted(
+        [
+            mocker.call(
+                client,
+                PROJECT_ID,
+                remote_root + "/file.txt",
+                os.path.join(local_dir, "file.txt"),
+            ),
+            mocker.call(
+                client,
+                PROJECT_ID,
+                remote_root + "/sub/nested.txt",
+                os.path.join(local_dir, "sub", "nested.txt"),
+            ),
+        ]
     )
 
 
-def test_faculty_repo_log_artifacts_default_destination(mocker):
-    mocker.patch("faculty.datasets.put")
+def test_faculty_repo_log_artifacts_default_destination(mocker, tmpdir):
+    tmpdir.join("file.txt").write("content")
+    client = mocker.Mock()
+    mocker.patch("faculty.client", return_value=client)
+    upload_file = mocker.patch("faculty.datasets.transfer.upload_file")
 
     repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI)
-    repo.log_artifacts("/local/dir")
+    repo.log_artifacts(str(tmpdir))
 
-    faculty.datasets.put.assert_called_once_with(
-        "/local/dir", ARTIFACT_ROOT.rstrip("/"), PROJECT_ID
+    client.create_directory.assert_called_once_with(
+        PROJECT_ID, ARTIFACT_ROOT.rstrip("/"), parents=True
+    )
+    upload_file.assert_called_once_with(
+        client,
+        PROJECT_ID,
+        ARTIFACT_ROOT + "file.txt",
+        str(tmpdir.join("file.txt")),
     )
 
 
+def test_faculty_repo_log_artifacts_upload_workers(mocker, local_dir):
+    mocker.patch("faculty.client")
+    mocker.patch("faculty.datasets.transfer.upload_file")
+    transfer_files = mocker.patch("mlflow_faculty.artifacts.transfer_files")
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI, upload_workers=3)
+    repo.log_artifacts(local_dir)
+
+    assert transfer_files.call_args[0][2] == 3
+
+
+def test_faculty_repo_log_artifacts_failures(mocker, local_dir):
+    mocker.patch("faculty.client")
+
+    def upload_file(client, project_id, datasets_path, local_path):
+        if local_path.endswith("nested.txt"):
+            raise IOError("Upload failed")
+
+    upload_file = mocker.patch(
+        "faculty.datasets.transfer.upload_file", side_effect=upload_file
+    )
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI)
+    with pytest.raises(TransferError, match="Upload failed") as excinfo:
+        repo.log_artifacts(local_dir)
+
+    assert list(excinfo.value.failures) == [
+        os.path.join(local_dir, "sub", "nested.txt")
+    ]
+    # Other files are still uploaded
+    assert upload_file.call_count == 2
+
+
 @pytest.mark.parametrize("prefix", ["", "/"])
 @pytest.mark.parametrize("suffix", ["", "/"])
 def test_faculty_repo_list_artifacts(mocker, prefix, suffix):
@@ -159,12 +405,803 @@ def test_faculty_repo_list_artifacts_default_path(mocker):
 
 
 @pytest.mark.parametrize("prefix", ["", "/"])
-def test_faculty_repo_download_file(mocker, prefix):
+def test_faculty_repo_download_file(mocker, object_client, prefix):
     mocker.patch("faculty.datasets.get")
 
     repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI)
     repo._download_file(prefix + "path/to/file", "/local/path")
 
     faculty.datasets.get.assert_called_once_with(
-        ARTIFACT_ROOT + "path/to/file", "/local/path", PROJECT_ID
+        ARTIFACT_ROOT + "path/to/file",
+        "/local/path",
+        PROJECT_ID,
+        object_client=object_client,
+    )
+
+
+def test_faculty_repo_iter_artifacts(mocker):
+    pages = [
+        mocker.Mock(
+            objects=[
+                FacultyObject(ARTIFACT_ROOT + "a/", 0, "etag", None),
+                FacultyObject(ARTIFACT_ROOT + "a/1", 10, "etag", None),
+            ],
+            next_page_token="token",
+        ),
+        mocker.Mock(
+            objects=[FacultyObject(ARTIFACT_ROOT + "a/2", 20, "etag", None)],
+            next_page_token=None,
+        ),
+    ]
+    client = mocker.Mock()
+    client.list.side_effect = pages
+    mocker.patch("faculty.client", return_value=client)
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI)
+    infos = repo.iter_artifacts("a")
+
+    # Pages are only requested as they are needed
+    assert next(infos).path == "a"
+    assert next(infos).path == "a/1"
+    client.list.assert_called_once_with(PROJECT_ID, ARTIFACT_ROOT + "a/")
+    remaining = list(infos)
+
+    assert [(i.path, i.file_size) for i in remaining] == [("a/2", 20)]
+    client.list.assert_called_with(PROJECT_ID, ARTIFACT_ROOT + "a/", "token")
+
+
+def test_faculty_repo_list_artifacts_recursive(mocker):
+    client = mock_object_store(
+        mocker, ["model/", "model/MLmodel", "model/data/", "model/data/x"]
+    )
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI)
+    infos = repo.list_artifacts_recursive()
+
+    assert [info.path for info in infos] == [
+        "model",
+        "model/MLmodel",
+        "model/data",
+        "model/data/x",
+    ]
+    # Listings within the tree are served from the snapshot
+    assert [info.path for info in repo.list_artifacts("model/data")] == [
+        "model/data",
+        "model/data/x",
+    ]
+    assert repo.list_artifacts("other") == []
+    client.list.assert_called_once_with(PROJECT_ID, ARTIFACT_ROOT)
+
+
+def test_faculty_repo_list_artifacts_recursive_expires(mocker):
+    mock_time = mocker.patch("mlflow_faculty.cache.time.time")
+    mock_time.return_value = 1000.0
+    client = mock_object_store(mocker, ["model/", "model/MLmodel"])
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI, listing_ttl=5)
+    repo.list_artifacts_recursive("model")
+    repo.list_artifacts("model")
+    mock_time.return_value = 1005.0
+    repo.list_artifacts("model")
+
+    assert client.list.call_count == 2
+
+
+def test_faculty_repo_list_artifacts_recursive_invalidated(mocker):
+    client = mock_object_store(mocker, ["model/", "model/MLmodel"])
+    mocker.patch("faculty.datasets.put")
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI)
+    repo.list_artifacts_recursive()
+    repo.log_artifact("/local/file.txt", "model")
+    repo.list_artifacts("model")
+
+    assert client.list.call_count == 2
+
+
+def test_faculty_repo_list_artifacts_recursive_shared(mocker):
+    client = mock_object_store(
+        mocker, ["model/", "model/MLmodel", "model/data/", "model/data/x"]
+    )
+
+    FacultyDatasetsArtifactRepository(ARTIFACT_URI).list_artifacts_recursive()
+    # MLflow creates a new repository for each call, e.g. for a run's model
+    repo = FacultyDatasetsArtifactRepository(
+        posixpath.join(ARTIFACT_URI, "model")
+    )
+
+    assert [info.path for info in repo.list_artifacts("data")] == [
+        "data",
+        "data/x",
+    ]
+    client.list.assert_called_once_with(PROJECT_ID, ARTIFACT_ROOT)
+
+
+def test_faculty_repo_list_artifacts_recursive_invalidated_by_other_repo(
+    mocker,
+):
+    client = mock_object_store(mocker, ["model/", "model/MLmodel"])
+    mocker.patch("faculty.datasets.put")
+
+    FacultyDatasetsArtifactRepository(ARTIFACT_URI).list_artifacts_recursive()
+    FacultyDatasetsArtifactRepository(ARTIFACT_URI).log_artifact(
+        "/local/file.txt", "model"
+    )
+    FacultyDatasetsArtifactRepository(ARTIFACT_URI).list_artifacts("model")
+
+    assert client.list.call_count == 2
+
+
+def test_faculty_repo_list_artifacts_recursive_other_project(mocker):
+    client = mock_object_store(mocker, ["model/", "model/MLmodel"])
+    other_uri = "faculty-datasets:{}/path/in/datasets".format(uuid4())
+
+    FacultyDatasetsArtifactRepository(ARTIFACT_URI).list_artifacts_recursive()
+    FacultyDatasetsArtifactRepository(other_uri).list_artifacts("model")
+
+    assert client.list.call_count == 2
+
+
+def mock_object_store(mocker, paths):
+    """Mock an object client listing the given paths under the root."""
+
+    def list_objects(project_id, prefix, page_token=None):
+        objects = [
+            FacultyObject(ARTIFACT_ROOT + path, 10, "etag", None)
+            for path in paths
+            if (ARTIFACT_ROOT + path).startswith(prefix)
+        ]
+        return mocker.Mock(objects=objects, next_page_token=None)
+
+    client = mocker.Mock()
+    client.list.side_effect = list_objects
+    mocker.patch("faculty.client", return_value=client)
+    return client
+
+
+def fake_download_file(
+    client, project_id, datasets_path, local_path, session=None
+):
+    with open(local_path, "w") as fp:
+        fp.write(datasets_path)
+
+
+@pytest.mark.parametrize("download_workers", [1, 4])
+def test_faculty_repo_download_artifacts_directory(
+    mocker, tmpdir, download_workers
+):
+    client = mock_object_store(
+        mocker,
+        [
+            "model/",
+            "model/MLmodel",
+            "model/data/",
+            "model/data/weights.bin",
+            "model/empty/",
+            "other/file.txt",
+        ],
+    )
+    download_file = mocker.patch(
+        "mlflow_faculty.artifacts.download_file",
+        side_effect=fake_download_file,
+    )
+
+    repo = FacultyDatasetsArtifactRepository(
+        ARTIFACT_URI, download_workers=download_workers
+    )
+    local_path = repo.download_artifacts("model", str(tmpdir))
+
+    assert local_path == str(tmpdir.join("model"))
+    assert tmpdir.join("model", "MLmodel").read() == (
+        ARTIFACT_ROOT + "model/MLmodel"
+    )
+    assert tmpdir.join("model", "data", "weights.bin").read() == (
+        ARTIFACT_ROOT + "model/data/weights.bin"
+    )
+    assert tmpdir.join("model", "empty").isdir()
+    assert not tmpdir.join("other").exists()
+
+    # The tree is listed once
+    client.list.assert_called_once_with(PROJECT_ID, ARTIFACT_ROOT + "model/")
+    assert download_file.call_count == 2
+
+
+def test_faculty_repo_download_artifacts_file(mocker, tmpdir):
+    mock_object_store(mocker, ["model/", "model/MLmodel"])
+    mocker.patch(
+        "mlflow_faculty.artifacts.download_file",
+        side_effect=fake_download_file,
+    )
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI)
+    local_path = repo.download_artifacts("model/MLmodel", str(tmpdir))
+
+    assert local_path == str(tmpdir.join("model", "MLmodel"))
+    assert tmpdir.join("model", "MLmodel").read() == (
+        ARTIFACT_ROOT + "model/MLmodel"
+    )
+
+
+def test_faculty_repo_download_artifacts_temporary_directory(mocker):
+    mock_object_store(mocker, ["file.txt"])
+    mocker.patch(
+        "mlflow_faculty.artifacts.download_file",
+        side_effect=fake_download_file,
+    )
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI)
+    local_path = repo.download_artifacts("file.txt")
+
+    with open(local_path) as fp:
+        assert fp.read() == ARTIFACT_ROOT + "file.txt"
+
+
+def test_faculty_repo_download_artifacts_failures(mocker, tmpdir):
+    mock_object_store(
+        mocker, ["model/", "model/a", "model/b", "model/c", "model/d"]
+    )
+
+    def download_file(client, project_id, datasets_path, local_path, session):
+        if datasets_path.endswith(("/a", "/c")):
+            raise IOError("Download of {} failed".format(datasets_path))
+        fake_download_file(client, project_id, datasets_path, local_path)
+
+    mocker.patch(
+        "mlflow_faculty.artifacts.download_file", side_effect=download_file
+    )
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI, download_workers=4)
+    with pytest.raises(TransferError) as excinfo:
+        repo.download_artifacts("model", str(tmpdir))
+
+    assert list(excinfo.value.failures) == ["model/a", "model/c"]
+    assert tmpdir.join("model", "b").check()
+    assert tmpdir.join("model", "d").check()
+
+
+def test_faculty_repo_download_artifacts_missing_dst_path(mocker, tmpdir):
+    mocker.patch("faculty.client")
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI)
+    with pytest.raises(MlflowException, match="does not exist"):
+        repo.download_artifacts("model", str(tmpdir.join("missing")))
+
+
+def test_faculty_repo_download_artifacts_dst_path_not_dir(mocker, tmpdir):
+    mocker.patch("faculty.client")
+    tmpdir.join("file").write("")
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI)
+    with pytest.raises(MlflowException, match="must be a directory"):
+        repo.download_artifacts("model", str(tmpdir.join("file")))
+
+
+def test_faculty_repo_download_artifacts_cache(mocker, tmpdir):
+    client = mock_object_store(mocker, ["model/", "model/a", "model/b"])
+    download_file = mocker.patch(
+        "mlflow_faculty.artifacts.download_file",
+        side_effect=fake_download_file,
+    )
+
+    repo = FacultyDatasetsArtifactRepository(
+        ARTIFACT_URI, cache_dir=str(tmpdir.join("cache"))
+    )
+    first = repo.download_artifacts("model", str(tmpdir.mkdir("first")))
+    second = repo.download_artifacts("model", str(tmpdir.mkdir("second")))
+
+    # Only the first download goes to the object store
+    assert download_file.call_count == 2
+    for local_path in [first, second]:
+        with open(os.path.join(local_path, "b")) as fp:
+            assert fp.read() == ARTIFACT_ROOT + "model/b"
+    # Metadata comes from the listing
+    client.get.assert_not_called()
+
+
+def test_faculty_repo_download_artifacts_cache_changed_file(mocker, tmpdir):
+    client = mock_object_store(mocker, ["model/", "model/a"])
+    download_file = mocker.patch(
+        "mlflow_faculty.artifacts.download_file",
+        side_effect=fake_download_file,
+    )
+
+    repo = FacultyDatasetsArtifactRepository(
+        ARTIFACT_URI, cache_dir=str(tmpdir.join("cache"))
+    )
+    repo.download_artifacts("model", str(tmpdir.mkdir("first")))
+    client.list.side_effect = lambda project_id, prefix, page_token=None: (
+        mocker.Mock(
+            objects=[
+                FacultyObject(ARTIFACT_ROOT + "model/a", 10, "new", None)
+            ],
+            next_page_token=None,
+        )
+    )
+    repo.download_artifacts("model", str(tmpdir.mkdir("second")))
+
+    assert download_file.call_count == 2
+
+
+def test_faculty_repo_download_file_cache(mocker, tmpdir):
+    client = mocker.Mock()
+    client.get.return_value = FacultyObject(
+        ARTIFACT_ROOT + "path/to/file", 10, "etag", None
+    )
+    mocker.patch("faculty.client", return_value=client)
+    mocker.patch("faculty.datasets.get")
+    download_file = mocker.patch(
+        "mlflow_faculty.artifacts.download_file",
+        side_effect=fake_download_file,
+    )
+
+    repo = FacultyDatasetsArtifactRepository(
+        ARTIFACT_URI, cache_dir=str(tmpdir.join("cache"))
+    )
+    for name in ["first", "second"]:
+        repo._download_file("path/to/file", str(tmpdir.join(name)))
+
+    client.get.assert_called_with(PROJECT_ID, ARTIFACT_ROOT + "path/to/file")
+    download_file.assert_called_once()
+    assert tmpdir.join("second").read() == ARTIFACT_ROOT + "path/to/file"
+    faculty.datasets.get.assert_not_called()
+
+
+def test_faculty_repo_reuses_clients(mocker, tmpdir, transfer_session):
+    client = mock_object_store(mocker, ["model/", "model/a"])
+    download_file = mocker.patch(
+        "mlflow_faculty.artifacts.download_file",
+        side_effect=fake_download_file,
+    )
+    mocker.patch("faculty.datasets.put")
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI)
+    repo.list_artifacts("model")
+    repo.download_artifacts("model", str(tmpdir.mkdir("first")))
+    repo.download_artifacts("model", str(tmpdir.mkdir("second")))
+    repo.log_artifact("/local/file.txt")
+
+    faculty.client.assert_called_once_with("object")
+    for call in download_file.call_args_list:
+        assert call == mocker.call(
+            client,
+            PROJECT_ID,
+            ARTIFACT_ROOT + "model/a",
+            mocker.ANY,
+            session=transfer_session,
+        )
+
+
+def test_faculty_repo_clients_shared_across_repos(
+    mocker, tmpdir, transfer_session
+):
+    client = mock_object_store(mocker, ["model/", "model/a"])
+    download_file = mocker.patch(
+        "mlflow_faculty.artifacts.download_file",
+        side_effect=fake_download_file,
     )
+
+    # MLflow creates a new repository for each call
+    FacultyDatasetsArtifactRepository(ARTIFACT_URI).download_artifacts(
+        "model", str(tmpdir.mkdir("first"))
+    )
+    FacultyDatasetsArtifactRepository(ARTIFACT_URI).download_artifacts(
+        "model", str(tmpdir.mkdir("second"))
+    )
+
+    faculty.client.assert_called_once_with("object")
+    mlflow_faculty.artifacts.pooled_session.assert_called_once_with(
+        DEFAULT_MAX_WORKERS
+    )
+    assert download_file.call_count == 2
+    for call in download_file.call_args_list:
+        assert call == mocker.call(
+            client,
+            PROJECT_ID,
+            ARTIFACT_ROOT + "model/a",
+            mocker.ANY,
+            session=transfer_session,
+        )
+
+
+def list_manifests(manifest_dir):
+    if not os.path.exists(manifest_dir):
+        return []
+    return os.listdir(manifest_dir)
+
+
+def test_faculty_repo_log_artifacts_resumable(
+    mocker, local_dir, tmpdir_factory
+):
+    manifest_dir = str(tmpdir_factory.mktemp("manifests"))
+    uploaded = []
+    failed = []
+
+    def upload_file(client, project_id, datasets_path, local_path):
+        if local_path.endswith("nested.txt") and not failed:
+            failed.append(local_path)
+            raise IOError("Interrupted")
+        uploaded.append(local_path)
+
+    mocker.patch(
+        "faculty.datasets.transfer.upload_file", side_effect=upload_file
+    )
+
+    repo = FacultyDatasetsArtifactRepository(
+        ARTIFACT_URI,
+        resumable=True,
+        upload_workers=1,
+        manifest_dir=manifest_dir,
+    )
+    with pytest.raises(TransferError):
+        repo.log_artifacts(local_dir)
+    assert len(list_manifests(manifest_dir)) == 1
+    # Nothing is written beside the uploaded directory
+    assert not [
+        name
+        for name in os.listdir(os.path.dirname(local_dir))
+        if name.endswith("manifest")
+    ]
+
+    del uploaded[:]
+    repo.log_artifacts(local_dir)
+
+    # Only the file that failed is uploaded again
+    assert uploaded == [os.path.join(local_dir, "sub", "nested.txt")]
+    assert list_manifests(manifest_dir) == []
+
+
+def test_faculty_repo_log_artifacts_resumable_changed_file(
+    mocker, local_dir, tmpdir_factory
+):
+    upload_file = mocker.patch(
+        "faculty.datasets.transfer.upload_file",
+        side_effect=[None, IOError("Interrupted")],
+    )
+
+    repo = FacultyDatasetsArtifactRepository(
+        ARTIFACT_URI,
+        resumable=True,
+        upload_workers=1,
+        manifest_dir=str(tmpdir_factory.mktemp("manifests")),
+    )
+    with pytest.raises(TransferError):
+        repo.log_artifacts(local_dir)
+
+    with open(os.path.join(local_dir, "file.txt"), "w") as fp:
+        fp.write("changed")
+    upload_file.side_effect = None
+    upload_file.reset_mock()
+    repo.log_artifacts(local_dir)
+
+    assert upload_file.call_count == 2
+
+
+def test_faculty_repo_download_artifacts_resumable(
+    mocker, tmpdir, tmpdir_factory
+):
+    manifest_dir = str(tmpdir_factory.mktemp("manifests"))
+    mock_object_store(mocker, ["model/", "model/a", "model/b"])
+    failed = []
+
+    def download_file(client, project_id, datasets_path, local_path, session):
+        if datasets_path.endswith("/b") and not failed:
+            failed.append(datasets_path)
+            raise IOError("Interrupted")
+        fake_download_file(client, project_id, datasets_path, local_path)
+
+    download_file = mocker.patch(
+        "mlflow_faculty.artifacts.download_file", side_effect=download_file
+    )
+
+    repo = FacultyDatasetsArtifactRepository(
+        ARTIFACT_URI, resumable=True, manifest_dir=manifest_dir
+    )
+    with pytest.raises(TransferError):
+        repo.download_artifacts("model", str(tmpdir))
+    assert len(list_manifests(manifest_dir)) == 1
+    assert tmpdir.listdir() == [tmpdir.join("model")]
+
+    download_file.reset_mock()
+    repo.download_artifacts("model", str(tmpdir))
+
+    download_file.assert_called_once_with(
+        mocker.ANY,
+        PROJECT_ID,
+        ARTIFACT_ROOT + "model/b",
+        str(tmpdir.join("model", "b")),
+        session=mocker.ANY,
+    )
+    assert tmpdir.join("model", "a").read() == ARTIFACT_ROOT + "model/a"
+    assert list_manifests(manifest_dir) == []
+
+
+def test_faculty_repo_download_artifacts_resumable_no_destination(
+    mocker, tmpdir, tmpdir_factory
+):
+    manifest_dir = str(tmpdir_factory.mktemp("manifests"))
+    mocker.patch("tempfile.mkdtemp", return_value=str(tmpdir))
+    mock_object_store(mocker, ["model/", "model/a", "model/b"])
+
+    def download_file(client, project_id, datasets_path, local_path, session):
+        if datasets_path.endswith("/b"):
+            raise IOError("Interrupted")
+        fake_download_file(client, project_id, datasets_path, local_path)
+
+    mocker.patch(
+        "mlflow_faculty.artifacts.download_file", side_effect=download_file
+    )
+
+    repo = FacultyDatasetsArtifactRepository(
+        ARTIFACT_URI, resumable=True, manifest_dir=manifest_dir
+    )
+    with pytest.raises(TransferError):
+        repo.download_artifacts("model")
+
+    assert list_manifests(manifest_dir) == []
+
+
+def test_faculty_repo_resumable_manifests_not_shared(mocker, tmpdir):
+    manifest_dir = str(tmpdir.join("manifests"))
+    mock_object_store(mocker, ["model/", "model/a", "model/b"])
+
+    def download_file(client, project_id, datasets_path, local_path, session):
+        if datasets_path.endswith("/b"):
+            raise IOError("Interrupted")
+        fake_download_file(client, project_id, datasets_path, local_path)
+
+    mocker.patch(
+        "mlflow_faculty.artifacts.download_file", side_effect=download_file
+    )
+
+    repo = FacultyDatasetsArtifactRepository(
+        ARTIFACT_URI, resumable=True, manifest_dir=manifest_dir
+    )
+    for name in ["first", "second"]:
+        with pytest.raises(TransferError):
+            repo.download_artifacts("model", str(tmpdir.mkdir(name)))
+
+    assert len(list_manifests(manifest_dir)) == 2
+
+
+def test_faculty_repo_default_manifest_dir(mocker):
+    mocker.patch.dict("os.environ", {"XDG_CACHE_HOME": "/cache/home"})
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI)
+    assert repo.manifest_dir == "/cache/home/mlflow-faculty/manifests"
+
+
+def test_faculty_repo_log_artifacts_sync(mocker, local_dir):
+    client = mocker.Mock()
+    client.list.return_value = mocker.Mock(
+        objects=[
+            FacultyObject(ARTIFACT_ROOT + "remote/", 0, "etag", None),
+            # Unchanged
+            FacultyObject(
+                ARTIFACT_ROOT + "remote/file.txt",
+                len("content"),
+                hashlib.md5(b"content").hexdigest(),
+                None,
+            ),
+            # Changed
+            FacultyObject(
+                ARTIFACT_ROOT + "remote/sub/nested.txt",
+                len("nested content"),
+                hashlib.md5(b"old content").hexdigest(),
+                None,
+            ),
+            # Deleted locally
+            FacultyObject(ARTIFACT_ROOT + "remote/old.txt", 3, "etag", None),
+        ],
+        next_page_token=None,
+    )
+    mocker.patch("faculty.client", return_value=client)
+    upload_file = mocker.patch("faculty.datasets.transfer.upload_file")
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI, sync=True)
+    repo.log_artifacts(local_dir, "remote")
+
+    client.list.assert_called_once_with(PROJECT_ID, ARTIFACT_ROOT + "remote/")
+    upload_file.assert_called_once_with(
+        client,
+        PROJECT_ID,
+        ARTIFACT_ROOT + "remote/sub/nested.txt",
+        os.path.join(local_dir, "sub", "nested.txt"),
+    )
+    client.delete.assert_not_called()
+
+
+def test_faculty_repo_log_artifacts_sync_delete(mocker, local_dir):
+    client = mock_object_store(mocker, ["remote/", "remote/old.txt"])
+    mocker.patch("faculty.datasets.transfer.upload_file")
+
+    repo = FacultyDatasetsArtifactRepository(
+        ARTIFACT_URI, sync=True, sync_delete=True
+    )
+    repo.log_artifacts(local_dir, "remote")
+
+    client.delete.assert_called_once_with(
+        PROJECT_ID, ARTIFACT_ROOT + "remote/old.txt"
+    )
+
+
+def test_faculty_repo_sync_delete_requires_sync():
+    with pytest.raises(ValueError, match="sync_delete option requires sync"):
+        FacultyDatasetsArtifactRepository(ARTIFACT_URI, sync_delete=True)
+
+
+def test_faculty_repo_log_artifacts_sync_delete_without_sync(
+    mocker, local_dir
+):
+    client = mock_object_store(mocker, ["remote/", "remote/old.txt"])
+    mocker.patch("faculty.datasets.transfer.upload_file")
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI)
+    repo.sync_delete = True
+    repo.log_artifacts(local_dir, "remote")
+
+    client.delete.assert_not_called()
+
+
+def test_faculty_repo_log_artifact_compression(mocker, tmpdir):
+    local_file = tmpdir.join("predictions.csv")
+    local_file.write_binary(b"a,b\n1,2\n" * 100)
+    uploaded = {}
+
+    def put(local_path, datasets_path, project_id, object_client):
+        with gzip.open(local_path) as fp:
+            uploaded[datasets_path] = fp.read()
+
+    mocker.patch("faculty.datasets.put", side_effect=put)
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI, compression="gzip")
+    repo.log_artifact(str(local_file), "remote")
+
+    assert uploaded == {
+        ARTIFACT_ROOT
+        + "remote/predictions.csv.mlflow-gzip": local_file.read_binary()
+    }
+
+
+def test_faculty_repo_log_artifact_directory_compression(mocker, tmpdir):
+    local_dir = tmpdir.mkdir("model")
+    local_dir.join("file.txt").write("content")
+    local_dir.mkdir("sub").join("nested.txt").write("nested content")
+    uploaded = {}
+
+    def upload_file(client, project_id, datasets_path, local_path):
+        with gzip.open(local_path) as fp:
+            uploaded[datasets_path] = fp.read()
+
+    mocker.patch(
+        "faculty.datasets.transfer.upload_file", side_effect=upload_file
+    )
+    mock_put = mocker.patch("faculty.datasets.put")
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI, compression="gzip")
+    repo.log_artifact(str(local_dir), "remote")
+
+    assert uploaded == {
+        ARTIFACT_ROOT + "remote/model/file.txt.mlflow-gzip": b"content",
+        ARTIFACT_ROOT
+        + "remote/model/sub/nested.txt.mlflow-gzip": b"nested content",
+    }
+    mock_put.assert_not_called()
+
+
+def test_faculty_repo_log_artifacts_compression(mocker, local_dir):
+    uploaded = {}
+
+    def upload_file(client, project_id, datasets_path, local_path):
+        with gzip.open(local_path) as fp:
+            uploaded[datasets_path] = fp.read()
+
+    mocker.patch(
+        "faculty.datasets.transfer.upload_file", side_effect=upload_file
+    )
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI, compression="gzip")
+    repo.log_artifacts(local_dir)
+
+    assert uploaded == {
+        ARTIFACT_ROOT + "file.txt.mlflow-gzip": b"content",
+        ARTIFACT_ROOT + "sub/nested.txt.mlflow-gzip": b"nested content",
+    }
+
+
+def test_faculty_repo_list_artifacts_compression(mocker):
+    mock_object_store(
+        mocker, ["model/", "model/data.csv.mlflow-gzip", "model/raw"]
+    )
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI, compression="gzip")
+
+    assert [(i.path, i.is_dir) for i in repo.list_artifacts("model")] == [
+        ("model", True),
+        ("model/data.csv", False),
+        ("model/raw", False),
+    ]
+
+
+def test_faculty_repo_compression_leaves_gzip_artifacts(mocker, tmpdir):
+    # Logged without compression, e.g. by another process
+    mock_object_store(mocker, ["model/", "model/data.tar.gz"])
+    mocker.patch(
+        "mlflow_faculty.artifacts.download_file",
+        side_effect=fake_download_file,
+    )
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI, compression="gzip")
+
+    assert [i.path for i in repo.list_artifacts("model")] == [
+        "model",
+        "model/data.tar.gz",
+    ]
+    repo.download_artifacts("model", str(tmpdir))
+    assert tmpdir.join("model").listdir() == [
+        tmpdir.join("model", "data.tar.gz")
+    ]
+    assert tmpdir.join("model", "data.tar.gz").read() == (
+        ARTIFACT_ROOT + "model/data.tar.gz"
+    )
+
+
+def fake_download_compressed(
+    client, project_id, datasets_path, local_path, session=None
+):
+    with gzip.open(local_path, "wb") as fp:
+        fp.write(datasets_path.encode("utf-8"))
+
+
+def test_faculty_repo_download_artifacts_compression(mocker, tmpdir):
+    mock_object_store(mocker, ["model/", "model/data.csv.mlflow-gzip"])
+    mocker.patch(
+        "mlflow_faculty.artifacts.download_file",
+        side_effect=fake_download_compressed,
+    )
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI, compression="gzip")
+    repo.download_artifacts("model", str(tmpdir))
+
+    assert tmpdir.join("model").listdir() == [tmpdir.join("model", "data.csv")]
+    assert tmpdir.join("model", "data.csv").read() == (
+        ARTIFACT_ROOT + "model/data.csv.mlflow-gzip"
+    )
+
+
+def test_faculty_repo_download_file_compression(mocker, tmpdir, object_client):
+    object_client.get.return_value = FacultyObject(
+        ARTIFACT_ROOT + "data.csv.mlflow-gzip", 10, "etag", None
+    )
+    mocker.patch(
+        "mlflow_faculty.artifacts.download_file",
+        side_effect=fake_download_compressed,
+    )
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI, compression="gzip")
+    repo._download_file("data.csv", str(tmpdir.join("data.csv")))
+
+    object_client.get.assert_called_once_with(
+        PROJECT_ID, ARTIFACT_ROOT + "data.csv.mlflow-gzip"
+    )
+    assert tmpdir.join("data.csv").read() == (
+        ARTIFACT_ROOT + "data.csv.mlflow-gzip"
+    )
+
+
+def test_faculty_repo_download_file_compression_stored_uncompressed(
+    mocker, tmpdir, object_client
+):
+    def get(project_id, path):
+        if path.endswith(".mlflow-gzip"):
+            raise faculty.clients.base.NotFound(mocker.Mock(), None, None)
+        return FacultyObject(path, 10, "etag", None)
+
+    object_client.get.side_effect = get
+    mocker.patch(
+        "mlflow_faculty.artifacts.download_file",
+        side_effect=fake_download_file,
+    )
+
+    repo = FacultyDatasetsArtifactRepository(ARTIFACT_URI, compression="gzip")
+    repo._download_file("data.csv", str(tmpdir.join("data.csv")))
+
+    assert tmpdir.join("data.csv").read() == ARTIFACT_ROOT + "data.csv"
@@ -0,0 +1,278 @@
+# Copyright 2019-2020 Faculty Science Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import threading
+
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.exceptions import MlflowException
+import pytest
+
+from mlflow_faculty.batching import AsyncRunDataLogger, RunDataBuffer
+
+
+METRICS = [Metric("metric-{}".format(i), i, 1000 + i, i) for i in range(4)]
+PARAM = Param("param-key", "param-value")
+TAG = RunTag("tag-key", "tag-value")
+
+
+def test_run_data_buffer_holds_data_until_flush(mocker):
+    send = mocker.Mock()
+
+    buffer = RunDataBuffer(send)
+    buffer.add("run-a", METRICS[:2], [PARAM], [])
+    buffer.add("run-b", METRICS[2:3], [], [])
+    buffer.add("run-a", METRICS[3:], [PARAM], [TAG])
+    send.assert_not_called()
+
+    buffer.flush()
+
+    send.assert_has_calls(
+        [
+            mocker.call(
+                "run-a", [METRICS[0], METRICS[1], METRICS[3]], [PARAM], [TAG]
+            ),
+            mocker.call("run-b", [METRICS[2]], [], []),
+        ]
+    )
+    assert send.call_count == 2
+
+
+def test_run_data_buffer_flush_single_run(mocker):
+    send = mocker.Mock()
+
+    buffer = RunDataBuffer(send)
+    buffer.add("run-a", METRICS[:1], [], [])
+    buffer.add("run-b", METRICS[1:2], [], [])
+    buffer.flush("run-b")
+
+    send.assert_called_once_with("run-b", [METRICS[1]], [], [])
+
+
+def test_run_data_buffer_max_size(mocker):
+    send = mocker.Mock()
+
+    buffer = RunDataBuffer(send, max_size=3)
+    buffer.add("run-id", METRICS[:2], [], [])
+    send.assert_not_called()
+    buffer.add("run-id", METRICS[2:], [], [])
+
+    assert send.call_args_list == [
+        mocker.call("run-id", METRICS[:3], [], []),
+        mocker.call("run-id", METRICS[3:], [], []),
+    ]
+
+
+def test_run_data_buffer_max_size_splits_large_batch(mocker):
+    send = mocker.Mock()
+    metrics = [Metric("metric", i, 1000 + i, i) for i in range(7)]
+
+    buffer = RunDataBuffer(send, max_size=3)
+    buffer.add("run-id", metrics[:2], [], [])
+    buffer.add("run-id", metrics[2:], [PARAM], [TAG])
+
+    assert send.call_args_list == [
+        mocker.call("run-id", metrics[:3], [], []),
+        mocker.call("run-id", metrics[3:6], [], []),
+        mocker.call("run-id", metrics[6:], [PARAM], [TAG]),
+    ]
+
+
+def test_run_data_buffer_max_bytes(mocker):
+    send = mocker.Mock()
+
+    buffer = RunDataBuffer(send, max_bytes=len("tag-key") + len("long") * 2)
+    buffer.add("run-id", [], [], [RunTag("tag-key", "long")])
+    send.assert_not_called()
+    buffer.add("run-id", [], [], [RunTag("tag-key", "longer")])
+    send.assert_not_called()
+    buffer.add("run-id", [], [PARAM], [])
+
+    assert send.call_args_list == [
+        mocker.call("run-id", [], [PARAM], []),
+        mocker.call("run-id", [], [], [RunTag("tag-key", "longer")]),
+    ]
+
+
+def test_run_data_buffer_max_bytes_counts_overwritten_tags(mocker):
+    send = mocker.Mock()
+
+    buffer = RunDataBuffer(send, max_bytes=len("tag-key") + len("longer"))
+    buffer.add("run-id", [], [], [RunTag("tag-key", "long")])
+    send.assert_not_called()
+    buffer.add("run-id", [], [], [RunTag("tag-key", "longer")])
+
+    send.assert_called_once_with(
+        "run-id", [], [], [RunTag("tag-key", "longer")]
+    )
+
+
+def test_run_data_buffer_max_bytes_sends_large_entry_alone(mocker):
+    send = mocker.Mock()
+    large_tag = RunTag("tag-key", "x" * 100)
+
+    buffer = RunDataBuffer(send, max_bytes=50)
+    buffer.add("run-id", [], [PARAM], [large_tag])
+
+    assert send.call_args_list == [
+        mocker.call("run-id", [], [PARAM], []),
+        mocker.call("run-id", [], [], [large_tag]),
+    ]
+
+
+def test_run_data_buffer_max_age(mocker):
+    send = mocker.Mock()
+    mocker.patch("time.time", return_value=100.0)
+
+    buffer = RunDataBuffer(send, max_age=5.0)
+    buffer.add("run-a", METRICS[:1], [], [])
+    buffer.add("run-b", METRICS[1:2], [], [])
+    send.assert_not_called()
+
+    mocker.patch("time.time", return_value=105.0)
+    buffer.add("run-b", METRICS[2:3], [], [])
+
+    send.assert_has_calls(
+        [
+            mocker.call("run-a", [METRICS[0]], [], []),
+            mocker.call("run-b", [METRICS[1], METRICS[2]], [], []),
+        ]
+    )
+
+
+def test_run_data_buffer_merges_tags(mocker):
+    send = mocker.Mock()
+    first_tag = RunTag("tag-key", "first")
+    last_tag = RunTag("tag-key", "last")
+    other_tag = RunTag("other-key", "value")
+
+    buffer = RunDataBuffer(send)
+    buffer.add("run-id", [], [], [first_tag, other_tag])
+    buffer.add("run-id", [], [], [last_tag])
+    buffer.flush()
+
+    send.assert_called_once_with("run-id", [], [], [last_tag, other_tag])
+
+
+@pytest.mark.parametrize(
+    "first_params, second_params",
+    [
+        ([PARAM], [Param("param-key", "other-value")]),
+        ([], [PARAM, Param("param-key", "other-value")]),
+    ],
+)
+def test_run_data_buffer_param_conflict(mocker, first_params, second_params):
+    send = mocker.Mock()
+
+    buffer = RunDataBuffer(send)
+    buffer.add("run-id", [], first_params, [])
+
+    with pytest.raises(MlflowException, match="param-key"):
+        buffer.add("run-id", METRICS, second_params, [])
+
+    # The conflicting batch is discarded
+    buffer.flush()
+    send.assert_called_once_with("run-id", [], first_params, [])
+
+
+def test_run_data_buffer_flush_error(mocker):
+    send = mocker.Mock(side_effect=[ValueError("bad batch"), None])
+
+    buffer = RunDataBuffer(send)
+    buffer.add("run-a", METRICS[:1], [], [])
+    buffer.add("run-b", METRICS[1:2], [], [])
+
+    with pytest.raises(ValueError, match="bad batch"):
+        buffer.flush()
+
+    # Later runs are still sent
+    send.assert_called_with("run-b", [METRICS[1]], [], [])
+
+
+def test_async_run_data_logger(mocker):
+    send = mocker.Mock()
+
+    logger = AsyncRunDataLogger(send)
+    logger.log("run-id", METRICS[:1], [PARAM], [TAG])
+    logger.flush()
+
+    send.assert_called_once_with("run-id", METRICS[:1], [PARAM], [TAG])
+
+
+def test_async_run_data_logger_coalesces_runs(mocker):
+    sent = []
+    sending = threading.Event()
+    release = threading.Event()
+
+    def send(run_id, metrics, params, tags):
+        # Hold up the worker so later batches queue behind the first one
+        sending.set()
+        release.wait()
+        sent.append((run_id, metrics, params, tags))
+
+    logger = AsyncRunDataLogger(send)
+    logger.log("run-a", METRICS[:1], [], [])
+    sending.wait()
+    logger.log("run-a", METRICS[1:2], [PARAM], [])
+    logger.log("run-b", METRICS[2:3], [], [TAG])
+    logger.log("run-a", METRICS[3:], [PARAM], [])
+    release.set()
+    logger.flush()
+
+    assert sent == [
+        ("run-a", METRICS[:1], [], []),
+        ("run-a", [METRICS[1], METRICS[3]], [PARAM], []),
+        ("run-b", METRICS[2:3], [], [TAG]),
+    ]
+
+
+def test_async_run_data_logger_max_batch_size(mocker):
+    send = mocker.Mock()
+
+    logger = AsyncRunDataLogger(send, max_batch_size=1)
+    logger.log("run-id", METRICS[:2], [], [])
+    logger.flush()
+
+    assert send.call_args_list == [
+        mocker.call("run-id", METRICS[:1], [], []),
+        mocker.call("run-id", METRICS[1:2], [], []),
+    ]
+
+
+def test_async_run_data_logger_error_raised_on_flush(mocker):
+    send = mocker.Mock(side_effect=ValueError("bad batch"))
+
+    logger = AsyncRunDataLogger(send)
+    logger.log("run-id", [], [], [])
+
+    with pytest.raises(ValueError, match="bad batch"):
+        logger.flush()
+
+    # The error is only reported once
+    logger.flush()
+
+
+def test_async_run_data_logger_error_raised_on_log(mocker):
+    send = mocker.Mock(side_effect=[ValueError("bad batch"), None])
+
+    logger = AsyncRunDataLogger(send)
+    logger.log("run-id", [], [], [])
+    logger._queue.join()
+
+    with pytest.raises(ValueError, match="bad batch"):
+        logger.log("run-id", METRICS[:1], [], [])
+    logger.flush()
+
+    # The batch logged when the error was raised is still sent
+    send.assert_called_with("run-id", METRICS[:1], [], [])
@@ -0,0 +1,226 @@
+# Copyright 2019-2020 Faculty Science Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+
+import pytest
+
+from mlflow_faculty.cache import (
+    DiskCache,
+    TTLCache,
+    get_shared_cache,
+    invalidate_shared_caches,
+)
+
+
+@pytest.fixture
+def mock_time(mocker):
+    mock_time = mocker.patch("mlflow_faculty.cache.time.time")
+    mock_time.return_value = 1000.0
+    return mock_time
+
+
+def test_ttl_cache(mock_time):
+    cache = TTLCache(ttl=10, max_size=10)
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+    assert len(cache) == 1
+
+
+def test_ttl_cache_missing():
+    cache = TTLCache(ttl=10, max_size=10)
+    with pytest.raises(KeyError):
+        cache.get("key")
+
+
+def test_ttl_cache_expiry(mock_time):
+    cache = TTLCache(ttl=10, max_size=10)
+    cache.set("key", "value")
+
+    mock_time.return_value = 1009.9
+    assert cache.get("key") == "value"
+
+    mock_time.return_value = 1010.0
+    with pytest.raises(KeyError):
+        cache.get("key")
+    assert len(cache) == 0
+
+
+def test_ttl_cache_set_resets_expiry(mock_time):
+    cache = TTLCache(ttl=10, max_size=10)
+    cache.set("key", "old")
+    mock_time.return_value = 1005.0
+    cache.set("key", "new")
+    mock_time.return_value = 1012.0
+    assert cache.get("key") == "new"
+
+
+def test_ttl_cache_evicts_least_recently_used(mock_time):
+    cache = TTLCache(ttl=10, max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    with pytest.raises(KeyError):
+        cache.get("b")
+
+
+def test_ttl_cache_invalidate(mock_time):
+    cache = TTLCache(ttl=10, max_size=10)
+    cache.set(("project-1", "id", 1), "one")
+    cache.set(("project-1", "id", 2), "two")
+    cache.set(("project-2", "id", 1), "other")
+
+    cache.invalidate(lambda key: key[0] == "project-1")
+
+    assert len(cache) == 1
+    assert cache.get(("project-2", "id", 1)) == "other"
+
+
+def test_ttl_cache_clear(mock_time):
+    cache = TTLCache(ttl=10, max_size=10)
+    cache.set("key", "value")
+    cache.clear()
+    assert len(cache) == 0
+
+
+def writer(content, calls=None):
+    def download(path):
+        if calls is not None:
+            calls.append(path)
+        with open(path, "wb") as fp:
+            fp.write(content)
+
+    return download
+
+
+def test_disk_cache_key():
+    assert DiskCache.key("project", "/path", 10, "etag") == DiskCache.key(
+        "project", "/path", 10, "etag"
+    )
+    assert DiskCache.key("project", "/path", 10, "etag") != DiskCache.key(
+        "project", "/path", 10, "other-etag"
+    )
+
+
+@pytest.mark.parametrize("hardlink", [False, True])
+def test_disk_cache_fetch(tmpdir, hardlink):
+    cache = DiskCache(str(tmpdir.join("cache")), 100, hardlink=hardlink)
+    calls = []
+
+    first = tmpdir.join("first.bin")
+    assert not cache.fetch("key", str(first), writer(b"content", calls))
+    second = tmpdir.join("second.bin")
+    assert cache.fetch("key", str(second), writer(b"content", calls))
+
+    assert len(calls) == 1
+    assert first.read_binary() == b"content"
+    assert second.read_binary() == b"content"
+    assert os.path.samefile(str(first), str(second)) == hardlink
+    # No temporary files are left behind
+    assert tmpdir.join("cache").listdir() == [tmpdir.join("cache", "key")]
+
+
+def test_disk_cache_download_failure(tmpdir):
+    cache = DiskCache(str(tmpdir.join("cache")), 100)
+
+    def download(path):
+        with open(path, "wb") as fp:
+            fp.write(b"partial")
+        raise IOError("Download failed")
+
+    with pytest.raises(IOError):
+        cache.fetch("key", str(tmpdir.join("file.bin")), download)
+
+    assert tmpdir.join("cache").listdir() == []
+
+
+def test_disk_cache_evicts_least_recently_used(tmpdir):
+    cache = DiskCache(str(tmpdir.join("cache")), 30)
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.fetch(key, str(tmpdir.join(key)), writer(b"0123456789"))
+        # Make the modification times distinct
+        os.utime(str(tmpdir.join("cache", key)), (i, i))
+
+    # Using "a" makes "b" the least recently used
+    assert cache.fetch("a", str(tmpdir.join("a2")), writer(b""))
+    cache.max_bytes = 20
+    cache.evict()
+
+    assert sorted(p.basename for p in tmpdir.join("cache").listdir()) == [
+        "a",
+        "c",
+    ]
+
+
+def test_disk_cache_larger_than_max_bytes(tmpdir):
+    cache = DiskCache(str(tmpdir.join("cache")), 5)
+    local_path = tmpdir.join("file.bin")
+
+    assert not cache.fetch("key", str(local_path), writer(b"0123456789"))
+
+    assert local_path.read_binary() == b"0123456789"
+    assert tmpdir.join("cache").listdir() == []
+
+
+def test_disk_cache_deletes_abandoned_temporary_files(tmpdir):
+    cache = DiskCache(str(tmpdir.join("cache")), 100)
+    abandoned = tmpdir.join("cache", ".tmp-abandoned")
+    abandoned.write_binary(b"partial")
+    os.utime(str(abandoned), (0, 0))
+    in_progress = tmpdir.join("cache", ".tmp-in-progress")
+    in_progress.write_binary(b"partial")
+
+    cache.evict()
+
+    assert tmpdir.join("cache").listdir() == [in_progress]
+
+
+def test_disk_cache_counts_temporary_files(tmpdir):
+    cache = DiskCache(str(tmpdir.join("cache")), 20)
+    cache.fetch("key", str(tmpdir.join("file.bin")), writer(b"0123456789"))
+    in_progress = tmpdir.join("cache", ".tmp-in-progress")
+    in_progress.write_binary(b"0123456789" * 2)
+
+    cache.evict()
+
+    assert tmpdir.join("cache").listdir() == [in_progress]
+
+
+def test_get_shared_cache():
+    registry = {}
+    cache = get_shared_cache(registry, 10, 5)
+    assert isinstance(cache, TTLCache)
+    assert get_shared_cache(registry, 10, 5) is cache
+    assert get_shared_cache(registry, 20, 5) is not cache
+
+
+def test_invalidate_shared_caches():
+    registry = {}
+    first = get_shared_cache(registry, 10, 5)
+    second = get_shared_cache(registry, 20, 5)
+    first.set(("a", 1), "value")
+    second.set(("a", 2), "value")
+    second.set(("b", 1), "value")
+
+    invalidate_shared_caches(registry, lambda key: key[0] == "a")
+
+    assert len(first) == 0
+    assert len(second) == 1
+    assert second.get(("b", 1)) == "value"
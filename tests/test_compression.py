@@ -0,0 +1,58 @@
+# Copyright 2019-2020 Faculty Science Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import gzip
+
+import pytest
+
+from mlflow_faculty.compression import (
+    compress_file,
+    compression_suffix,
+    decompress_file,
+)
+
+
+def test_compression_suffix():
+    assert compression_suffix("gzip") == ".mlflow-gzip"
+
+
+def test_compression_suffix_unsupported():
+    with pytest.raises(ValueError, match="Unsupported compression 'zstd'"):
+        compression_suffix("zstd")
+
+
+def test_compress_file_round_trip(tmpdir):
+    source = tmpdir.join("file.csv")
+    source.write_binary(b"a,b\n1,2\n" * 100)
+
+    compress_file(str(source), str(tmpdir.join("file.csv.gz")))
+    decompress_file(str(tmpdir.join("file.csv.gz")), str(tmpdir.join("out")))
+
+    assert tmpdir.join("out").read_binary() == source.read_binary()
+    with gzip.open(str(tmpdir.join("file.csv.gz"))) as fp:
+        assert fp.read() == source.read_binary()
+    assert tmpdir.join("file.csv.gz").size() < source.size()
+
+
+def test_compress_file_deterministic(tmpdir):
+    tmpdir.join("a").write_binary(b"content")
+    tmpdir.join("b").write_binary(b"content")
+
+    compress_file(str(tmpdir.join("a")), str(tmpdir.join("a.gz")))
+    compress_file(str(tmpdir.join("b")), str(tmpdir.join("b.gz")))
+
+    assert (
+        tmpdir.join("a.gz").read_binary() == tmpdir.join("b.gz").read_binary()
+    )
@@ -14,7 +14,10 @@
 
 
 from datetime import datetime
+from uuid import UUID
 
+import numpy as np
+import pandas as pd
 import pytest
 from pytz import UTC
 from requests import Response
@@ -23,6 +26,9 @@ from faculty.clients.base import HTTPError
 from faculty.clients.experiment import (
     ExperimentRunStatus as FacultyExperimentRunStatus,
     LifecycleStage as FacultyLifecycleStage,
+    Metric as FacultyMetric,
+    Page as FacultyPage,
+    Param as FacultyParam,
     Tag as FacultyTag,
 )
 from faculty.clients.object import Object as FacultyObject
@@ -33,8 +39,11 @@ from mlflow.utils.mlflow_tags import MLFLOW_RUN_NAME, MLFLOW_PARENT_RUN_ID
 from mlflow_faculty.converters import (
     faculty_http_error_to_mlflow_exception,
     faculty_experiment_to_mlflow_experiment,
+    faculty_metric_history_to_array,
+    faculty_metric_history_to_metric_history,
     faculty_metric_to_mlflow_metric,
     faculty_run_to_mlflow_run,
+    faculty_runs_to_frame,
     mlflow_timestamp_to_datetime,
     faculty_tag_to_mlflow_tag,
     mlflow_metric_to_faculty_metric,
@@ -42,6 +51,8 @@ from mlflow_faculty.converters import (
     mlflow_tag_to_faculty_tag,
     mlflow_viewtype_to_faculty_lifecycle_stage,
     faculty_object_to_mlflow_file_info,
+    faculty_page_to_mlflow_page_token,
+    mlflow_page_token_to_faculty_page,
 )
 from mlflow_faculty.py23 import to_timestamp
 from tests.fixtures import (
@@ -50,11 +61,14 @@ from tests.fixtures import (
     FACULTY_PARAM,
     FACULTY_RUN,
     FACULTY_TAG,
+    METRIC_TIMESTAMP,
+    METRIC_TIMESTAMP_MILLISECONDS,
     MLFLOW_METRIC,
     MLFLOW_PARAM,
     MLFLOW_TAG,
     PARENT_RUN_UUID,
     PARENT_RUN_UUID_HEX_STR,
+    RUN_NAME,
     mlflow_experiment,
     mlflow_run,
 )
@@ -238,6 +252,74 @@ def test_faculty_metric_to_mlflow_metric():
     )
 
 
+def test_faculty_metric_history_to_array():
+    faculty_metrics = [
+        FACULTY_METRIC._replace(value=0.5, step=0),
+        FACULTY_METRIC._replace(
+            value=0.25,
+            step=1,
+            timestamp=datetime(2019, 3, 13, 17, 0, 16, 500000, tzinfo=UTC),
+        ),
+    ]
+
+    array = faculty_metric_history_to_array(faculty_metrics)
+
+    assert array.dtype.names == ("step", "timestamp", "value")
+    assert array["step"].tolist() == [0, 1]
+    assert array["timestamp"].tolist() == [
+        METRIC_TIMESTAMP_MILLISECONDS,
+        METRIC_TIMESTAMP_MILLISECONDS + 1500,
+    ]
+    assert array["value"].tolist() == [0.5, 0.25]
+
+
+def test_faculty_metric_history_to_array_empty():
+    array = faculty_metric_history_to_array([])
+    assert array.shape == (0,)
+    assert array.dtype.names == ("step", "timestamp", "value")
+
+
+def test_faculty_metric_history_to_metric_history():
+    faculty_metrics = [
+        FACULTY_METRIC._replace(value=0.5, step=0),
+        FACULTY_METRIC._replace(
+            value=0.25,
+            step=1,
+            timestamp=datetime(2019, 3, 13, 17, 0, 16, 500000, tzinfo=UTC),
+        ),
+    ]
+
+    history = faculty_metric_history_to_metric_history("loss", faculty_metrics)
+
+    assert history.key == "loss"
+    assert history.steps.tolist() == [0, 1]
+    assert history.timestamps.tolist() == [
+        METRIC_TIMESTAMP_MILLISECONDS,
+        METRIC_TIMESTAMP_MILLISECONDS + 1500,
+    ]
+    assert history.values.tolist() == [0.5, 0.25]
+
+
+def test_faculty_metric_history_to_metric_history_matches_metrics():
+    faculty_metrics = [
+        FACULTY_METRIC._replace(
+            step=step,
+            value=step / 3.0,
+            timestamp=datetime(
+                2019, 3, 13, 17, 0, step, step * 1234, tzinfo=UTC
+            ),
+        )
+        for step in range(10)
+    ]
+
+    history = faculty_metric_history_to_metric_history(
+        FACULTY_METRIC.key, faculty_metrics
+    )
+
+    expected = [faculty_metric_to_mlflow_metric(m) for m in faculty_metrics]
+    assert [dict(m) for m in history] == [dict(m) for m in expected]
+
+
 @pytest.mark.parametrize(
     "timestamp, expected_datetime",
     [
@@ -300,3 +382,88 @@ def test_faculty_object_to_mlflow_file_info_path_outside_root():
     obj = FacultyObject("/path/not/in/root", 1234, "an etag", DATETIME)
     with pytest.raises(ValueError):
         faculty_object_to_mlflow_file_info(obj, "/different/root")
+
+
+def test_page_token_round_trip():
+    page = FacultyPage(start=20, limit=10)
+    token = faculty_page_to_mlflow_page_token(page)
+    assert mlflow_page_token_to_faculty_page(token) == page
+
+
+@pytest.mark.parametrize(
+    "token", ["not-base64!", "bm90IGpzb24=", "e30=", "eyJzdGFydCI6ICJ4In0="]
+)
+def test_mlflow_page_token_to_faculty_page_invalid(token):
+    with pytest.raises(ValueError, match="Invalid page token"):
+        mlflow_page_token_to_faculty_page(token)
+
+
+def test_faculty_runs_to_frame():
+    first_run = FACULTY_RUN._replace(
+        id=UUID(int=1),
+        ended_at=DATETIME,
+        metrics=[
+            FacultyMetric("loss", 0.5, METRIC_TIMESTAMP, 0),
+            FacultyMetric("accuracy", 0.9, METRIC_TIMESTAMP, 0),
+        ],
+        params=[FacultyParam("alpha", "0.1")],
+        tags=[FacultyTag(MLFLOW_RUN_NAME, "tagged name")],
+    )
+    second_run = FACULTY_RUN._replace(
+        id=UUID(int=2),
+        status=FacultyExperimentRunStatus.FINISHED,
+        parent_run_id=None,
+        metrics=[FacultyMetric("loss", 0.25, METRIC_TIMESTAMP, 0)],
+        params=[],
+        tags=[FacultyTag("extra", "value")],
+    )
+
+    frame = faculty_runs_to_frame(iter([first_run, second_run]))
+
+    expected = pd.DataFrame(
+        {
+            "run_id": [UUID(int=1).hex, UUID(int=2).hex],
+            "experiment_id": [str(FACULTY_RUN.experiment_id)] * 2,
+            "status": ["RUNNING", "FINISHED"],
+            "artifact_uri": [FACULTY_RUN.artifact_location] * 2,
+            "start_time": pd.to_datetime(
+                [FACULTY_RUN.started_at] * 2, utc=True
+            ),
+            "end_time": pd.to_datetime([DATETIME, None], utc=True),
+            "metrics.loss": [0.5, 0.25],
+            "metrics.accuracy": [0.9, np.nan],
+            "params.alpha": ["0.1", None],
+            "tags.mlflow.runName": ["tagged name", RUN_NAME],
+            "tags.mlflow.parentRunId": [PARENT_RUN_UUID_HEX_STR, None],
+            "tags.extra": [None, "value"],
+        },
+        columns=[
+            "run_id",
+            "experiment_id",
+            "status",
+            "artifact_uri",
+            "start_time",
+            "end_time",
+            "metrics.loss",
+            "metrics.accuracy",
+            "params.alpha",
+            "tags.mlflow.runName",
+            "tags.mlflow.parentRunId",
+            "tags.extra",
+        ],
+    )
+    pd.testing.assert_frame_equal(frame, expected)
+    assert frame["metrics.loss"].dtype == np.float64
+
+
+def test_faculty_runs_to_frame_empty():
+    frame = faculty_runs_to_frame([])
+    assert len(frame) == 0
+    assert list(frame.columns) == [
+        "run_id",
+        "experiment_id",
+        "status",
+        "artifact_uri",
+        "start_time",
+        "end_time",
+    ]
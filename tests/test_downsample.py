@@ -0,0 +1,163 @@
+# Copyright 2019-2020 Faculty Science Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import numpy as np
+import pytest
+
+from mlflow_faculty.downsample import downsample_metric_history, lttb_indices
+from tests.fixtures import FACULTY_METRIC
+
+
+def test_lttb_indices_keeps_peaks():
+    y = [0, 0, 0, 10, 0, 0, 0, -10, 0, 0]
+    assert lttb_indices(np.arange(10), y, 4).tolist() == [0, 3, 7, 9]
+
+
+def test_lttb_indices_pinned():
+    y = np.cumsum(np.random.RandomState(0).randn(50))
+    assert lttb_indices(np.arange(50), y, 8).tolist() == [
+        0,
+        4,
+        16,
+        20,
+        31,
+        33,
+        43,
+        49,
+    ]
+
+
+def test_lttb_indices_ties_go_to_earliest_point():
+    assert lttb_indices(np.arange(6), np.zeros(6), 3).tolist() == [0, 1, 5]
+
+
+def test_lttb_indices_nan_value_ignored():
+    x = np.arange(1000)
+    y = np.sin(x / 20.0)
+    expected = lttb_indices(x, y, 20).tolist()
+    y[50] = np.nan
+
+    indices = lttb_indices(x, y, 20)
+
+    assert indices.tolist() == expected
+    assert indices[:8].tolist() == [0, 34, 92, 154, 215, 277, 332, 353]
+
+
+def test_lttb_indices_nan_values_pinned():
+    y = [np.nan, 1, 2, 3, np.nan, np.nan, np.nan, 4, 5, 6]
+    assert lttb_indices(np.arange(10), y, 4).tolist() == [0, 1, 7, 9]
+
+
+def test_lttb_indices_nan_bucket_not_used_as_anchor():
+    y = [0, np.nan, np.nan, np.nan, 0, 0, 9, 0, 0, 0, 0, 0, 0, 0]
+    assert lttb_indices(np.arange(14), y, 8).tolist() == [
+        0,
+        1,
+        4,
+        6,
+        7,
+        9,
+        11,
+        13,
+    ]
+
+
+def test_lttb_indices_all_nan():
+    y = np.full(10, np.nan)
+    assert lttb_indices(np.arange(10), y, 4).tolist() == [0, 1, 5, 9]
+
+
+@pytest.mark.parametrize("max_points", [5, 6, 100])
+def test_lttb_indices_short_series(max_points):
+    assert lttb_indices(np.arange(5), np.ones(5), max_points).tolist() == [
+        0,
+        1,
+        2,
+        3,
+        4,
+    ]
+
+
+@pytest.mark.parametrize("max_points", [3, 10, 999])
+def test_lttb_indices_length(max_points):
+    x = np.arange(1000)
+    indices = lttb_indices(x, np.sin(x / 10.0), max_points)
+    assert len(indices) == max_points
+    assert indices[0] == 0
+    assert indices[-1] == 999
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_lttb_indices_too_few_points():
+    with pytest.raises(ValueError, match="at least 3"):
+        lttb_indices(np.arange(10), np.arange(10), 2)
+
+
+def test_lttb_indices_length_mismatch():
+    with pytest.raises(ValueError, match="differ in length"):
+        lttb_indices(np.arange(10), np.arange(9), 3)
+
+
+def test_downsample_metric_history():
+    y = [0, 0, 0, 10, 0, 0, 0, -10, 0, 0]
+    metrics = [
+        FACULTY_METRIC._replace(step=step * 2, value=value)
+        for step, value in enumerate(y)
+    ]
+    assert downsample_metric_history(metrics, 4) == [
+        metrics[0],
+        metrics[3],
+        metrics[7],
+        metrics[9],
+    ]
+
+
+def test_downsample_metric_history_uses_steps(mocker):
+    metrics = [
+        FACULTY_METRIC._replace(step=step, value=float(step))
+        for step in [0, 1, 5, 10]
+    ]
+    lttb_indices_mock = mocker.patch(
+        "mlflow_faculty.downsample.lttb_indices", return_value=[0, 1, 3]
+    )
+
+    assert downsample_metric_history(metrics, 3) == [
+        metrics[0],
+        metrics[1],
+        metrics[3],
+    ]
+    x, y, max_points = lttb_indices_mock.call_args[0]
+    assert x.tolist() == [0, 1, 5, 10]
+    assert y.tolist() == [0, 1, 5, 10]
+    assert max_points == 3
+
+
+def test_downsample_metric_history_unordered_steps(mocker):
+    metrics = [
+        FACULTY_METRIC._replace(step=step, value=1.0) for step in [0, 5, 1, 10]
+    ]
+    lttb_indices_mock = mocker.patch(
+        "mlflow_faculty.downsample.lttb_indices", return_value=[0, 1, 3]
+    )
+
+    downsample_metric_history(metrics, 3)
+
+    x, _, _ = lttb_indices_mock.call_args[0]
+    assert x.tolist() == [0, 1, 2, 3]
+
+
+def test_downsample_metric_history_short():
+    metrics = [FACULTY_METRIC._replace(step=step) for step in range(3)]
+    assert downsample_metric_history(metrics, 3) == metrics
@@ -0,0 +1,47 @@
+# Copyright 2019-2020 Faculty Science Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import subprocess
+import sys
+import textwrap
+
+
+# MLflow registers plugins while it is first imported, so this is checked in
+# a new interpreter
+CHECK_REGISTERED = textwrap.dedent(
+    """
+    import mlflow
+    from mlflow.store.artifact.artifact_repository_registry import (
+        _artifact_repository_registry,
+    )
+    from mlflow.tracking._tracking_service.utils import (
+        _tracking_store_registry,
+    )
+    from mlflow.tracking.context.registry import (
+        _run_context_provider_registry,
+    )
+
+    assert "faculty" in _tracking_store_registry._registry
+    assert "faculty-datasets" in _artifact_repository_registry._registry
+    assert any(
+        type(provider).__name__ == "FacultyRunContext"
+        for provider in _run_context_provider_registry
+    )
+    """
+)
+
+
+def test_entrypoints_registered_on_import():
+    subprocess.check_call([sys.executable, "-c", CHECK_REGISTERED])
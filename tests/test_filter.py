@@ -25,17 +25,24 @@ from faculty.clients.experiment import (
     ExperimentRunStatus,
     LogicalOperator,
     MetricFilter,
+    MetricSort,
     ParamFilter,
+    ParamSort,
     RunIdFilter,
     RunStatusFilter,
+    SortOrder,
+    StartedAtSort,
     TagFilter,
+    TagSort,
 )
 from mlflow.entities import ViewType
 
 import mlflow_faculty.filter
 from mlflow_faculty.filter import (
     MatchesNothing,
+    build_run_ids_filter,
     build_search_runs_filter,
+    build_search_runs_sort,
     _filter_by_experiment_id,
     _filter_by_mlflow_view_type,
     _parse_filter_string,
@@ -301,6 +308,29 @@ def test_filter_by_experiment_id_empty_list():
         _filter_by_experiment_id([])
 
 
+def test_build_run_ids_filter():
+    run_ids = [uuid4(), uuid4()]
+    assert build_run_ids_filter(run_ids) == CompoundFilter(
+        LogicalOperator.OR,
+        [
+            RunIdFilter(ComparisonOperator.EQUAL_TO, run_ids[0]),
+            RunIdFilter(ComparisonOperator.EQUAL_TO, run_ids[1]),
+        ],
+    )
+
+
+def test_build_run_ids_filter_single_id():
+    run_id = uuid4()
+    assert build_run_ids_filter([run_id]) == RunIdFilter(
+        ComparisonOperator.EQUAL_TO, run_id
+    )
+
+
+def test_build_run_ids_filter_empty_list():
+    with pytest.raises(MatchesNothing):
+        build_run_ids_filter([])
+
+
 @pytest.mark.parametrize(
     "view_type, expected_filter",
     [
@@ -647,3 +677,51 @@ def test_parse_filter_string_invalid_value(filter_string):
 def test_parse_filter_string_invalid_operator(filter_string):
     with pytest.raises(ValueError, match="can only be used with operators"):
         _parse_filter_string(filter_string)
+
+
+@pytest.mark.parametrize(
+    "order_by, expected_sort",
+    [
+        ("metrics.loss", MetricSort("loss", SortOrder.ASC)),
+        ("metric.loss ASC", MetricSort("loss", SortOrder.ASC)),
+        ("metrics.loss DESC", MetricSort("loss", SortOrder.DESC)),
+        ("metrics.loss desc", MetricSort("loss", SortOrder.DESC)),
+        ("metrics.`my loss` DESC", MetricSort("my loss", SortOrder.DESC)),
+        ("params.alpha", ParamSort("alpha", SortOrder.ASC)),
+        ("param.alpha DESC", ParamSort("alpha", SortOrder.DESC)),
+        ('tags."class.name" ASC', TagSort("class.name", SortOrder.ASC)),
+        ("attributes.start_time", StartedAtSort(SortOrder.ASC)),
+        ("attribute.start_time DESC", StartedAtSort(SortOrder.DESC)),
+    ],
+)
+def test_build_search_runs_sort(order_by, expected_sort):
+    assert build_search_runs_sort([order_by]) == [expected_sort]
+
+
+def test_build_search_runs_sort_multiple_clauses():
+    assert build_search_runs_sort(["metrics.loss", "params.alpha DESC"]) == [
+        MetricSort("loss", SortOrder.ASC),
+        ParamSort("alpha", SortOrder.DESC),
+    ]
+
+
+@pytest.mark.parametrize(
+    "order_by",
+    [
+        "loss",
+        "attributes.status",
+        "attributes.end_time DESC",
+        "metrics.loss UP",
+        "metrics.loss, params.alpha",
+        "metrics.loss ASC DESC",
+        "",
+    ],
+)
+def test_build_search_runs_sort_invalid(order_by):
+    with pytest.raises(ValueError, match="Invalid order_by clause"):
+        build_search_runs_sort([order_by])
+
+
+def test_parse_filter_string_start_time_not_supported():
+    with pytest.raises(ValueError, match="Invalid identifier"):
+        _parse_filter_string("attributes.start_time > 0")
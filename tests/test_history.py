@@ -0,0 +1,106 @@
+# Copyright 2019-2020 Faculty Science Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import numpy as np
+import pytest
+from mlflow.entities import Metric
+
+from mlflow_faculty.history import METRIC_HISTORY_DTYPE, MetricHistory
+
+
+def make_history():
+    return MetricHistory("loss", [0, 1, 2], [1000, 2000, 3000], [0.5, 0.25, 1])
+
+
+def test_metric_history_arrays():
+    history = make_history()
+    assert history.steps.dtype == np.int64
+    assert history.timestamps.dtype == np.int64
+    assert history.values.dtype == np.float64
+    assert len(history) == 3
+
+
+def test_metric_history_has_no_dict():
+    with pytest.raises(AttributeError):
+        make_history().extra = 1
+
+
+def test_metric_history_length_mismatch():
+    with pytest.raises(ValueError, match="differ in length"):
+        MetricHistory("loss", [0, 1], [1000], [0.5, 0.25])
+
+
+def test_metric_history_getitem():
+    metric = make_history()[1]
+    assert isinstance(metric, Metric)
+    assert metric.key == "loss"
+    assert metric.value == 0.25
+    assert metric.timestamp == 2000
+    assert metric.step == 1
+    assert make_history()[-1].step == 2
+
+
+def test_metric_history_getitem_slice():
+    history = make_history()[1:]
+    assert isinstance(history, MetricHistory)
+    assert history.key == "loss"
+    assert history.steps.tolist() == [1, 2]
+
+
+def test_metric_history_iter():
+    metrics = list(make_history())
+    assert [(m.step, m.timestamp, m.value) for m in metrics] == [
+        (0, 1000, 0.5),
+        (1, 2000, 0.25),
+        (2, 3000, 1.0),
+    ]
+    assert all(type(m.value) is float for m in metrics)
+    assert all(type(m.step) is int for m in metrics)
+
+
+def test_metric_history_iter_is_lazy(mocker):
+    history = make_history()
+    metric_class = mocker.patch("mlflow_faculty.history.Metric")
+
+    iterator = iter(history)
+    metric_class.assert_not_called()
+    next(iterator)
+    assert metric_class.call_count == 1
+
+
+def test_metric_history_add():
+    history = make_history() + MetricHistory("loss", [3], [4000], [0.125])
+    assert isinstance(history, MetricHistory)
+    assert history.key == "loss"
+    assert history.steps.tolist() == [0, 1, 2, 3]
+    assert history.timestamps.tolist() == [1000, 2000, 3000, 4000]
+    assert history.values.tolist() == [0.5, 0.25, 1.0, 0.125]
+
+
+def test_metric_history_add_list():
+    with pytest.raises(TypeError):
+        make_history() + []
+
+
+def test_metric_history_to_array():
+    array = make_history().to_array()
+    assert array.dtype == METRIC_HISTORY_DTYPE
+    assert array["step"].tolist() == [0, 1, 2]
+    assert array["timestamp"].tolist() == [1000, 2000, 3000]
+    assert array["value"].tolist() == [0.5, 0.25, 1.0]
+
+
+def test_metric_history_repr():
+    assert repr(make_history()) == "<MetricHistory key='loss' length=3>"
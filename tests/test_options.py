@@ -0,0 +1,78 @@
+# Copyright 2019-2020 Faculty Science Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+
+from mlflow_faculty.options import parse_env_options, parse_uri_options
+
+
+DEFAULTS = {"flag": False, "count": 10, "ratio": 0.5, "name": None}
+
+
+def test_parse_uri_options_defaults():
+    assert parse_uri_options("scheme:path", DEFAULTS) == DEFAULTS
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("flag=true", {"flag": True}),
+        ("flag=1", {"flag": True}),
+        ("flag=False", {"flag": False}),
+        ("count=3", {"count": 3}),
+        ("ratio=0.25", {"ratio": 0.25}),
+        ("name=value", {"name": "value"}),
+        ("flag=yes&count=3", {"flag": True, "count": 3}),
+    ],
+)
+def test_parse_uri_options(query, expected):
+    options = parse_uri_options("scheme:path?" + query, DEFAULTS)
+    assert options == dict(DEFAULTS, **expected)
+
+
+def test_parse_uri_options_unknown_option():
+    with pytest.raises(ValueError, match="Unknown option 'other'"):
+        parse_uri_options("scheme:path?other=1", DEFAULTS)
+
+
+@pytest.mark.parametrize("query", ["flag=maybe", "count=many", "ratio=x"])
+def test_parse_uri_options_invalid_value(query):
+    with pytest.raises(ValueError, match="Invalid value"):
+        parse_uri_options("scheme:path?" + query, DEFAULTS)
+
+
+def test_parse_env_options_defaults():
+    assert parse_env_options("PREFIX_", DEFAULTS, environ={}) == DEFAULTS
+
+
+def test_parse_env_options():
+    environ = {
+        "PREFIX_FLAG": "true",
+        "PREFIX_COUNT": "3",
+        "PREFIX_NAME": "value",
+        "OTHER_RATIO": "0.25",
+    }
+    options = parse_env_options("PREFIX_", DEFAULTS, environ=environ)
+    assert options == dict(DEFAULTS, flag=True, count=3, name="value")
+
+
+def test_parse_env_options_reads_os_environ(mocker):
+    mocker.patch.dict("os.environ", {"PREFIX_COUNT": "7"})
+    assert parse_env_options("PREFIX_", DEFAULTS)["count"] == 7
+
+
+def test_parse_env_options_invalid_value():
+    with pytest.raises(ValueError, match="PREFIX_COUNT"):
+        parse_env_options("PREFIX_", DEFAULTS, environ={"PREFIX_COUNT": "x"})
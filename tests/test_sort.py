@@ -0,0 +1,131 @@
+# Copyright 2019-2020 Faculty Science Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from datetime import timedelta
+from uuid import UUID
+
+import pytest
+from faculty.clients.experiment import (
+    Metric as FacultyMetric,
+    MetricSort,
+    Param as FacultyParam,
+    ParamSort,
+    SortOrder,
+    StartedAtSort,
+    Tag as FacultyTag,
+    TagSort,
+)
+from mlflow.utils.mlflow_tags import MLFLOW_RUN_NAME
+
+from mlflow_faculty.sort import sort_faculty_runs
+from tests.fixtures import FACULTY_RUN, METRIC_TIMESTAMP, RUN_STARTED_AT
+
+
+def faculty_run(
+    number, metrics=None, params=None, tags=None, name="", started_at=0
+):
+    return FACULTY_RUN._replace(
+        id=UUID(int=number),
+        name=name,
+        started_at=RUN_STARTED_AT + timedelta(seconds=started_at),
+        metrics=[
+            FacultyMetric(key, value, METRIC_TIMESTAMP, step)
+            for key, value, step in metrics or []
+        ],
+        params=[FacultyParam(k, v) for k, v in (params or {}).items()],
+        tags=[FacultyTag(k, v) for k, v in (tags or {}).items()],
+    )
+
+
+def run_numbers(faculty_runs):
+    return [run.id.int for run in faculty_runs]
+
+
+RUNS = [
+    faculty_run(1, metrics=[("loss", 0.5, 0)], params={"alpha": "b"}),
+    faculty_run(2, metrics=[("loss", 0.1, 0)], params={"alpha": "c"}),
+    faculty_run(3, params={"alpha": "a"}),
+    faculty_run(4, metrics=[("loss", 0.3, 0)]),
+]
+
+
+@pytest.mark.parametrize(
+    "sort, expected",
+    [
+        (MetricSort("loss", SortOrder.ASC), [2, 4, 1, 3]),
+        (MetricSort("loss", SortOrder.DESC), [1, 4, 2, 3]),
+        (ParamSort("alpha", SortOrder.ASC), [3, 1, 2, 4]),
+        (ParamSort("alpha", SortOrder.DESC), [2, 1, 3, 4]),
+    ],
+)
+def test_sort_faculty_runs_missing_values_last(sort, expected):
+    assert run_numbers(sort_faculty_runs(RUNS, [sort])) == expected
+
+
+def test_sort_faculty_runs_latest_metric_value():
+    runs = [
+        faculty_run(1, metrics=[("loss", 0.1, 0), ("loss", 0.9, 1)]),
+        faculty_run(2, metrics=[("loss", 0.5, 0)]),
+        faculty_run(3, metrics=[("loss", float("nan"), 0)]),
+    ]
+    sorts = [MetricSort("loss", SortOrder.ASC)]
+    assert run_numbers(sort_faculty_runs(runs, sorts)) == [2, 1, 3]
+
+
+def test_sort_faculty_runs_started_at():
+    runs = [faculty_run(n, started_at=s) for n, s in [(1, 10), (2, 0), (3, 5)]]
+    sorts = [StartedAtSort(SortOrder.ASC)]
+    assert run_numbers(sort_faculty_runs(runs, sorts)) == [2, 3, 1]
+    sorts = [StartedAtSort(SortOrder.DESC)]
+    assert run_numbers(sort_faculty_runs(runs, sorts)) == [1, 3, 2]
+
+
+def test_sort_faculty_runs_multiple_sorts():
+    runs = [
+        faculty_run(1, params={"a": "x"}, tags={"b": "2"}),
+        faculty_run(2, params={"a": "y"}, tags={"b": "1"}),
+        faculty_run(3, params={"a": "x"}, tags={"b": "3"}),
+    ]
+    sorts = [ParamSort("a", SortOrder.ASC), TagSort("b", SortOrder.DESC)]
+    assert run_numbers(sort_faculty_runs(runs, sorts)) == [3, 1, 2]
+
+
+def test_sort_faculty_runs_ties():
+    # Ties are broken by latest start time and then run ID
+    runs = [
+        faculty_run(3, started_at=0),
+        faculty_run(1, started_at=0),
+        faculty_run(2, started_at=10),
+    ]
+    sorts = [ParamSort("missing", SortOrder.ASC)]
+    assert run_numbers(sort_faculty_runs(runs, sorts)) == [2, 1, 3]
+
+
+def test_sort_faculty_runs_run_name():
+    runs = [
+        faculty_run(1, name="b"),
+        faculty_run(2, tags={MLFLOW_RUN_NAME: "a"}),
+        faculty_run(3, name="c"),
+    ]
+    sorts = [TagSort(MLFLOW_RUN_NAME, SortOrder.ASC)]
+    assert run_numbers(sort_faculty_runs(runs, sorts)) == [2, 1, 3]
+
+
+@pytest.mark.parametrize("limit", [0, 1, 3, 10])
+def test_sort_faculty_runs_limit(limit):
+    sorts = [MetricSort("loss", SortOrder.ASC)]
+    expected = run_numbers(sort_faculty_runs(RUNS, sorts))[:limit]
+    sorted_runs = sort_faculty_runs(iter(RUNS), sorts, limit=limit)
+    assert run_numbers(sorted_runs) == expected
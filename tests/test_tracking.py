@@ -13,22 +13,40 @@
 # limitations under the License.
 
 
+import math
+import threading
+from uuid import UUID, uuid4
+
 import faculty
 from faculty.clients.base import HttpError
 from faculty.clients.experiment import (
+    ComparisonOperator,
     ExperimentNameConflict,
     ExperimentRunStatus as FacultyExperimentRunStatus,
     ListExperimentRunsResponse,
     DeleteExperimentRunsResponse,
     RestoreExperimentRunsResponse,
     Page,
+    RunIdFilter,
 )
-from mlflow.entities import RunStatus, RunTag, ViewType
+from mlflow.entities import Metric, RunStatus, RunTag, ViewType
 from mlflow.exceptions import MlflowException
 from mlflow.utils.mlflow_tags import MLFLOW_RUN_NAME, MLFLOW_PARENT_RUN_ID
 import pytest
 
-from mlflow_faculty.tracking import FacultyRestStore
+import mlflow_faculty.tracking
+from mlflow_faculty.converters import (
+    faculty_metric_history_to_metric_history,
+    faculty_metric_to_mlflow_metric,
+    faculty_page_to_mlflow_page_token,
+    mlflow_page_token_to_faculty_page,
+)
+from mlflow_faculty.history import MetricHistory
+from mlflow_faculty.tracking import (
+    FacultyRestStore,
+    RunOutcome,
+    _flush_run_data_loggers,
+)
 from mlflow_faculty.filter import MatchesNothing
 from tests.fixtures import (
     ARTIFACT_LOCATION,
@@ -41,6 +59,7 @@ from tests.fixtures import (
     PARENT_RUN_UUID,
     PARENT_RUN_UUID_HEX_STR,
     FACULTY_EXPERIMENT,
+    FACULTY_METRIC,
     FACULTY_RUN,
     NAME,
     MLFLOW_METRIC,
@@ -98,6 +117,13 @@ def test_init_invalid_uri_bad_uuid():
         FacultyRestStore(store_uri)
 
 
+def test_init_invalid_uri_option(mocker):
+    mocker.patch("faculty.client")
+    store_uri = "{}?unknown=true".format(STORE_URI)
+    with pytest.raises(ValueError, match="Unknown option 'unknown'"):
+        FacultyRestStore(store_uri)
+
+
 def test_create_experiment(mocker):
     mock_client = mocker.Mock()
     mock_client.create.return_value = FACULTY_EXPERIMENT
@@ -243,6 +269,82 @@ def test_list_experiments_client_error(mocker):
         store.list_experiments()
 
 
+def test_get_experiment_by_name(mocker):
+    other_experiment = FACULTY_EXPERIMENT._replace(id=1, name="other")
+    mock_client = mocker.Mock()
+    mock_client.list.return_value = [other_experiment, FACULTY_EXPERIMENT]
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    converter = mocker.patch(
+        "mlflow_faculty.tracking.faculty_experiment_to_mlflow_experiment"
+    )
+
+    store = FacultyRestStore(STORE_URI)
+    experiment = store.get_experiment_by_name(NAME)
+
+    assert experiment == converter.return_value
+    mock_client.list.assert_called_once_with(PROJECT_ID, None)
+    converter.assert_called_once_with(FACULTY_EXPERIMENT)
+
+
+def test_get_experiment_by_name_not_found(mocker):
+    mock_client = mocker.Mock()
+    mock_client.list.return_value = [FACULTY_EXPERIMENT]
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(STORE_URI)
+
+    assert store.get_experiment_by_name("missing") is None
+    mock_client.list.assert_called_once_with(PROJECT_ID, None)
+
+
+def test_get_experiment_by_name_client_error(mocker):
+    mock_client = mocker.Mock()
+    mock_client.list.side_effect = HttpError(mocker.Mock(), "Error")
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(STORE_URI)
+
+    with pytest.raises(MlflowException, match="Error"):
+        store.get_experiment_by_name(NAME)
+
+
+def test_get_experiment_by_name_cached(mocker, experiment_caches):
+    mock_client = mocker.Mock()
+    mock_client.list.return_value = [FACULTY_EXPERIMENT]
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    first = FacultyRestStore(CACHED_STORE_URI).get_experiment_by_name(NAME)
+    second = FacultyRestStore(CACHED_STORE_URI).get_experiment_by_name(NAME)
+    by_id = FacultyRestStore(CACHED_STORE_URI).get_experiment(EXPERIMENT_ID)
+
+    mock_client.list.assert_called_once_with(PROJECT_ID, None)
+    mock_client.get.assert_not_called()
+    assert first.name == second.name == by_id.name == NAME
+
+
+def test_get_experiment_by_name_cached_refreshes_on_miss(
+    mocker, experiment_caches
+):
+    new_experiment = FACULTY_EXPERIMENT._replace(id=1, name="new")
+    mock_client = mocker.Mock()
+    mock_client.list.side_effect = [
+        [FACULTY_EXPERIMENT],
+        [FACULTY_EXPERIMENT, new_experiment],
+        [FACULTY_EXPERIMENT, new_experiment],
+    ]
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(CACHED_STORE_URI)
+    store.get_experiment_by_name(NAME)
+    experiment = store.get_experiment_by_name("new")
+    assert experiment.experiment_id == "1"
+    assert mock_client.list.call_count == 2
+
+    assert store.get_experiment_by_name("missing") is None
+    assert mock_client.list.call_count == 3
+
+
 def test_rename_experiment(mocker):
     mock_client = mocker.Mock()
     mocker.patch("faculty.client", return_value=mock_client)
@@ -288,6 +390,143 @@ def test_rename_experiment_invalid_experiment_id(mocker):
         store.rename_experiment("invalid-experiment-id", "new name")
 
 
+CACHED_STORE_URI = "{}?experiment_cache_ttl=60".format(STORE_URI)
+
+
+@pytest.fixture
+def experiment_caches(mocker):
+    return mocker.patch.dict(
+        "mlflow_faculty.tracking._EXPERIMENT_CACHES", clear=True
+    )
+
+
+def test_get_experiment_cached(mocker, experiment_caches):
+    mock_client = mocker.Mock()
+    mock_client.get.return_value = FACULTY_EXPERIMENT
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    first = FacultyRestStore(CACHED_STORE_URI).get_experiment(EXPERIMENT_ID)
+    # A new store, as created for each MLflow client, shares the cache
+    second = FacultyRestStore(CACHED_STORE_URI).get_experiment(
+        str(EXPERIMENT_ID)
+    )
+
+    mock_client.get.assert_called_once_with(PROJECT_ID, EXPERIMENT_ID)
+    assert first.experiment_id == second.experiment_id == str(EXPERIMENT_ID)
+
+
+def test_get_experiment_not_cached_by_default(mocker, experiment_caches):
+    mock_client = mocker.Mock()
+    mock_client.get.return_value = FACULTY_EXPERIMENT
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(STORE_URI)
+    store.get_experiment(EXPERIMENT_ID)
+    store.get_experiment(EXPERIMENT_ID)
+
+    assert mock_client.get.call_count == 2
+
+
+def test_get_experiment_cache_expires(mocker, experiment_caches):
+    mock_client = mocker.Mock()
+    mock_client.get.return_value = FACULTY_EXPERIMENT
+    mocker.patch("faculty.client", return_value=mock_client)
+    mock_time = mocker.patch("mlflow_faculty.cache.time.time")
+
+    store = FacultyRestStore(CACHED_STORE_URI)
+    mock_time.return_value = 1000.0
+    store.get_experiment(EXPERIMENT_ID)
+    mock_time.return_value = 1059.0
+    store.get_experiment(EXPERIMENT_ID)
+    assert mock_client.get.call_count == 1
+    mock_time.return_value = 1060.0
+    store.get_experiment(EXPERIMENT_ID)
+    assert mock_client.get.call_count == 2
+
+
+def test_list_experiments_cached(mocker, experiment_caches):
+    mock_client = mocker.Mock()
+    mock_client.list.return_value = [FACULTY_EXPERIMENT]
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(CACHED_STORE_URI)
+    first = store.list_experiments(ViewType.ACTIVE_ONLY)
+    second = store.list_experiments(ViewType.ACTIVE_ONLY)
+    store.list_experiments(ViewType.ALL)
+    experiment = store.get_experiment(EXPERIMENT_ID)
+
+    assert mock_client.list.call_count == 2
+    assert [e.experiment_id for e in first] == [str(EXPERIMENT_ID)]
+    assert [e.experiment_id for e in second] == [str(EXPERIMENT_ID)]
+    # Listed experiments are also cached by ID
+    mock_client.get.assert_not_called()
+    assert experiment.experiment_id == str(EXPERIMENT_ID)
+
+
+def test_experiment_cache_errors_not_cached(mocker, experiment_caches):
+    mock_client = mocker.Mock()
+    mock_client.get.side_effect = [
+        HttpError(mocker.Mock(), "Dummy client error."),
+        FACULTY_EXPERIMENT,
+    ]
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(CACHED_STORE_URI)
+    with pytest.raises(MlflowException):
+        store.get_experiment(EXPERIMENT_ID)
+    store.get_experiment(EXPERIMENT_ID)
+
+    assert mock_client.get.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda store: store.create_experiment(NAME, ARTIFACT_LOCATION),
+        lambda store: store.rename_experiment(EXPERIMENT_ID, "new name"),
+        lambda store: store.delete_experiment(EXPERIMENT_ID),
+        lambda store: store.restore_experiment(EXPERIMENT_ID),
+    ],
+    ids=["create", "rename", "delete", "restore"],
+)
+def test_experiment_cache_invalidated(mocker, experiment_caches, mutate):
+    mock_client = mocker.Mock()
+    mock_client.get.return_value = FACULTY_EXPERIMENT
+    mock_client.list.return_value = [FACULTY_EXPERIMENT]
+    mock_client.create.return_value = FACULTY_EXPERIMENT
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(CACHED_STORE_URI)
+    store.get_experiment(EXPERIMENT_ID)
+    store.list_experiments()
+
+    # Mutating through any store invalidates experiments cached for the
+    # project, whatever the cache settings
+    mutate(FacultyRestStore(STORE_URI))
+
+    store.get_experiment(EXPERIMENT_ID)
+    store.list_experiments()
+    assert mock_client.get.call_count == 2
+    assert mock_client.list.call_count == 2
+
+
+def test_experiment_cache_invalidated_on_error(mocker, experiment_caches):
+    mock_client = mocker.Mock()
+    mock_client.get.return_value = FACULTY_EXPERIMENT
+    mock_client.delete.side_effect = HttpError(
+        mocker.Mock(), "Dummy client error."
+    )
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(CACHED_STORE_URI)
+    store.get_experiment(EXPERIMENT_ID)
+    with pytest.raises(MlflowException):
+        store.delete_experiment(EXPERIMENT_ID)
+    store.get_experiment(EXPERIMENT_ID)
+
+    assert mock_client.get.call_count == 2
+
+
 def test_create_run(mocker):
     mlflow_timestamp = mocker.Mock()
     faculty_datetime = mocker.Mock()
@@ -694,6 +933,244 @@ def test_restore_run_invalid_run_id(mocker):
         store.restore_run("invalid-run-id")
 
 
+def mock_query_runs_by_id(mocker, faculty_runs):
+    """Respond to queries for runs by ID as the backend would."""
+
+    def query_runs(project_id, filter, start=0, limit=None):
+        conditions = getattr(filter, "conditions", [filter])
+        run_ids = [condition.value for condition in conditions]
+        return ListExperimentRunsResponse(
+            runs=[run for run in faculty_runs if run.id in run_ids],
+            pagination=mocker.Mock(next=None),
+        )
+
+    return mocker.Mock(side_effect=query_runs)
+
+
+@pytest.mark.parametrize("batch_workers", [1, 3])
+def test_get_runs(mocker, batch_workers):
+    faculty_runs = [mocker.Mock(id=uuid4()) for _ in range(7)]
+    mock_client = mocker.Mock()
+    mock_client.query_runs = mock_query_runs_by_id(mocker, faculty_runs)
+    mocker.patch("faculty.client", return_value=mock_client)
+    mocker.patch(
+        "mlflow_faculty.tracking.faculty_run_to_mlflow_run",
+        side_effect=lambda run: run,
+    )
+
+    store = FacultyRestStore(
+        "{}?run_batch_size=3&run_batch_workers={}".format(
+            STORE_URI, batch_workers
+        )
+    )
+    run_ids = [run.id.hex for run in reversed(faculty_runs)]
+
+    assert store.get_runs(run_ids) == list(reversed(faculty_runs))
+    assert mock_client.query_runs.call_count == 3
+
+
+def test_get_runs_duplicate_ids(mocker):
+    faculty_run = mocker.Mock(id=RUN_UUID)
+    mock_client = mocker.Mock()
+    mock_client.query_runs = mock_query_runs_by_id(mocker, [faculty_run])
+    mocker.patch("faculty.client", return_value=mock_client)
+    mocker.patch(
+        "mlflow_faculty.tracking.faculty_run_to_mlflow_run",
+        side_effect=lambda run: run,
+    )
+
+    store = FacultyRestStore(STORE_URI)
+    runs = store.get_runs([RUN_UUID_HEX_STR, str(RUN_UUID)])
+
+    assert runs == [faculty_run, faculty_run]
+    mock_client.query_runs.assert_called_once_with(
+        PROJECT_ID, RunIdFilter(ComparisonOperator.EQUAL_TO, RUN_UUID)
+    )
+
+
+def test_get_runs_missing(mocker):
+    faculty_run = mocker.Mock(id=uuid4())
+    missing_uuids = [uuid4(), uuid4()]
+    mock_client = mocker.Mock()
+    mock_client.query_runs = mock_query_runs_by_id(mocker, [faculty_run])
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(STORE_URI)
+    with pytest.raises(MlflowException) as excinfo:
+        store.get_runs(
+            [missing_uuids[0].hex, faculty_run.id.hex, missing_uuids[1].hex]
+        )
+
+    assert excinfo.value.message == "Could not find 2 run(s): {}, {}".format(
+        missing_uuids[0].hex, missing_uuids[1].hex
+    )
+    assert excinfo.value.error_code == "RESOURCE_DOES_NOT_EXIST"
+
+
+def test_get_runs_empty(mocker):
+    mock_client = mocker.Mock()
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(STORE_URI)
+
+    assert store.get_runs([]) == []
+    mock_client.query_runs.assert_not_called()
+
+
+def test_get_runs_client_error(mocker):
+    mock_client = mocker.Mock()
+    mock_client.query_runs.side_effect = HttpError(
+        mocker.Mock(), "Experiment run query failed"
+    )
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(STORE_URI)
+    with pytest.raises(MlflowException, match="Experiment run query failed"):
+        store.get_runs([RUN_UUID_HEX_STR])
+
+
+def mock_update_runs(
+    mocker, response_class, updated_field, updated, conflicted
+):
+    """Respond to bulk run updates as the backend would for known runs."""
+
+    def update_runs(project_id, run_ids):
+        return response_class(
+            **{
+                updated_field: [r for r in run_ids if r in updated],
+                "conflicted_run_ids": [r for r in run_ids if r in conflicted],
+            }
+        )
+
+    return mocker.Mock(side_effect=update_runs)
+
+
+@pytest.mark.parametrize("batch_workers", [1, 3])
+def test_delete_runs(mocker, batch_workers):
+    run_uuids = [uuid4() for _ in range(7)]
+    mock_client = mocker.Mock()
+    mock_client.delete_runs = mock_update_runs(
+        mocker,
+        DeleteExperimentRunsResponse,
+        "deleted_run_ids",
+        updated=run_uuids[:4],
+        conflicted=run_uuids[4:6],
+    )
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(
+        "{}?run_batch_size=3&run_batch_workers={}".format(
+            STORE_URI, batch_workers
+        )
+    )
+    run_ids = [run_uuid.hex for run_uuid in run_uuids]
+    outcomes = store.delete_runs(run_ids)
+
+    assert list(outcomes.keys()) == run_ids
+    assert list(outcomes.values()) == [RunOutcome.DELETED] * 4 + [
+        RunOutcome.CONFLICTED
+    ] * 2 + [RunOutcome.MISSING]
+    # Batches may be sent in any order when sent concurrently
+    assert mock_client.delete_runs.call_count == 3
+    for call in [
+        mocker.call(PROJECT_ID, run_uuids[0:3]),
+        mocker.call(PROJECT_ID, run_uuids[3:6]),
+        mocker.call(PROJECT_ID, run_uuids[6:7]),
+    ]:
+        assert call in mock_client.delete_runs.call_args_list
+
+
+def test_delete_runs_duplicate_ids(mocker):
+    mock_client = mocker.Mock()
+    mock_client.delete_runs = mock_update_runs(
+        mocker,
+        DeleteExperimentRunsResponse,
+        "deleted_run_ids",
+        updated=[RUN_UUID],
+        conflicted=[],
+    )
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(STORE_URI)
+    run_ids = [RUN_UUID_HEX_STR, str(RUN_UUID), RUN_UUID_HEX_STR]
+    outcomes = store.delete_runs(run_ids)
+
+    assert outcomes == {
+        RUN_UUID_HEX_STR: RunOutcome.DELETED,
+        str(RUN_UUID): RunOutcome.DELETED,
+    }
+    mock_client.delete_runs.assert_called_once_with(PROJECT_ID, [RUN_UUID])
+
+
+def test_delete_runs_empty(mocker):
+    mock_client = mocker.Mock()
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(STORE_URI)
+
+    assert store.delete_runs([]) == {}
+    mock_client.delete_runs.assert_not_called()
+
+
+def test_delete_runs_client_error(mocker):
+    mock_client = mocker.Mock()
+    mock_client.delete_runs.side_effect = HttpError(mocker.Mock(), "An error")
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(STORE_URI)
+    with pytest.raises(MlflowException, match="An error"):
+        store.delete_runs([RUN_UUID_HEX_STR])
+
+
+def test_delete_runs_invalid_run_id(mocker):
+    mock_client = mocker.Mock()
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(STORE_URI)
+
+    with pytest.raises(ValueError):
+        store.delete_runs([RUN_UUID_HEX_STR, "invalid-run-id"])
+    mock_client.delete_runs.assert_not_called()
+
+
+@pytest.mark.parametrize("batch_workers", [1, 3])
+def test_restore_runs(mocker, batch_workers):
+    run_uuids = [uuid4() for _ in range(5)]
+    mock_client = mocker.Mock()
+    mock_client.restore_runs = mock_update_runs(
+        mocker,
+        RestoreExperimentRunsResponse,
+        "restored_run_ids",
+        updated=run_uuids[:2],
+        conflicted=run_uuids[2:4],
+    )
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(
+        "{}?run_batch_size=2&run_batch_workers={}".format(
+            STORE_URI, batch_workers
+        )
+    )
+    run_ids = [run_uuid.hex for run_uuid in run_uuids]
+    outcomes = store.restore_runs(run_ids)
+
+    assert list(outcomes.keys()) == run_ids
+    assert list(outcomes.values()) == [RunOutcome.RESTORED] * 2 + [
+        RunOutcome.CONFLICTED
+    ] * 2 + [RunOutcome.MISSING]
+    assert mock_client.restore_runs.call_count == 3
+
+
+def test_restore_runs_client_error(mocker):
+    mock_client = mocker.Mock()
+    mock_client.restore_runs.side_effect = HttpError(mocker.Mock(), "An error")
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(STORE_URI)
+    with pytest.raises(MlflowException, match="An error"):
+        store.restore_runs([RUN_UUID_HEX_STR])
+
+
 def test_get_metric_history(mocker):
     metric_key = "metric_key"
     first_faculty_metric = mocker.Mock()
@@ -731,34 +1208,425 @@ def test_get_metric_history(mocker):
     ]
 
 
-def test_get_metric_history_client_error(mocker):
+def test_get_metric_history_max_points(mocker):
+    faculty_metrics = [
+        FACULTY_METRIC._replace(step=step, value=value)
+        for step, value in enumerate([0, 0, 0, 10, 0, 0, 0, -10, 0, 0])
+    ]
     mock_client = mocker.Mock()
-    mock_client.get_metric_history.side_effect = HttpError(
-        mocker.Mock(), "Dummy client error."
-    )
+    mock_client.get_metric_history.return_value = faculty_metrics
     mocker.patch("faculty.client", return_value=mock_client)
+    metric_converter = mocker.patch(
+        "mlflow_faculty.tracking.faculty_metric_to_mlflow_metric"
+    )
 
     store = FacultyRestStore(STORE_URI)
+    returned = store.get_metric_history(
+        RUN_UUID_HEX_STR, "metric_key", max_points=4
+    )
 
-    with pytest.raises(MlflowException, match="Dummy client error."):
-        store.get_metric_history(RUN_UUID_HEX_STR, "metric-key")
+    mock_client.get_metric_history.assert_called_once_with(
+        PROJECT_ID, RUN_UUID, "metric_key"
+    )
+    assert metric_converter.call_args_list == [
+        mocker.call(faculty_metrics[i]) for i in [0, 3, 7, 9]
+    ]
+    assert returned == [metric_converter.return_value] * 4
 
 
-def test_get_metric_history_invalid_run_id(mocker):
+def test_get_metric_history_max_points_compact(mocker):
+    faculty_metrics = [
+        FACULTY_METRIC._replace(step=step, value=float(step % 3))
+        for step in range(100)
+    ]
+    mock_client = mocker.Mock()
+    mock_client.get_metric_history.return_value = faculty_metrics
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(
+        "{}?metric_history_compact=true".format(STORE_URI)
+    )
+    history = store.get_metric_history(
+        RUN_UUID_HEX_STR, "metric_key", max_points=10
+    )
+
+    assert len(history) == 10
+    assert history.steps[0] == 0
+    assert history.steps[-1] == 99
+
+
+def test_get_metric_history_max_points_too_small(mocker):
     mock_client = mocker.Mock()
     mocker.patch("faculty.client", return_value=mock_client)
 
     store = FacultyRestStore(STORE_URI)
+    with pytest.raises(MlflowException, match="at least 3"):
+        store.get_metric_history(RUN_UUID_HEX_STR, "metric_key", max_points=2)
 
-    with pytest.raises(ValueError):
-        store.get_metric_history("invalid-run-id", "metric-key")
+    mock_client.get_metric_history.assert_not_called()
+
+
+HISTORY_CACHED_STORE_URI = "{}?metric_history_cache_ttl=60".format(STORE_URI)
 
 
 @pytest.fixture
-def mock_paginated_runs(mocker):
-    mock_faculty_runs = [mocker.Mock() for _ in range(4)]
-    page_1 = ListExperimentRunsResponse(
-        runs=mock_faculty_runs[:2],
+def metric_history_caches(mocker):
+    mocker.patch.dict(
+        "mlflow_faculty.tracking._METRIC_HISTORY_CACHES", clear=True
+    )
+    return mlflow_faculty.tracking._METRIC_HISTORY_CACHES
+
+
+def _faculty_metric_history(num_points):
+    return [
+        FACULTY_METRIC._replace(step=step, value=float(step))
+        for step in range(num_points)
+    ]
+
+
+def test_get_metric_history_cached(mocker, metric_history_caches):
+    mock_client = mocker.Mock()
+    mock_client.get_metric_history.side_effect = [
+        _faculty_metric_history(3),
+        _faculty_metric_history(5),
+    ]
+    mocker.patch("faculty.client", return_value=mock_client)
+    converter = mocker.patch(
+        "mlflow_faculty.tracking.faculty_metric_to_mlflow_metric",
+        wraps=faculty_metric_to_mlflow_metric,
+    )
+
+    store = FacultyRestStore(HISTORY_CACHED_STORE_URI)
+    first = store.get_metric_history(RUN_UUID_HEX_STR, "metric_key")
+    # Changing a returned list does not change the cache
+    first.append(None)
+    # A new store shares the cache, as MLflow creates one per client
+    store = FacultyRestStore(HISTORY_CACHED_STORE_URI)
+    second = store.get_metric_history(RUN_UUID_HEX_STR, "metric_key")
+
+    assert [metric.step for metric in first[:3]] == [0, 1, 2]
+    assert [metric.step for metric in second] == [0, 1, 2, 3, 4]
+    assert all(isinstance(metric, Metric) for metric in second)
+    assert mock_client.get_metric_history.call_count == 2
+    # Each point is converted only once
+    assert converter.call_args_list == [
+        mocker.call(faculty_metric)
+        for faculty_metric in _faculty_metric_history(5)
+    ]
+
+
+def test_get_metric_history_cached_compact(mocker, metric_history_caches):
+    mock_client = mocker.Mock()
+    mock_client.get_metric_history.side_effect = [
+        _faculty_metric_history(3),
+        _faculty_metric_history(5),
+    ]
+    mocker.patch("faculty.client", return_value=mock_client)
+    converter = mocker.patch(
+        "mlflow_faculty.tracking.faculty_metric_history_to_metric_history",
+        wraps=faculty_metric_history_to_metric_history,
+    )
+
+    store = FacultyRestStore(
+        HISTORY_CACHED_STORE_URI + "&metric_history_compact=true"
+    )
+    store.get_metric_history(RUN_UUID_HEX_STR, "metric_key")
+    history = store.get_metric_history(RUN_UUID_HEX_STR, "metric_key")
+
+    assert isinstance(history, MetricHistory)
+    assert history.key == "metric_key"
+    assert history.steps.tolist() == [0, 1, 2, 3, 4]
+    assert history.values.tolist() == [0, 1, 2, 3, 4]
+    assert converter.call_args_list == [
+        mocker.call("metric_key", _faculty_metric_history(3)),
+        mocker.call("metric_key", _faculty_metric_history(5)[3:]),
+    ]
+
+
+def test_get_metric_history_cached_compact_read_only(
+    mocker, metric_history_caches
+):
+    mock_client = mocker.Mock()
+    mock_client.get_metric_history.return_value = _faculty_metric_history(3)
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(
+        HISTORY_CACHED_STORE_URI + "&metric_history_compact=true"
+    )
+    history = store.get_metric_history(RUN_UUID_HEX_STR, "metric_key")
+
+    for array in [history.steps, history.timestamps, history.values]:
+        with pytest.raises(ValueError):
+            array[0] = 100
+    again = store.get_metric_history(RUN_UUID_HEX_STR, "metric_key")
+    assert again.values.tolist() == [0, 1, 2]
+
+
+@pytest.mark.parametrize(
+    "new_history",
+    [
+        _faculty_metric_history(2),
+        _faculty_metric_history(2)
+        + [FACULTY_METRIC._replace(step=9, value=9.0)]
+        + _faculty_metric_history(5)[3:],
+    ],
+    ids=["shorter", "changed"],
+)
+def test_get_metric_history_cached_history_changed(
+    mocker, metric_history_caches, new_history
+):
+    mock_client = mocker.Mock()
+    mock_client.get_metric_history.side_effect = [
+        _faculty_metric_history(3),
+        new_history,
+    ]
+    mocker.patch("faculty.client", return_value=mock_client)
+    converter = mocker.patch(
+        "mlflow_faculty.tracking.faculty_metric_to_mlflow_metric",
+        wraps=faculty_metric_to_mlflow_metric,
+    )
+
+    store = FacultyRestStore(HISTORY_CACHED_STORE_URI)
+    store.get_metric_history(RUN_UUID_HEX_STR, "metric_key")
+    history = store.get_metric_history(RUN_UUID_HEX_STR, "metric_key")
+
+    assert [metric.step for metric in history] == [
+        metric.step for metric in new_history
+    ]
+    # The whole new history is converted again
+    assert converter.call_args_list[3:] == [
+        mocker.call(faculty_metric) for faculty_metric in new_history
+    ]
+
+
+def test_get_metric_history_cached_nan_last_point(
+    mocker, metric_history_caches
+):
+    def history_with_nan(num_points):
+        history = _faculty_metric_history(num_points)
+        history[2] = history[2]._replace(value=float("nan"))
+        return history
+
+    mock_client = mocker.Mock()
+    mock_client.get_metric_history.side_effect = [
+        history_with_nan(3),
+        history_with_nan(5),
+    ]
+    mocker.patch("faculty.client", return_value=mock_client)
+    converter = mocker.patch(
+        "mlflow_faculty.tracking.faculty_metric_to_mlflow_metric",
+        wraps=faculty_metric_to_mlflow_metric,
+    )
+
+    store = FacultyRestStore(HISTORY_CACHED_STORE_URI)
+    store.get_metric_history(RUN_UUID_HEX_STR, "metric_key")
+    history = store.get_metric_history(RUN_UUID_HEX_STR, "metric_key")
+
+    assert [metric.step for metric in history] == [0, 1, 2, 3, 4]
+    assert math.isnan(history[2].value)
+    # The cached points are reused, despite the NaN
+    assert converter.call_count == 5
+
+
+def test_get_metric_history_cached_max_points(mocker, metric_history_caches):
+    mock_client = mocker.Mock()
+    mock_client.get_metric_history.return_value = _faculty_metric_history(10)
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(HISTORY_CACHED_STORE_URI)
+    history = store.get_metric_history(
+        RUN_UUID_HEX_STR, "metric_key", max_points=4
+    )
+
+    assert len(history) == 4
+    (cache,) = metric_history_caches.values()
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize(
+    "run_status, invalidated",
+    [("RUNNING", False), ("FINISHED", True), ("FAILED", True)],
+)
+def test_update_run_info_invalidates_cached_histories(
+    mocker, metric_history_caches, run_status, invalidated
+):
+    other_run_uuid = uuid4()
+    mock_client = mocker.Mock()
+    mock_client.get_metric_history.return_value = _faculty_metric_history(3)
+    mocker.patch("faculty.client", return_value=mock_client)
+    mocker.patch("mlflow_faculty.tracking.faculty_run_to_mlflow_run")
+
+    store = FacultyRestStore(HISTORY_CACHED_STORE_URI)
+    store.get_metric_history(RUN_UUID_HEX_STR, "metric_key")
+    store.get_metric_history(other_run_uuid.hex, "metric_key")
+    (cache,) = metric_history_caches.values()
+    assert len(cache) == 2
+
+    store.update_run_info(
+        RUN_UUID_HEX_STR, run_status, RUN_ENDED_AT_MILLISECONDS
+    )
+
+    assert len(cache) == (1 if invalidated else 2)
+    cache.get((PROJECT_ID, other_run_uuid, "metric_key", False))
+
+
+def test_get_metric_history_compact(mocker):
+    mock_client = mocker.Mock()
+    mock_client.get_metric_history.return_value = mocker.sentinel.history
+    mocker.patch("faculty.client", return_value=mock_client)
+    converter = mocker.patch(
+        "mlflow_faculty.tracking.faculty_metric_history_to_metric_history"
+    )
+    metric_converter = mocker.patch(
+        "mlflow_faculty.tracking.faculty_metric_to_mlflow_metric"
+    )
+
+    store = FacultyRestStore(
+        "{}?metric_history_compact=true".format(STORE_URI)
+    )
+
+    returned = store.get_metric_history(RUN_UUID_HEX_STR, "metric_key")
+
+    assert returned == converter.return_value
+    mock_client.get_metric_history.assert_called_once_with(
+        PROJECT_ID, RUN_UUID, "metric_key"
+    )
+    converter.assert_called_once_with("metric_key", mocker.sentinel.history)
+    metric_converter.assert_not_called()
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_get_metric_histories(mocker, workers):
+    run_uuids = [uuid4(), uuid4()]
+    histories = {
+        (run_uuid, key): mocker.Mock()
+        for run_uuid in run_uuids
+        for key in ["loss", "accuracy"]
+    }
+
+    def get_metric_history(project_id, run_uuid, key):
+        return histories[run_uuid, key]
+
+    mock_client = mocker.Mock()
+    mock_client.get_metric_history.side_effect = get_metric_history
+    mocker.patch("faculty.client", return_value=mock_client)
+    mocker.patch(
+        "mlflow_faculty.tracking.faculty_metric_history_to_array",
+        side_effect=lambda history: ("array", history),
+    )
+
+    store = FacultyRestStore(
+        "{}?metric_history_workers={}".format(STORE_URI, workers)
+    )
+    run_ids = [run_uuid.hex for run_uuid in run_uuids]
+    result = store.get_metric_histories(run_ids, ["loss", "accuracy"])
+
+    assert list(result.keys()) == [
+        (run_ids[0], "loss"),
+        (run_ids[0], "accuracy"),
+        (run_ids[1], "loss"),
+        (run_ids[1], "accuracy"),
+    ]
+    for (run_id, key), array in result.items():
+        assert array == ("array", histories[UUID(run_id), key])
+    assert mock_client.get_metric_history.call_count == 4
+
+
+def test_get_metric_histories_iterables(mocker):
+    mock_client = mocker.Mock()
+    mock_client.get_metric_history.return_value = []
+    mocker.patch("faculty.client", return_value=mock_client)
+    run_ids = [uuid4().hex, uuid4().hex]
+
+    store = FacultyRestStore(STORE_URI)
+    result = store.get_metric_histories(
+        iter(run_ids), (key for key in ["loss", "accuracy"])
+    )
+
+    assert list(result.keys()) == [
+        (run_ids[0], "loss"),
+        (run_ids[0], "accuracy"),
+        (run_ids[1], "loss"),
+        (run_ids[1], "accuracy"),
+    ]
+    assert mock_client.get_metric_history.call_count == 4
+
+
+def test_get_metric_histories_converts_to_arrays(mocker):
+    mock_client = mocker.Mock()
+    mock_client.get_metric_history.return_value = [
+        FACULTY_METRIC._replace(value=0.5, step=3)
+    ]
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(STORE_URI)
+    result = store.get_metric_histories([RUN_UUID_HEX_STR], ["metric-key"])
+
+    array = result[RUN_UUID_HEX_STR, "metric-key"]
+    assert array["step"].tolist() == [3]
+    assert array["value"].tolist() == [0.5]
+    mock_client.get_metric_history.assert_called_once_with(
+        PROJECT_ID, RUN_UUID, "metric-key"
+    )
+
+
+def test_get_metric_histories_grows_connection_pool(mocker):
+    mock_client = mocker.Mock()
+    mock_client.get_metric_history.return_value = []
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(STORE_URI + "?metric_history_workers=32")
+    run_ids = [uuid4().hex for _ in range(20)]
+    store.get_metric_histories(run_ids, ["loss", "accuracy"])
+    store.get_metric_histories(run_ids, ["loss", "accuracy"])
+
+    # Mounted once, for each scheme
+    assert mock_client.http_session.mount.call_count == 2
+    _, adapter = mock_client.http_session.mount.call_args[0]
+    assert adapter._pool_maxsize == 32
+
+
+def test_get_metric_histories_client_error(mocker):
+    mock_client = mocker.Mock()
+    mock_client.get_metric_history.side_effect = HttpError(
+        mocker.Mock(), "Dummy client error."
+    )
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(STORE_URI)
+
+    with pytest.raises(MlflowException, match="Dummy client error."):
+        store.get_metric_histories([RUN_UUID_HEX_STR], ["metric-key"])
+
+
+def test_get_metric_history_client_error(mocker):
+    mock_client = mocker.Mock()
+    mock_client.get_metric_history.side_effect = HttpError(
+        mocker.Mock(), "Dummy client error."
+    )
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(STORE_URI)
+
+    with pytest.raises(MlflowException, match="Dummy client error."):
+        store.get_metric_history(RUN_UUID_HEX_STR, "metric-key")
+
+
+def test_get_metric_history_invalid_run_id(mocker):
+    mock_client = mocker.Mock()
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(STORE_URI)
+
+    with pytest.raises(ValueError):
+        store.get_metric_history("invalid-run-id", "metric-key")
+
+
+@pytest.fixture
+def mock_paginated_runs(mocker):
+    mock_faculty_runs = [mocker.Mock() for _ in range(4)]
+    page_1 = ListExperimentRunsResponse(
+        runs=mock_faculty_runs[:2],
         pagination=mocker.Mock(next=Page(start=2, limit=2)),
     )
     page_2 = ListExperimentRunsResponse(
@@ -767,8 +1635,7 @@ def mock_paginated_runs(mocker):
     return mock_faculty_runs, [page_1, page_2]
 
 
-@pytest.mark.parametrize("max_results", [None, 3])
-def test_search_runs(mocker, max_results):
+def test_search_runs(mocker):
     mock_faculty_runs = [mocker.Mock() for _ in range(4)]
     run_page_1 = ListExperimentRunsResponse(
         runs=mock_faculty_runs[:2],
@@ -803,12 +1670,12 @@ def test_search_runs(mocker, max_results):
         experiment_ids,
         filter_string,
         run_view_type,
-        max_results,
+        max_results=None,
         order_by=None,
         page_token=None,
     )
 
-    assert runs == mock_mlflow_runs[:max_results]
+    assert runs == mock_mlflow_runs
     assert page_token is None
 
     build_filter_mock.assert_called_once_with(
@@ -821,9 +1688,397 @@ def test_search_runs(mocker, max_results):
         ]
     )
     run_converter_mock.assert_has_calls(
-        [mocker.call(run) for run in mock_faculty_runs[:max_results]]
+        [mocker.call(run) for run in mock_faculty_runs]
+    )
+
+
+def test_search_runs_max_results(mocker):
+    mock_faculty_runs = [mocker.Mock() for _ in range(3)]
+    run_page = ListExperimentRunsResponse(
+        runs=mock_faculty_runs,
+        pagination=mocker.Mock(next=Page(start=3, limit=3)),
+    )
+
+    mock_client = mocker.Mock()
+    mock_client.query_runs.return_value = run_page
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    mock_filter = mocker.Mock()
+    mocker.patch(
+        "mlflow_faculty.tracking.build_search_runs_filter",
+        return_value=mock_filter,
+    )
+    mock_mlflow_runs = [mocker.Mock() for _ in range(3)]
+    mocker.patch(
+        "mlflow_faculty.tracking.faculty_run_to_mlflow_run",
+        side_effect=mock_mlflow_runs,
     )
 
+    store = FacultyRestStore(STORE_URI)
+    runs, page_token = store._search_runs(
+        [EXPERIMENT_ID],
+        filter_string=None,
+        run_view_type=None,
+        max_results=3,
+        order_by=None,
+        page_token=None,
+    )
+
+    assert runs == mock_mlflow_runs
+    assert mlflow_page_token_to_faculty_page(page_token) == Page(3, 3)
+    mock_client.query_runs.assert_called_once_with(
+        PROJECT_ID, mock_filter, start=0, limit=3
+    )
+
+
+def test_search_runs_page_token(mocker):
+    mock_faculty_runs = [mocker.Mock() for _ in range(2)]
+    run_page = ListExperimentRunsResponse(
+        runs=mock_faculty_runs, pagination=mocker.Mock(next=None)
+    )
+
+    mock_client = mocker.Mock()
+    mock_client.query_runs.return_value = run_page
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    mock_filter = mocker.Mock()
+    mocker.patch(
+        "mlflow_faculty.tracking.build_search_runs_filter",
+        return_value=mock_filter,
+    )
+    mock_mlflow_runs = [mocker.Mock() for _ in range(2)]
+    mocker.patch(
+        "mlflow_faculty.tracking.faculty_run_to_mlflow_run",
+        side_effect=mock_mlflow_runs,
+    )
+
+    store = FacultyRestStore(STORE_URI)
+    runs, page_token = store._search_runs(
+        [EXPERIMENT_ID],
+        filter_string=None,
+        run_view_type=None,
+        max_results=5,
+        order_by=None,
+        page_token=faculty_page_to_mlflow_page_token(Page(10, 10)),
+    )
+
+    assert runs == mock_mlflow_runs
+    assert page_token is None
+    mock_client.query_runs.assert_called_once_with(
+        PROJECT_ID, mock_filter, start=10, limit=5
+    )
+
+
+def test_search_runs_short_pages(mocker):
+    mock_faculty_runs = [mocker.Mock() for _ in range(5)]
+    run_page_1 = ListExperimentRunsResponse(
+        runs=mock_faculty_runs[:2],
+        pagination=mocker.Mock(next=Page(start=2, limit=2)),
+    )
+    run_page_2 = ListExperimentRunsResponse(
+        runs=mock_faculty_runs[2:],
+        pagination=mocker.Mock(next=Page(start=5, limit=2)),
+    )
+
+    mock_client = mocker.Mock()
+    mock_client.query_runs.side_effect = [run_page_1, run_page_2]
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    mock_filter = mocker.Mock()
+    mocker.patch(
+        "mlflow_faculty.tracking.build_search_runs_filter",
+        return_value=mock_filter,
+    )
+    mock_mlflow_runs = [mocker.Mock() for _ in range(3)]
+    mocker.patch(
+        "mlflow_faculty.tracking.faculty_run_to_mlflow_run",
+        side_effect=mock_mlflow_runs,
+    )
+
+    store = FacultyRestStore(STORE_URI)
+    runs, page_token = store._search_runs(
+        [EXPERIMENT_ID],
+        filter_string=None,
+        run_view_type=None,
+        max_results=3,
+        order_by=None,
+        page_token=None,
+    )
+
+    assert runs == mock_mlflow_runs
+    assert mlflow_page_token_to_faculty_page(page_token) == Page(3, 1)
+    mock_client.query_runs.assert_has_calls(
+        [
+            mocker.call(PROJECT_ID, mock_filter, start=0, limit=3),
+            mocker.call(PROJECT_ID, mock_filter, start=2, limit=1),
+        ]
+    )
+
+
+def test_search_runs_invalid_page_token(mocker):
+    mock_client = mocker.Mock()
+    mocker.patch("faculty.client", return_value=mock_client)
+    mocker.patch("mlflow_faculty.tracking.build_search_runs_filter")
+
+    store = FacultyRestStore(STORE_URI)
+
+    with pytest.raises(MlflowException, match="Invalid page token"):
+        store._search_runs(
+            [EXPERIMENT_ID],
+            filter_string=None,
+            run_view_type=None,
+            max_results=None,
+            order_by=None,
+            page_token="invalid-token",
+        )
+    mock_client.query_runs.assert_not_called()
+
+
+def mock_query_runs(mocker, faculty_runs, server_page_size, sort_runs=None):
+    """Serve fixed size pages of runs by offset, as the backend would.
+
+    Queries with a sort are ordered with ``sort_runs``, or rejected if it is
+    not given.
+    """
+
+    def query_runs(project_id, filter, sort=None, start=0, limit=None):
+        runs = faculty_runs
+        if sort is not None:
+            if sort_runs is None:
+                raise faculty.clients.base.BadRequest(mocker.Mock())
+            runs = sort_runs(faculty_runs)
+        limit = server_page_size if limit is None else limit
+        end = start + min(limit, server_page_size)
+        if end < len(runs):
+            next_page = Page(start=end, limit=server_page_size)
+        else:
+            next_page = None
+        return ListExperimentRunsResponse(
+            runs=runs[start:end],
+            pagination=mocker.Mock(next=next_page),
+        )
+
+    return mocker.Mock(side_effect=query_runs)
+
+
+@pytest.mark.parametrize("max_results", [None, 7, 10])
+def test_search_runs_prefetch(mocker, max_results):
+    mock_faculty_runs = [mocker.Mock() for _ in range(10)]
+    mock_client = mocker.Mock()
+    mock_client.query_runs = mock_query_runs(mocker, mock_faculty_runs, 3)
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    mocker.patch("mlflow_faculty.tracking.build_search_runs_filter")
+    mocker.patch(
+        "mlflow_faculty.tracking.faculty_run_to_mlflow_run",
+        side_effect=lambda run: run,
+    )
+
+    store = FacultyRestStore("{}?search_prefetch=2".format(STORE_URI))
+    runs, page_token = store._search_runs(
+        [EXPERIMENT_ID],
+        filter_string=None,
+        run_view_type=None,
+        max_results=max_results,
+        order_by=None,
+        page_token=None,
+    )
+
+    assert runs == mock_faculty_runs[:max_results]
+    if max_results == 7:
+        assert mlflow_page_token_to_faculty_page(page_token) == Page(7, 3)
+    else:
+        assert page_token is None
+
+    if max_results is not None:
+        # Never fetch past max_results
+        for call in mock_client.query_runs.call_args_list:
+            assert call[1]["start"] + call[1]["limit"] <= max_results
+
+
+def test_search_runs_prefetch_replans_on_short_pages(mocker):
+    mock_faculty_runs = [mocker.Mock() for _ in range(10)]
+    mock_client = mocker.Mock()
+    # The first response advertises pages of 4 runs but the server then only
+    # returns 3 at a time
+    first_page = ListExperimentRunsResponse(
+        runs=mock_faculty_runs[:2],
+        pagination=mocker.Mock(next=Page(start=2, limit=4)),
+    )
+    serve_pages = mock_query_runs(mocker, mock_faculty_runs, 3)
+
+    def query_runs(project_id, filter, start=0, limit=None):
+        if start == 0:
+            return first_page
+        return serve_pages(project_id, filter, start=start, limit=limit)
+
+    mock_client.query_runs.side_effect = query_runs
+    mocker.patch("faculty.client", return_value=mock_client)
+    mocker.patch("mlflow_faculty.tracking.build_search_runs_filter")
+    mocker.patch(
+        "mlflow_faculty.tracking.faculty_run_to_mlflow_run",
+        side_effect=lambda run: run,
+    )
+
+    store = FacultyRestStore("{}?search_prefetch=3".format(STORE_URI))
+    runs, page_token = store._search_runs(
+        [EXPERIMENT_ID],
+        filter_string=None,
+        run_view_type=None,
+        max_results=None,
+        order_by=None,
+        page_token=None,
+    )
+
+    assert runs == mock_faculty_runs
+    assert page_token is None
+
+
+@pytest.mark.parametrize(
+    "max_results, page_token, expected_indices, expected_next_page",
+    [
+        (None, None, [4, 3, 2, 1, 0], None),
+        (2, None, [4, 3], Page(2, 2)),
+        (2, Page(2, 2), [2, 1], Page(4, 2)),
+        (2, Page(4, 2), [0], None),
+        (5, None, [4, 3, 2, 1, 0], None),
+    ],
+)
+def test_search_runs_order_by(
+    mocker, max_results, page_token, expected_indices, expected_next_page
+):
+    mock_faculty_runs = [mocker.Mock() for _ in range(5)]
+    mock_client = mocker.Mock()
+    mock_client.query_runs = mock_query_runs(
+        mocker, mock_faculty_runs, 2, sort_runs=lambda runs: runs[::-1]
+    )
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    mocker.patch("mlflow_faculty.tracking.build_search_runs_filter")
+    mock_build_sort = mocker.patch(
+        "mlflow_faculty.tracking.build_search_runs_sort"
+    )
+    mock_sort = mocker.patch("mlflow_faculty.tracking.sort_faculty_runs")
+    mocker.patch(
+        "mlflow_faculty.tracking.faculty_run_to_mlflow_run",
+        side_effect=lambda run: run,
+    )
+
+    store = FacultyRestStore(STORE_URI)
+    runs, next_page_token = store._search_runs(
+        [EXPERIMENT_ID],
+        filter_string=None,
+        run_view_type=None,
+        max_results=max_results,
+        order_by=["metrics.loss DESC"],
+        page_token=None
+        if page_token is None
+        else faculty_page_to_mlflow_page_token(page_token),
+    )
+
+    assert runs == [mock_faculty_runs[i] for i in expected_indices]
+    if expected_next_page is None:
+        assert next_page_token is None
+    else:
+        assert (
+            mlflow_page_token_to_faculty_page(next_page_token)
+            == expected_next_page
+        )
+
+    mock_build_sort.assert_called_once_with(["metrics.loss DESC"])
+    # The server sorts the runs, and only the requested page is fetched
+    for call in mock_client.query_runs.call_args_list:
+        assert call[1]["sort"] == mock_build_sort.return_value
+    assert mock_client.query_runs.call_count == math.ceil(
+        len(expected_indices) / 2.0
+    )
+    mock_sort.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "max_results, page_token, expected_indices, expected_next_page",
+    [
+        (None, None, [4, 3, 2, 1, 0], None),
+        (2, None, [4, 3], Page(2, 2)),
+        (2, Page(2, 2), [2, 1], Page(4, 2)),
+        (2, Page(4, 2), [0], None),
+        (5, None, [4, 3, 2, 1, 0], None),
+    ],
+)
+def test_search_runs_order_by_rejected_by_server(
+    mocker, max_results, page_token, expected_indices, expected_next_page
+):
+    mock_faculty_runs = [mocker.Mock() for _ in range(5)]
+    mock_client = mocker.Mock()
+    mock_client.query_runs = mock_query_runs(mocker, mock_faculty_runs, 2)
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    mocker.patch("mlflow_faculty.tracking.build_search_runs_filter")
+    mock_build_sort = mocker.patch(
+        "mlflow_faculty.tracking.build_search_runs_sort"
+    )
+
+    def sort_faculty_runs(faculty_runs, sorts, limit):
+        return list(reversed(list(faculty_runs)))[:limit]
+
+    mock_sort = mocker.patch(
+        "mlflow_faculty.tracking.sort_faculty_runs",
+        side_effect=sort_faculty_runs,
+    )
+    mocker.patch(
+        "mlflow_faculty.tracking.faculty_run_to_mlflow_run",
+        side_effect=lambda run: run,
+    )
+
+    store = FacultyRestStore(STORE_URI)
+    runs, next_page_token = store._search_runs(
+        [EXPERIMENT_ID],
+        filter_string=None,
+        run_view_type=None,
+        max_results=max_results,
+        order_by=["metrics.loss DESC"],
+        page_token=None
+        if page_token is None
+        else faculty_page_to_mlflow_page_token(page_token),
+    )
+
+    assert runs == [mock_faculty_runs[i] for i in expected_indices]
+    if expected_next_page is None:
+        assert next_page_token is None
+    else:
+        assert (
+            mlflow_page_token_to_faculty_page(next_page_token)
+            == expected_next_page
+        )
+
+    mock_build_sort.assert_called_once_with(["metrics.loss DESC"])
+    [sort_call] = mock_sort.call_args_list
+    assert sort_call[0][1] == mock_build_sort.return_value
+    if max_results is None:
+        assert sort_call[1]["limit"] is None
+    else:
+        # Only runs up to the end of the page, and one more, are kept
+        start = 0 if page_token is None else page_token.start
+        assert sort_call[1]["limit"] == start + max_results + 1
+
+
+def test_search_runs_invalid_order_by(mocker):
+    mock_client = mocker.Mock()
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(STORE_URI)
+
+    with pytest.raises(MlflowException, match="Invalid order_by clause"):
+        store._search_runs(
+            [EXPERIMENT_ID],
+            filter_string=None,
+            run_view_type=None,
+            max_results=None,
+            order_by=["metrics.loss UP"],
+            page_token=None,
+        )
+    mock_client.query_runs.assert_not_called()
+
 
 def test_search_runs_matches_nothing_shortcircuit(mocker):
     mock_client = mocker.Mock()
@@ -891,6 +2146,214 @@ def test_search_runs_client_error(mocker):
         )
 
 
+def test_iter_runs(mocker):
+    mock_faculty_runs = [mocker.Mock() for _ in range(5)]
+    mock_client = mocker.Mock()
+    mock_client.query_runs = mock_query_runs(mocker, mock_faculty_runs, 2)
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    experiment_ids = mocker.Mock()
+    filter_string = mocker.Mock()
+    view_type = mocker.Mock()
+    mock_filter = mocker.Mock()
+    build_filter_mock = mocker.patch(
+        "mlflow_faculty.tracking.build_search_runs_filter",
+        return_value=mock_filter,
+    )
+    mock_mlflow_runs = [mocker.Mock() for _ in range(5)]
+    mocker.patch(
+        "mlflow_faculty.tracking.faculty_run_to_mlflow_run",
+        side_effect=mock_mlflow_runs,
+    )
+
+    store = FacultyRestStore(STORE_URI)
+    runs = store.iter_runs(experiment_ids, filter_string, view_type)
+
+    # Pages are only fetched as the runs are consumed
+    mock_client.query_runs.assert_not_called()
+    assert [next(runs), next(runs)] == mock_mlflow_runs[:2]
+    mock_client.query_runs.assert_called_once_with(PROJECT_ID, mock_filter)
+
+    assert list(runs) == mock_mlflow_runs[2:]
+    build_filter_mock.assert_called_once_with(
+        experiment_ids, filter_string, view_type
+    )
+    mock_client.query_runs.assert_has_calls(
+        [
+            mocker.call(PROJECT_ID, mock_filter),
+            mocker.call(PROJECT_ID, mock_filter, start=2, limit=2),
+            mocker.call(PROJECT_ID, mock_filter, start=4, limit=2),
+        ]
+    )
+
+
+def test_iter_runs_matches_nothing_shortcircuit(mocker):
+    mock_client = mocker.Mock()
+    mocker.patch("faculty.client", return_value=mock_client)
+    mocker.patch(
+        "mlflow_faculty.tracking.build_search_runs_filter",
+        side_effect=MatchesNothing,
+    )
+
+    store = FacultyRestStore(STORE_URI)
+
+    assert list(store.iter_runs([])) == []
+    mock_client.query_runs.assert_not_called()
+
+
+def test_iter_runs_invalid_filter_conditions(mocker):
+    mocker.patch("faculty.client")
+    mocker.patch(
+        "mlflow_faculty.tracking.build_search_runs_filter",
+        side_effect=ValueError("Mock error message"),
+    )
+
+    store = FacultyRestStore(STORE_URI)
+
+    with pytest.raises(MlflowException, match="Mock error message"):
+        list(store.iter_runs([EXPERIMENT_ID], "invalid filter"))
+
+
+def test_iter_runs_client_error(mocker):
+    mock_client = mocker.Mock()
+    mock_client.query_runs.side_effect = HttpError(
+        mocker.Mock(), "Dummy client error."
+    )
+    mocker.patch("faculty.client", return_value=mock_client)
+    mocker.patch("mlflow_faculty.tracking.build_search_runs_filter")
+
+    store = FacultyRestStore(STORE_URI)
+
+    with pytest.raises(MlflowException, match="Dummy client error."):
+        list(store.iter_runs([EXPERIMENT_ID]))
+
+
+@pytest.mark.parametrize("max_results, expected_runs", [(None, 5), (3, 3)])
+def test_search_runs_frame(mocker, max_results, expected_runs):
+    mock_faculty_runs = [mocker.Mock() for _ in range(5)]
+    mock_client = mocker.Mock()
+    mock_client.query_runs = mock_query_runs(mocker, mock_faculty_runs, 2)
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    mock_build_filter = mocker.patch(
+        "mlflow_faculty.tracking.build_search_runs_filter"
+    )
+    mock_to_frame = mocker.patch(
+        "mlflow_faculty.tracking.faculty_runs_to_frame"
+    )
+    mock_to_run = mocker.patch(
+        "mlflow_faculty.tracking.faculty_run_to_mlflow_run"
+    )
+
+    store = FacultyRestStore(STORE_URI)
+    frame = store.search_runs_frame(
+        [EXPERIMENT_ID], "filter", ViewType.ALL, max_results=max_results
+    )
+
+    assert frame == mock_to_frame.return_value
+    mock_build_filter.assert_called_once_with(
+        [EXPERIMENT_ID], "filter", ViewType.ALL
+    )
+    mock_to_frame.assert_called_once_with(mock_faculty_runs[:expected_runs])
+    mock_to_run.assert_not_called()
+
+
+def test_search_runs_frame_order_by(mocker):
+    mock_faculty_runs = [mocker.Mock() for _ in range(5)]
+    mock_client = mocker.Mock()
+    mock_client.query_runs = mock_query_runs(
+        mocker, mock_faculty_runs, 2, sort_runs=lambda runs: runs[::-1]
+    )
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    mocker.patch("mlflow_faculty.tracking.build_search_runs_filter")
+    mock_build_sort = mocker.patch(
+        "mlflow_faculty.tracking.build_search_runs_sort"
+    )
+    mock_sort = mocker.patch("mlflow_faculty.tracking.sort_faculty_runs")
+    mock_to_frame = mocker.patch(
+        "mlflow_faculty.tracking.faculty_runs_to_frame"
+    )
+
+    store = FacultyRestStore(STORE_URI)
+    frame = store.search_runs_frame(
+        [EXPERIMENT_ID], max_results=2, order_by=["metrics.loss"]
+    )
+
+    assert frame == mock_to_frame.return_value
+    mock_build_sort.assert_called_once_with(["metrics.loss"])
+    mock_client.query_runs.assert_called_once_with(
+        PROJECT_ID,
+        mocker.ANY,
+        sort=mock_build_sort.return_value,
+        start=0,
+        limit=2,
+    )
+    mock_sort.assert_not_called()
+    mock_to_frame.assert_called_once_with(mock_faculty_runs[:2:-1])
+
+
+def test_search_runs_frame_order_by_rejected_by_server(mocker):
+    mock_faculty_runs = [mocker.Mock() for _ in range(5)]
+    mock_client = mocker.Mock()
+    mock_client.query_runs = mock_query_runs(mocker, mock_faculty_runs, 2)
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    mocker.patch("mlflow_faculty.tracking.build_search_runs_filter")
+    mock_build_sort = mocker.patch(
+        "mlflow_faculty.tracking.build_search_runs_sort"
+    )
+    mock_sort = mocker.patch(
+        "mlflow_faculty.tracking.sort_faculty_runs",
+        side_effect=lambda runs, sorts, limit: list(runs)[::-1][:limit],
+    )
+    mock_to_frame = mocker.patch(
+        "mlflow_faculty.tracking.faculty_runs_to_frame"
+    )
+
+    store = FacultyRestStore(STORE_URI)
+    frame = store.search_runs_frame(
+        [EXPERIMENT_ID], max_results=2, order_by=["metrics.loss"]
+    )
+
+    assert frame == mock_to_frame.return_value
+    mock_build_sort.assert_called_once_with(["metrics.loss"])
+    assert mock_sort.call_args[1] == {"limit": 2}
+    mock_to_frame.assert_called_once_with(mock_faculty_runs[:2:-1])
+
+
+def test_search_runs_frame_matches_nothing_shortcircuit(mocker):
+    mock_client = mocker.Mock()
+    mocker.patch("faculty.client", return_value=mock_client)
+    mocker.patch(
+        "mlflow_faculty.tracking.build_search_runs_filter",
+        side_effect=MatchesNothing,
+    )
+    mock_to_frame = mocker.patch(
+        "mlflow_faculty.tracking.faculty_runs_to_frame"
+    )
+
+    store = FacultyRestStore(STORE_URI)
+
+    assert store.search_runs_frame([]) == mock_to_frame.return_value
+    mock_to_frame.assert_called_once_with([])
+    mock_client.query_runs.assert_not_called()
+
+
+def test_search_runs_frame_client_error(mocker):
+    mock_client = mocker.Mock()
+    mock_client.query_runs.side_effect = HttpError(
+        mocker.Mock(), "Dummy client error."
+    )
+    mocker.patch("faculty.client", return_value=mock_client)
+    mocker.patch("mlflow_faculty.tracking.build_search_runs_filter")
+
+    store = FacultyRestStore(STORE_URI)
+
+    with pytest.raises(MlflowException, match="Dummy client error."):
+        store.search_runs_frame([EXPERIMENT_ID])
+
+
 def test_log_batch(mocker):
     mock_client = mocker.Mock()
     mocker.patch("faculty.client", return_value=mock_client)
@@ -989,6 +2452,237 @@ def test_log_batch_invalid_run_id(mocker):
         store.log_batch("invalid-run-id")
 
 
+ASYNC_STORE_URI = "{}?async=true".format(STORE_URI)
+
+
+@pytest.fixture(autouse=True)
+def run_data_loggers(mocker):
+    return mocker.patch.dict(
+        "mlflow_faculty.tracking._RUN_DATA_LOGGERS", clear=True
+    )
+
+
+def test_log_batch_async(mocker):
+    mock_client = mocker.Mock()
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(ASYNC_STORE_URI)
+    store.log_batch(RUN_UUID_HEX_STR, metrics=[MLFLOW_METRIC])
+    store.log_batch(RUN_UUID_HEX_STR, params=[MLFLOW_PARAM])
+    store.flush()
+
+    logged_metrics = []
+    logged_params = []
+    for call in mock_client.log_run_data.call_args_list:
+        assert call[0] == (PROJECT_ID, RUN_UUID)
+        logged_metrics += call[1]["metrics"]
+        logged_params += call[1]["params"]
+    assert len(logged_metrics) == 1
+    assert len(logged_params) == 1
+
+
+def test_log_batch_async_invalid_run_id(mocker):
+    mocker.patch("faculty.client")
+
+    store = FacultyRestStore(ASYNC_STORE_URI)
+
+    with pytest.raises(ValueError):
+        store.log_batch("invalid-run-id")
+
+
+def test_log_batch_async_param_conflict(mocker):
+    exception = faculty.clients.experiment.ParamConflict(
+        message="message", conflicting_params=["param-key"]
+    )
+    mock_client = mocker.Mock()
+    mock_client.log_run_data.side_effect = exception
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(ASYNC_STORE_URI)
+    store.log_batch(RUN_UUID_HEX_STR, params=[MLFLOW_PARAM])
+
+    with pytest.raises(MlflowException, match="param-key"):
+        store.flush()
+
+
+def test_update_run_info_flushes_async_logger(mocker):
+    mock_client = mocker.Mock()
+    mock_client.update_run_info.return_value = FACULTY_RUN
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(ASYNC_STORE_URI)
+    flush_mock = mocker.patch.object(store._async_logger, "flush")
+
+    store.update_run_info(
+        RUN_UUID_HEX_STR, RunStatus.FINISHED, RUN_ENDED_AT_MILLISECONDS
+    )
+
+    flush_mock.assert_called_once_with()
+
+
+def test_log_batch_async_shared_by_stores(mocker):
+    mocker.patch("faculty.client")
+    thread_count = threading.active_count()
+
+    stores = [FacultyRestStore(ASYNC_STORE_URI) for _ in range(5)]
+
+    assert len({id(store._async_logger) for store in stores}) == 1
+    assert threading.active_count() <= thread_count + 1
+
+
+def test_log_batch_async_not_shared_between_settings(mocker):
+    mocker.patch("faculty.client")
+
+    store = FacultyRestStore(ASYNC_STORE_URI)
+    other_store = FacultyRestStore(ASYNC_STORE_URI + "&buffer_max_size=10")
+
+    assert store._async_logger is not other_store._async_logger
+
+
+def test_log_batch_async_separate_stores_end_run(mocker):
+    mock_client = mocker.Mock()
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    def update_run_info(*args, **kwargs):
+        logged_metrics = []
+        for call in mock_client.log_run_data.call_args_list:
+            logged_metrics += call[1]["metrics"]
+        assert len(logged_metrics) == 2
+        return FACULTY_RUN
+
+    mock_client.update_run_info.side_effect = update_run_info
+
+    # The fluent API creates a new store for every call
+    for _ in range(2):
+        FacultyRestStore(ASYNC_STORE_URI).log_batch(
+            RUN_UUID_HEX_STR, metrics=[MLFLOW_METRIC]
+        )
+    FacultyRestStore(ASYNC_STORE_URI).update_run_info(
+        RUN_UUID_HEX_STR, RunStatus.FINISHED, RUN_ENDED_AT_MILLISECONDS
+    )
+
+    mock_client.update_run_info.assert_called_once()
+
+
+def test_log_batch_async_error_raised_by_other_store(mocker):
+    exception = faculty.clients.experiment.ParamConflict(
+        message="message", conflicting_params=["param-key"]
+    )
+    mock_client = mocker.Mock()
+    mock_client.log_run_data.side_effect = exception
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    FacultyRestStore(ASYNC_STORE_URI).log_batch(
+        RUN_UUID_HEX_STR, params=[MLFLOW_PARAM]
+    )
+
+    with pytest.raises(MlflowException, match="param-key"):
+        FacultyRestStore(ASYNC_STORE_URI).flush()
+
+
+def test_flush_run_data_loggers(mocker, run_data_loggers):
+    mock_client = mocker.Mock()
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    FacultyRestStore(ASYNC_STORE_URI).log_batch(
+        RUN_UUID_HEX_STR, metrics=[MLFLOW_METRIC]
+    )
+    _flush_run_data_loggers()
+
+    mock_client.log_run_data.assert_called_once()
+
+
+def test_log_batch_buffered(mocker):
+    mock_client = mocker.Mock()
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    mlflow_metric = mocker.Mock()
+    mocker.patch(
+        "mlflow_faculty.tracking.mlflow_metric_to_faculty_metric",
+        return_value=mlflow_metric,
+    )
+
+    store = FacultyRestStore("{}?buffer=true".format(STORE_URI))
+    store.log_batch(RUN_UUID_HEX_STR, metrics=[MLFLOW_METRIC])
+    store.log_batch(RUN_UUID_HEX_STR, metrics=[MLFLOW_METRIC])
+    mock_client.log_run_data.assert_not_called()
+
+    store.flush()
+
+    mock_client.log_run_data.assert_called_once_with(
+        PROJECT_ID,
+        RUN_UUID,
+        metrics=[mlflow_metric, mlflow_metric],
+        params=[],
+        tags=[],
+    )
+
+
+def test_log_batch_buffered_max_size(mocker):
+    mock_client = mocker.Mock()
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(
+        "{}?buffer=true&buffer_max_size=2".format(STORE_URI)
+    )
+    store.log_batch(RUN_UUID_HEX_STR, metrics=[MLFLOW_METRIC])
+    mock_client.log_run_data.assert_not_called()
+    store.log_batch(RUN_UUID_HEX_STR, params=[MLFLOW_PARAM])
+
+    assert mock_client.log_run_data.call_count == 1
+
+
+BUFFERED_STORE_URI = "{}?buffer=true".format(STORE_URI)
+
+
+def test_log_batch_buffered_shared_by_stores(mocker):
+    mock_client = mocker.Mock()
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    def update_run_info(*args, **kwargs):
+        mock_client.log_run_data.assert_called_once()
+        assert len(mock_client.log_run_data.call_args[1]["metrics"]) == 5
+        return FACULTY_RUN
+
+    mock_client.update_run_info.side_effect = update_run_info
+
+    # The fluent API creates a new store for every call
+    for _ in range(5):
+        FacultyRestStore(BUFFERED_STORE_URI).log_batch(
+            RUN_UUID_HEX_STR, metrics=[MLFLOW_METRIC]
+        )
+    mock_client.log_run_data.assert_not_called()
+
+    FacultyRestStore(BUFFERED_STORE_URI).update_run_info(
+        RUN_UUID_HEX_STR, RunStatus.FINISHED, RUN_ENDED_AT_MILLISECONDS
+    )
+
+    mock_client.update_run_info.assert_called_once()
+
+
+def test_update_run_info_flushes_only_buffered_run(mocker):
+    other_run_uuid = uuid4()
+    mock_client = mocker.Mock()
+    mock_client.update_run_info.return_value = FACULTY_RUN
+    mocker.patch("faculty.client", return_value=mock_client)
+
+    store = FacultyRestStore(BUFFERED_STORE_URI)
+    store.log_batch(RUN_UUID_HEX_STR, metrics=[MLFLOW_METRIC])
+    store.log_batch(other_run_uuid.hex, metrics=[MLFLOW_METRIC])
+    store.update_run_info(
+        RUN_UUID_HEX_STR, RunStatus.FINISHED, RUN_ENDED_AT_MILLISECONDS
+    )
+
+    mock_client.log_run_data.assert_called_once()
+    assert mock_client.log_run_data.call_args[0] == (PROJECT_ID, RUN_UUID)
+
+    _flush_run_data_loggers()
+    assert mock_client.log_run_data.call_args[0] == (
+        PROJECT_ID,
+        other_run_uuid,
+    )
+
+
 def test_log_metric(mocker):
     mock_client = mocker.Mock()
     mocker.patch("faculty.client", return_value=mock_client)
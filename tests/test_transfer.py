@@ -0,0 +1,624 @@
+# Copyright 2019-2020 Faculty Science Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import hashlib
+import os
+import threading
+from uuid import uuid4
+
+import faculty.clients.base
+import pytest
+import requests
+from faculty.clients.object import CloudStorageProvider, CompletedUploadPart
+from faculty.datasets.util import DatasetsError
+
+from mlflow_faculty.transfer import (
+    TransferError,
+    TransferManifest,
+    download_file,
+    etag_matches,
+    file_md5,
+    multipart_etag,
+    multipart_upload_file,
+    pooled_session,
+    transfer_files,
+    walk_local_files,
+)
+
+PROJECT_ID = uuid4()
+
+
+def test_walk_local_files(tmpdir):
+    tmpdir.join("b.txt").write("b")
+    tmpdir.join("a.txt").write("a")
+    tmpdir.mkdir("sub").mkdir("deeper").join("c.txt").write("c")
+    tmpdir.mkdir("empty")
+
+    files, leaf_directories = walk_local_files(str(tmpdir))
+
+    assert sorted(files) == [
+        (str(tmpdir.join("a.txt")), "a.txt"),
+        (str(tmpdir.join("b.txt")), "b.txt"),
+        (str(tmpdir.join("sub", "deeper", "c.txt")), "sub/deeper/c.txt"),
+    ]
+    assert sorted(leaf_directories) == ["empty", "sub/deeper"]
+
+
+def test_walk_local_files_flat(tmpdir):
+    tmpdir.join("a.txt").write("a")
+    files, leaf_directories = walk_local_files(str(tmpdir))
+    assert files == [(str(tmpdir.join("a.txt")), "a.txt")]
+    assert leaf_directories == ["."]
+
+
+def test_transfer_files(mocker):
+    transfer = mocker.Mock()
+    progress = mocker.Mock()
+    paths = [("src{}".format(i), "dest{}".format(i)) for i in range(10)]
+
+    transfer_files(transfer, paths, max_workers=4, progress=progress)
+
+    assert sorted(transfer.call_args_list) == sorted(
+        mocker.call(source, destination) for source, destination in paths
+    )
+    assert sorted(progress.call_args_list) == sorted(
+        mocker.call(source, destination, None) for source, destination in paths
+    )
+
+
+def test_transfer_files_concurrently():
+    barrier = threading.Barrier(3) if hasattr(threading, "Barrier") else None
+    if barrier is None:
+        pytest.skip("threading.Barrier not available")
+
+    def transfer(source, destination):
+        # Only completes if all three transfers run at once
+        barrier.wait(timeout=5)
+
+    paths = [("src{}".format(i), "dest{}".format(i)) for i in range(3)]
+    transfer_files(transfer, paths, max_workers=3)
+
+
+def test_transfer_files_failures(mocker):
+    errors = {"src1": IOError("first"), "src3": IOError("second")}
+
+    def transfer(source, destination):
+        if source in errors:
+            raise errors[source]
+
+    progress = mocker.Mock()
+    paths = [("src{}".format(i), "dest{}".format(i)) for i in range(5)]
+
+    with pytest.raises(TransferError) as excinfo:
+        transfer_files(transfer, paths, max_workers=2, progress=progress)
+
+    assert list(excinfo.value.failures.items()) == [
+        ("src1", errors["src1"]),
+        ("src3", errors["src3"]),
+    ]
+    assert "Failed to transfer 2 file(s)" in str(excinfo.value)
+    assert progress.call_count == 5
+    progress.assert_any_call("src1", "dest1", errors["src1"])
+
+
+def test_transfer_error_message_truncated():
+    failures = dict(("src{}".format(i), IOError("error")) for i in range(8))
+    error = TransferError(failures)
+    assert "Failed to transfer 8 file(s)" in str(error)
+    assert "and 3 more" in str(error)
+
+
+def test_transfer_files_empty(mocker):
+    transfer = mocker.Mock()
+    transfer_files(transfer, [], max_workers=4)
+    transfer.assert_not_called()
+
+
+def test_walk_local_files_relative_paths_use_forward_slashes(tmpdir):
+    tmpdir.mkdir("a").mkdir("b").join("c.txt").write("c")
+    [(local_path, relative_path)], _ = walk_local_files(str(tmpdir))
+    assert relative_path == "a/b/c.txt"
+    assert local_path == os.path.join(str(tmpdir), "a", "b", "c.txt")
+
+
+def test_pooled_session():
+    session = pooled_session(16)
+    adapter = session.get_adapter("https://storage.example.com")
+    assert adapter._pool_maxsize == 16
+
+
+def test_download_file(mocker, tmpdir):
+    object_client = mocker.Mock()
+    object_client.presign_download.return_value = "download-url"
+    session = mocker.Mock()
+    response = session.get.return_value
+    response.status_code = 200
+    response.iter_content.return_value = [b"some ", b"content"]
+    local_path = tmpdir.join("file.txt")
+
+    download_file(
+        object_client, PROJECT_ID, "/remote/file.txt", str(local_path), session
+    )
+
+    object_client.presign_download.assert_called_once_with(
+        PROJECT_ID, "/remote/file.txt"
+    )
+    session.get.assert_called_once_with("download-url", stream=True)
+    response.close.assert_called_once()
+    assert local_path.read_binary() == b"some content"
+
+
+def test_download_file_missing(mocker, tmpdir):
+    session = mocker.Mock()
+    session.get.return_value.status_code = 404
+    local_path = tmpdir.join("file.txt")
+
+    with pytest.raises(DatasetsError, match="No such object"):
+        download_file(
+            mocker.Mock(),
+            PROJECT_ID,
+            "/remote/file.txt",
+            str(local_path),
+            session,
+        )
+
+    assert not local_path.check()
+
+
+@pytest.fixture
+def mock_session(mocker):
+    session = mocker.Mock()
+    session.put.side_effect = lambda url, data: mocker.Mock(
+        headers={"ETag": "etag-{}".format(url)}
+    )
+    mocker.patch("requests.Session", return_value=session)
+    return session
+
+
+@pytest.fixture
+def s3_object_client(mocker):
+    object_client = mocker.Mock()
+    object_client.presign_upload.return_value = mocker.Mock(
+        provider=CloudStorageProvider.S3, upload_id="upload-id"
+    )
+
+    def presign_upload_part(project_id, path, upload_id, part_number):
+        return "part-{}".format(part_number)
+
+    object_client.presign_upload_part.side_effect = presign_upload_part
+    return object_client
+
+
+@pytest.fixture
+def large_file(tmpdir, mocker):
+    mocker.patch("mlflow_faculty.transfer.MIN_PART_SIZE", 1)
+    path = tmpdir.join("large.bin")
+    path.write_binary(b"0123456789")
+    return str(path)
+
+
+def test_multipart_upload_file(
+    mocker, mock_session, s3_object_client, large_file
+):
+    multipart_upload_file(
+        s3_object_client, PROJECT_ID, "/remote/large.bin", large_file, 4
+    )
+
+    assert sorted(mock_session.put.call_args_list) == [
+        mocker.call("part-1", data=b"0123"),
+        mocker.call("part-2", data=b"4567"),
+        mocker.call("part-3", data=b"89"),
+    ]
+    s3_object_client.complete_multipart_upload.assert_called_once_with(
+        PROJECT_ID,
+        "/remote/large.bin",
+        "upload-id",
+        [
+            CompletedUploadPart(part_number=1, etag="etag-part-1"),
+            CompletedUploadPart(part_number=2, etag="etag-part-2"),
+            CompletedUploadPart(part_number=3, etag="etag-part-3"),
+        ],
+    )
+
+
+def test_multipart_upload_file_retries_failed_parts(
+    mocker, mock_session, s3_object_client, large_file
+):
+    sleep = mocker.patch("mlflow_faculty.transfer.time.sleep")
+    failures = {"part-2": 2}
+
+    def put(url, data):
+        if failures.get(url):
+            failures[url] -= 1
+            raise requests.ConnectionError("Connection reset")
+        return mocker.Mock(headers={"ETag": "etag-{}".format(url)})
+
+    mock_session.put.side_effect = put
+
+    multipart_upload_file(
+        s3_object_client, PROJECT_ID, "/remote/large.bin", large_file, 4
+    )
+
+    # Only the failed part is retried
+    urls = [c[0][0] for c in mock_session.put.call_args_list]
+    assert sorted(urls) == ["part-1", "part-2", "part-2", "part-2", "part-3"]
+    assert sleep.call_count == 2
+    s3_object_client.complete_multipart_upload.assert_called_once()
+
+
+def test_multipart_upload_file_gives_up(
+    mocker, mock_session, s3_object_client, large_file
+):
+    mocker.patch("mlflow_faculty.transfer.time.sleep")
+    mock_session.put.side_effect = requests.ConnectionError("Unreachable")
+
+    with pytest.raises(requests.ConnectionError):
+        multipart_upload_file(
+            s3_object_client,
+            PROJECT_ID,
+            "/remote/large.bin",
+            large_file,
+            4,
+            max_attempts=2,
+        )
+
+    assert mock_session.put.call_count == 2 * 3
+    s3_object_client.complete_multipart_upload.assert_not_called()
+
+
+def test_multipart_upload_file_limits_number_of_parts(
+    mocker, mock_session, s3_object_client, large_file
+):
+    mocker.patch("mlflow_faculty.transfer.MAX_PARTS", 2)
+
+    multipart_upload_file(
+        s3_object_client, PROJECT_ID, "/remote/large.bin", large_file, 1
+    )
+
+    assert sorted(mock_session.put.call_args_list) == [
+        mocker.call("part-1", data=b"01234"),
+        mocker.call("part-2", data=b"56789"),
+    ]
+
+
+def test_multipart_upload_file_gcs(mocker, large_file):
+    upload_file = mocker.patch("faculty.datasets.transfer.upload_file")
+    uploaded = []
+
+    def put(url, data, headers):
+        uploaded.append((url, data.read(), headers))
+        return mocker.Mock()
+
+    session = mocker.Mock()
+    session.put.side_effect = put
+    object_client = mocker.Mock()
+    object_client.presign_upload.return_value = mocker.Mock(
+        provider=CloudStorageProvider.GCS, url="upload-url"
+    )
+
+    multipart_upload_file(
+        object_client,
+        PROJECT_ID,
+        "/remote/large.bin",
+        large_file,
+        4,
+        session=session,
+    )
+
+    # The upload URL presigned to check the provider is used, rather than
+    # presigning another
+    object_client.presign_upload.assert_called_once_with(
+        PROJECT_ID, "/remote/large.bin"
+    )
+    assert uploaded == [
+        (
+            "upload-url",
+            b"0123456789",
+            {"Content-Length": "10", "Content-Range": "bytes 0-9/10"},
+        )
+    ]
+    upload_file.assert_not_called()
+
+
+def test_multipart_upload_file_empty(
+    mocker, mock_session, s3_object_client, tmpdir
+):
+    upload_file = mocker.patch("faculty.datasets.transfer.upload_file")
+    empty_file = tmpdir.join("empty.bin")
+    empty_file.write_binary(b"")
+
+    multipart_upload_file(
+        s3_object_client, PROJECT_ID, "/remote/empty.bin", str(empty_file), 4
+    )
+
+    upload_file.assert_called_once_with(
+        s3_object_client, PROJECT_ID, "/remote/empty.bin", str(empty_file)
+    )
+    # No multipart upload is started and left incomplete
+    s3_object_client.presign_upload.assert_not_called()
+    mock_session.put.assert_not_called()
+
+
+def test_multipart_upload_file_session(
+    mocker, mock_session, s3_object_client, large_file
+):
+    session = mocker.Mock()
+    session.put.side_effect = lambda url, data: mocker.Mock(
+        headers={"ETag": "etag-{}".format(url)}
+    )
+
+    multipart_upload_file(
+        s3_object_client,
+        PROJECT_ID,
+        "/remote/large.bin",
+        large_file,
+        4,
+        session=session,
+    )
+
+    assert session.put.call_count == 3
+    mock_session.put.assert_not_called()
+
+
+def test_multipart_upload_file_resumes(
+    mocker, mock_session, s3_object_client, large_file
+):
+    states = []
+    mock_session.put.side_effect = [
+        mocker.Mock(headers={"ETag": "etag-part-1"}),
+        requests.ConnectionError("Interrupted"),
+    ]
+
+    with pytest.raises(requests.ConnectionError):
+        multipart_upload_file(
+            s3_object_client,
+            PROJECT_ID,
+            "/remote/large.bin",
+            large_file,
+            4,
+            max_workers=1,
+            max_attempts=1,
+            save_state=states.append,
+        )
+
+    assert states[-1]["upload_id"] == "upload-id"
+    assert states[-1]["parts"] == {"1": "etag-part-1"}
+
+    mock_session.put.side_effect = lambda url, data: mocker.Mock(
+        headers={"ETag": "etag-{}".format(url)}
+    )
+    mock_session.put.reset_mock()
+    s3_object_client.presign_upload.reset_mock()
+    multipart_upload_file(
+        s3_object_client,
+        PROJECT_ID,
+        "/remote/large.bin",
+        large_file,
+        4,
+        state=states[-1],
+    )
+
+    s3_object_client.presign_upload.assert_not_called()
+    assert sorted(mock_session.put.call_args_list) == [
+        mocker.call("part-2", data=b"4567"),
+        mocker.call("part-3", data=b"89"),
+    ]
+    s3_object_client.complete_multipart_upload.assert_called_once_with(
+        PROJECT_ID,
+        "/remote/large.bin",
+        "upload-id",
+        [
+            CompletedUploadPart(part_number=1, etag="etag-part-1"),
+            CompletedUploadPart(part_number=2, etag="etag-part-2"),
+            CompletedUploadPart(part_number=3, etag="etag-part-3"),
+        ],
+    )
+
+
+def test_multipart_upload_file_restarts_failed_resume(
+    mocker, mock_session, s3_object_client, large_file
+):
+    mocker.patch("mlflow_faculty.transfer.time.sleep")
+    state = {
+        "file_size": 10,
+        "mtime": os.path.getmtime(large_file),
+        "part_size": 4,
+        "upload_id": "expired-upload-id",
+        "parts": {"1": "old-etag"},
+    }
+
+    def presign_upload_part(project_id, path, upload_id, part_number):
+        return "{}-part-{}".format(upload_id, part_number)
+
+    def put(url, data):
+        if url.startswith("expired"):
+            raise requests.HTTPError("404 Client Error: NoSuchUpload")
+        return mocker.Mock(headers={"ETag": "etag-{}".format(url)})
+
+    s3_object_client.presign_upload_part.side_effect = presign_upload_part
+    mock_session.put.side_effect = put
+    states = []
+
+    multipart_upload_file(
+        s3_object_client,
+        PROJECT_ID,
+        "/remote/large.bin",
+        large_file,
+        4,
+        max_attempts=2,
+        state=state,
+        save_state=states.append,
+    )
+
+    s3_object_client.presign_upload.assert_called_once_with(
+        PROJECT_ID, "/remote/large.bin"
+    )
+    s3_object_client.complete_multipart_upload.assert_called_once_with(
+        PROJECT_ID,
+        "/remote/large.bin",
+        "upload-id",
+        [
+            CompletedUploadPart(part_number=1, etag="etag-upload-id-part-1"),
+            CompletedUploadPart(part_number=2, etag="etag-upload-id-part-2"),
+            CompletedUploadPart(part_number=3, etag="etag-upload-id-part-3"),
+        ],
+    )
+    assert states[-1]["upload_id"] == "upload-id"
+
+
+def test_multipart_upload_file_restarts_when_resume_not_completed(
+    mocker, mock_session, s3_object_client, large_file
+):
+    state = {
+        "file_size": 10,
+        "mtime": os.path.getmtime(large_file),
+        "part_size": 4,
+        "upload_id": "expired-upload-id",
+        "parts": {"1": "etag-1", "2": "etag-2", "3": "etag-3"},
+    }
+
+    def complete_multipart_upload(project_id, path, upload_id, parts):
+        if upload_id == "expired-upload-id":
+            raise faculty.clients.base.NotFound(mocker.Mock())
+
+    s3_object_client.complete_multipart_upload.side_effect = (
+        complete_multipart_upload
+    )
+
+    multipart_upload_file(
+        s3_object_client,
+        PROJECT_ID,
+        "/remote/large.bin",
+        large_file,
+        4,
+        state=state,
+    )
+
+    s3_object_client.presign_upload.assert_called_once()
+    assert mock_session.put.call_count == 3
+    calls = s3_object_client.complete_multipart_upload.call_args_list
+    assert [c[0][2] for c in calls] == ["expired-upload-id", "upload-id"]
+
+
+def test_multipart_upload_file_ignores_state_of_changed_file(
+    mocker, mock_session, s3_object_client, large_file
+):
+    state = {
+        "file_size": 5,
+        "mtime": os.path.getmtime(large_file),
+        "part_size": 4,
+        "upload_id": "old-upload-id",
+        "parts": {"1": "old-etag"},
+    }
+
+    multipart_upload_file(
+        s3_object_client,
+        PROJECT_ID,
+        "/remote/large.bin",
+        large_file,
+        4,
+        state=state,
+    )
+
+    s3_object_client.presign_upload.assert_called_once()
+    assert mock_session.put.call_count == 3
+
+
+def test_file_md5(tmpdir):
+    path = tmpdir.join("file.txt")
+    path.write_binary(b"content")
+    assert file_md5(str(path)) == "9a0364b9e99bb480dd25e1f0284c8555"
+
+
+def test_transfer_manifest(tmpdir):
+    local_file = tmpdir.join("file.txt")
+    local_file.write("content")
+    path = str(tmpdir.join("manifest"))
+
+    manifest = TransferManifest(path, "target")
+    assert not manifest.is_complete("key", str(local_file), etag="etag")
+    manifest.mark_complete("key", str(local_file), etag="etag")
+    manifest.save_upload_state("upload", {"upload_id": "id"})
+    manifest.close()
+
+    manifest = TransferManifest(path, "target")
+    assert manifest.is_complete("key", str(local_file), etag="etag")
+    assert not manifest.is_complete("key", str(local_file), etag="other")
+    assert manifest.upload_state("upload") == {"upload_id": "id"}
+
+    local_file.write("changed")
+    assert not manifest.is_complete("key", str(local_file), etag="etag")
+
+    manifest.remove()
+    assert not tmpdir.join("manifest").check()
+
+
+def test_transfer_manifest_other_target(tmpdir):
+    local_file = tmpdir.join("file.txt")
+    local_file.write("content")
+    path = str(tmpdir.join("manifest"))
+
+    manifest = TransferManifest(path, "target")
+    manifest.mark_complete("key", str(local_file))
+    manifest.close()
+
+    manifest = TransferManifest(path, "other-target")
+    assert not manifest.is_complete("key", str(local_file))
+
+
+def test_transfer_manifest_ignores_partial_record(tmpdir):
+    local_file = tmpdir.join("file.txt")
+    local_file.write("content")
+    path = tmpdir.join("manifest")
+
+    manifest = TransferManifest(str(path), "target")
+    manifest.mark_complete("key", str(local_file))
+    manifest.close()
+    with path.open("a") as fp:
+        fp.write('{"file": "other", "si')
+
+    manifest = TransferManifest(str(path), "target")
+    assert manifest.is_complete("key", str(local_file))
+
+
+def expected_multipart_etag(parts):
+    digests = b"".join(hashlib.md5(part).digest() for part in parts)
+    return "{}-{}".format(hashlib.md5(digests).hexdigest(), len(parts))
+
+
+def test_multipart_etag(large_file):
+    assert multipart_etag(large_file, 4) == expected_multipart_etag(
+        [b"0123", b"4567", b"89"]
+    )
+    assert multipart_etag(large_file, 10) == expected_multipart_etag(
+        [b"0123456789"]
+    )
+
+
+@pytest.mark.parametrize(
+    "etag, part_sizes, matches",
+    [
+        (hashlib.md5(b"0123456789").hexdigest(), [4], True),
+        ('"{}"'.format(hashlib.md5(b"0123456789").hexdigest()), [4], True),
+        (hashlib.md5(b"other").hexdigest(), [4], False),
+        (expected_multipart_etag([b"0123", b"4567", b"89"]), [4], True),
+        (expected_multipart_etag([b"0123", b"4567", b"89"]), [3, 4], True),
+        (expected_multipart_etag([b"0123", b"4567", b"89"]), [5], False),
+        (expected_multipart_etag([b"0123", b"4567", b"8"]), [4], False),
+        ("CJ+7hJGf0OQCEAE=", [4], False),
+    ],
+)
+def test_etag_matches(large_file, etag, part_sizes, matches):
+    assert etag_matches(large_file, etag, part_sizes) == matches